@@ -24,18 +24,24 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# 连接级 PRAGMA 的允许项（值来自配置，键名白名单防止拼接任意SQL）
+SUPPORTED_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "temp_store", "busy_timeout", "mmap_size")
+
 
 class DatabaseManager:
     """数据库管理器"""
 
-    def __init__(self, db_path: str = "books_history.db"):
+    def __init__(self, db_path: str = "books_history.db", pragmas: Optional[Dict[str, Any]] = None):
         """
         初始化数据库管理器
 
         Args:
             db_path: 数据库文件路径
+            pragmas: 连接级 PRAGMA 配置（如 journal_mode/synchronous/cache_size），
+                对应 setting.yaml 中 database.pragmas
         """
         self.db_path = db_path
+        self.pragmas = dict(pragmas or {})
         self.conn = None
         self._ensure_db_directory()
 
@@ -64,6 +70,7 @@ class DatabaseManager:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
             self.conn.execute("PRAGMA foreign_keys = ON")  # 启用外键约束
+            self._apply_pragmas()
 
             # 创建所有表
             self._create_tables()
@@ -81,6 +88,19 @@ class DatabaseManager:
                 self.conn.rollback()
             raise
 
+    def _apply_pragmas(self):
+        """应用配置中的连接级 PRAGMA"""
+        for name, value in self.pragmas.items():
+            if name not in SUPPORTED_PRAGMAS:
+                logger.warning(f"忽略不支持的PRAGMA配置: {name}")
+                continue
+            if value is None or not str(value).replace("-", "", 1).isalnum():
+                logger.warning(f"忽略非法的PRAGMA取值: {name}={value}")
+                continue
+            self.conn.execute(f"PRAGMA {name} = {value}")
+        if self.pragmas:
+            logger.debug(f"已应用PRAGMA配置: {self.pragmas}")
+
     def _create_tables(self):
         """创建所有表"""
         # books表（书籍基础信息和豆瓣信息）
@@ -631,10 +651,20 @@ class DatabaseManager:
             logger.error(f"递增版本号失败: {e}")
             return '1.0'
 
+    @staticmethod
+    def _flush_grouped_rows(conn, grouped: Dict[str, List[List[Any]]]):
+        """按SQL分组执行 executemany，并清空分组"""
+        for sql, rows in grouped.items():
+            conn.executemany(sql, rows)
+        grouped.clear()
+
     def _batch_save_books(self, books_data: List[Dict], batch_size: int, update_mode: str = "merge"):
         """
         批量保存books数据 (优化版)
 
+        列集合相同的行共用同一条预编译UPSERT语句，按组 executemany 写入；
+        同一barcode在批次内重复出现时先写出已累积的分组，保证写入顺序与输入一致。
+
         Args:
             books_data: books表数据列表
             batch_size: 批量写入大小
@@ -649,12 +679,35 @@ class DatabaseManager:
 
         logger.debug(f"预查询完成: {len(existing_books_map)} 条已存在记录")
 
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        sql_cache: Dict[Tuple[bool, Tuple[str, ...]], str] = {}
+
+        def _upsert_sql(columns: Tuple[str, ...], merge: bool) -> str:
+            key = (merge, columns)
+            sql = sql_cache.get(key)
+            if sql is None:
+                set_clauses = [f"{col} = excluded.{col}" for col in columns if col != 'barcode']
+                if merge:
+                    set_clauses.append("updated_at = excluded.updated_at")
+                    set_clauses.append("data_version = excluded.data_version")
+                sql = f"""
+                    INSERT INTO books ({','.join(columns)})
+                    VALUES ({','.join('?' for _ in columns)})
+                    ON CONFLICT(barcode) DO UPDATE SET
+                        {', '.join(set_clauses)}
+                    WHERE books.barcode = excluded.barcode
+                """
+                sql_cache[key] = sql
+            return sql
+
         for i in range(0, len(books_data), batch_size):
             batch = books_data[i:i + batch_size]
+            grouped: Dict[str, List[List[Any]]] = {}
+            batch_barcodes = set()
 
             for book_data in batch:
                 # 确保必要字段存在
-                book_data.setdefault('updated_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                book_data.setdefault('updated_at', now)
 
                 # 优化: 从内存映射中获取现有记录 (无需查询)
                 existing_book = None
@@ -668,6 +721,11 @@ class DatabaseManager:
                         book_data['data_version'] = self._increment_version_in_memory(current_version)
                     else:
                         book_data['data_version'] = '1.0'
+
+                    if barcode in batch_barcodes:
+                        self._flush_grouped_rows(self.conn, grouped)
+                        batch_barcodes.clear()
+                    batch_barcodes.add(barcode)
                 else:
                     book_data.setdefault('data_version', '1.0')
 
@@ -675,103 +733,81 @@ class DatabaseManager:
                 if existing_book and existing_book.get('created_at'):
                     book_data['created_at'] = existing_book['created_at']
                 else:
-                    book_data.setdefault('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                    book_data.setdefault('created_at', now)
 
-                # 根据更新模式构建UPSERT语句 (逻辑不变)
+                # 根据更新模式确定写入列
                 if update_mode == "overwrite" or not existing_book:
                     # 完全覆盖模式
-                    placeholders = ','.join(['?' for _ in book_data.keys()])
-                    columns = ','.join(book_data.keys())
-
-                    set_clauses = []
-                    for key in book_data.keys():
-                        if key != 'barcode':
-                            set_clauses.append(f"{key} = excluded.{key}")
-
-                    sql = f"""
-                        INSERT INTO books ({columns})
-                        VALUES ({placeholders})
-                        ON CONFLICT(barcode) DO UPDATE SET
-                            {', '.join(set_clauses)}
-                        WHERE books.barcode = excluded.barcode
-                    """
-                    self.conn.execute(sql, list(book_data.values()))
+                    columns = tuple(book_data.keys())
+                    values = list(book_data.values())
+                    sql = _upsert_sql(columns, merge=False)
                 else:
-                    # 合并模式
+                    # 合并模式：只写入非空字段
                     insert_columns = ['barcode']
-                    insert_values = [book_data['barcode']]
-                    set_clauses = []
-
+                    values = [book_data['barcode']]
                     for key, value in book_data.items():
                         if key == 'barcode':
                             continue
-
                         if value is not None and str(value).strip() != "":
                             insert_columns.append(key)
-                            insert_values.append(value)
-                            set_clauses.append(f"{key} = excluded.{key}")
+                            values.append(value)
+                    sql = _upsert_sql(tuple(insert_columns), merge=True)
 
-                    set_clauses.append("updated_at = excluded.updated_at")
-                    set_clauses.append("data_version = excluded.data_version")
+                grouped.setdefault(sql, []).append(values)
 
-                    placeholders = ','.join(['?' for _ in insert_columns])
-                    columns = ','.join(insert_columns)
+            self._flush_grouped_rows(self.conn, grouped)
+            logger.debug(
+                f"已保存books批次 {i // batch_size + 1}/{(len(books_data) - 1) // batch_size + 1} "
+                f"({update_mode}模式, {len(sql_cache)} 种列组合)"
+            )
+
+    def _batch_insert_rows(self, table: str, rows: List[Dict], batch_size: int, verb: str = "INSERT"):
+        """
+        批量写入borrow_records / borrow_statistics
 
+        连续且列组合相同的行合并为一次 executemany（这两张表的行通常列组合一致），
+        列组合变化时才切换语句，写入顺序与输入保持一致。
+        """
+        sql_cache: Dict[Tuple[str, ...], str] = {}
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            current_sql = None
+            pending: List[List[Any]] = []
+            for row in batch:
+                columns = tuple(row.keys())
+                sql = sql_cache.get(columns)
+                if sql is None:
                     sql = f"""
-                        INSERT INTO books ({columns})
-                        VALUES ({placeholders})
-                        ON CONFLICT(barcode) DO UPDATE SET
-                            {', '.join(set_clauses)}
-                        WHERE books.barcode = excluded.barcode
+                        {verb} INTO {table} ({','.join(columns)})
+                        VALUES ({','.join('?' for _ in columns)})
                     """
-                    self.conn.execute(sql, insert_values)
-
-            logger.debug(f"已保存books批次 {i // batch_size + 1}/{(len(books_data) - 1) // batch_size + 1} ({update_mode}模式)")
+                    sql_cache[columns] = sql
+                if sql is not current_sql and pending:
+                    self.conn.executemany(current_sql, pending)
+                    pending = []
+                current_sql = sql
+                pending.append(list(row.values()))
+            if pending:
+                self.conn.executemany(current_sql, pending)
+            logger.debug(f"已保存{table}批次 {i // batch_size + 1}/{(len(rows) - 1) // batch_size + 1}")
 
     def _batch_save_borrow_records(self, records: List[Dict], batch_size: int):
         """批量保存borrow_records数据"""
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-
-            for record in batch:
-                # 确保必要字段存在（日期格式参考excel_import.py：%Y-%m-%d %H:%M:%S）
-                record.setdefault('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-
-                # 构建INSERT OR REPLACE语句
-                placeholders = ','.join(['?' for _ in record.keys()])
-                columns = ','.join(record.keys())
-
-                sql = f"""
-                    INSERT INTO borrow_records ({columns})
-                    VALUES ({placeholders})
-                """
-
-                self.conn.execute(sql, list(record.values()))
-
-            logger.debug(f"已保存borrow_records批次 {i // batch_size + 1}/{(len(records) - 1) // batch_size + 1}")
+        # 确保必要字段存在（日期格式参考excel_import.py：%Y-%m-%d %H:%M:%S）
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for record in records:
+            record.setdefault('created_at', now)
+        self._batch_insert_rows("borrow_records", records, batch_size)
 
     def _batch_save_borrow_statistics(self, statistics: List[Dict], batch_size: int):
         """批量保存borrow_statistics数据"""
-        for i in range(0, len(statistics), batch_size):
-            batch = statistics[i:i + batch_size]
-
-            for stat in batch:
-                # 确保必要字段存在（日期格式参考excel_import.py：%Y-%m-%d %H:%M:%S）
-                stat.setdefault('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                stat.setdefault('updated_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-
-                # 构建INSERT OR REPLACE语句
-                placeholders = ','.join(['?' for _ in stat.keys()])
-                columns = ','.join(stat.keys())
-
-                sql = f"""
-                    INSERT OR REPLACE INTO borrow_statistics ({columns})
-                    VALUES ({placeholders})
-                """
-
-                self.conn.execute(sql, list(stat.values()))
-
-            logger.debug(f"已保存borrow_statistics批次 {i // batch_size + 1}/{(len(statistics) - 1) // batch_size + 1}")
+        # 确保必要字段存在（日期格式参考excel_import.py：%Y-%m-%d %H:%M:%S）
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for stat in statistics:
+            stat.setdefault('created_at', now)
+            stat.setdefault('updated_at', now)
+        # 统计表以 (barcode, stat_year, stat_month) 唯一，重复周期整行替换
+        self._batch_insert_rows("borrow_statistics", statistics, batch_size, verb="INSERT OR REPLACE")
 
     def get_book_by_barcode(self, barcode: str) -> Optional[Dict]:
         """
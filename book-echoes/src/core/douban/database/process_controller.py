@@ -93,7 +93,7 @@ class DoubanRatingProcessController:
                 os.makedirs(db_dir, exist_ok=True)
 
             # 初始化数据库管理器
-            self.db_manager = DatabaseManager(db_path)
+            self.db_manager = DatabaseManager(db_path, pragmas=self.db_config.get('pragmas'))
             self.db_manager.init_database()
 
             # 初始化查重处理器
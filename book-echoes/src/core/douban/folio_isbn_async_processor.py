@@ -6,7 +6,7 @@ ISBN异步批量处理器 - 精简版
 基于简单爬虫逻辑的高效实现：
 1. 多个浏览器实例并发处理
 2. 单实例登录重用
-3. 实时保存到Excel
+3. 增量结果追加写入日志，结束时一次性生成Excel
 4. 可配置并发参数
 """
 
@@ -31,6 +31,7 @@ from src.utils.logger import get_logger
 from src.utils.config_manager import get_douban_config
 from src.core.douban.isbn_processor_config import ProcessingConfig
 from .exceptions import FolioNeedsRestart
+from .isbn_result_journal import ISBNResultJournal
 
 logger = get_logger(__name__)
 
@@ -348,6 +349,9 @@ class ISBNAsyncProcessor:
         self._db_result_cache: Dict[str, str] = {}
         self.output_column: Optional[str] = None
         self.barcode_column: Optional[str] = None
+        # 增量检查点日志；DataFrame 中存在尚未写入Excel的结果时 _excel_dirty 为 True
+        self._journal: Optional[ISBNResultJournal] = None
+        self._excel_dirty = False
 
         # 初始化数据库组件（如果启用）
         self.db_manager = None
@@ -370,7 +374,7 @@ class ISBNAsyncProcessor:
             refresh_config = self.db_config.get('refresh_strategy', {})
 
             # 初始化数据库管理器
-            self.db_manager = DatabaseManager(db_path)
+            self.db_manager = DatabaseManager(db_path, pragmas=self.db_config.get('pragmas'))
             self.db_manager.init_database()
 
             # 初始化查重处理器
@@ -485,6 +489,11 @@ class ISBNAsyncProcessor:
             self.output_column = output_column
             self._initialize_row_index_cache(df, barcode_column)
 
+            # 回放上次中断前的检查点日志，已获取的ISBN不再重复爬取
+            self._journal = ISBNResultJournal.for_excel(excel_file_path)
+            self._excel_dirty = False
+            self._replay_journal(df, barcode_column, output_column)
+
             valid_isbn_rows = self._collect_rows_with_valid_isbn(df, output_column)
             if valid_isbn_rows:
                 logger.info(f"检测到 {len(valid_isbn_rows)} 条记录的ISBN列已存在合法值，将跳过后续处理")
@@ -646,8 +655,8 @@ class ISBNAsyncProcessor:
                 if not retry_failed:
                     logger.info("已禁用失败条码重试功能")
 
-            # 最终保存 - 保证所有缓冲结果落盘
-            await self._maybe_flush_results(df, excel_file_path, force=True)
+            # 最终保存 - 保证所有缓冲结果落盘并生成Excel
+            await self._maybe_flush_results(df, excel_file_path, force=True, materialize=True)
 
             # 生成统计信息
             stats = {
@@ -682,7 +691,7 @@ class ISBNAsyncProcessor:
         finally:
             if 'df' in locals():
                 try:
-                    await self._maybe_flush_results(df, excel_file_path, force=True)
+                    await self._maybe_flush_results(df, excel_file_path, force=True, materialize=True)
                 except Exception as flush_error:
                     logger.error(f"清理阶段保存结果失败: {flush_error}")
             await self.stop_workers()
@@ -872,53 +881,98 @@ class ISBNAsyncProcessor:
             self.stats['failed_isbn'] += 1
             await self._save_to_excel(df, excel_file_path, index + 1)
 
-    async def _save_results_to_excel(self, df: pd.DataFrame, excel_file_path: str, processed_count: int, is_final: bool = False):
-        """Write buffered results to Excel with atomic rename semantics."""
+    def _replay_journal(self, df: pd.DataFrame, barcode_column: str, output_column: str) -> None:
+        """将检查点日志中的结果写回DataFrame（条码不一致的行视为Excel已变更，忽略）."""
+        if self._journal is None:
+            return
+        records = self._journal.load()
+        if not records:
+            return
+
+        restored = 0
+        for index, (barcode, value) in records.items():
+            if index not in df.index:
+                continue
+            if str(df.at[index, barcode_column]).strip() != barcode:
+                continue
+            df.at[index, output_column] = value
+            restored += 1
+
+        if restored:
+            self._excel_dirty = True
+        logger.info(f"[恢复] 从检查点日志恢复 {restored}/{len(records)} 条结果: {self._journal.path}")
+
+    async def _checkpoint_results(self, df: pd.DataFrame, is_final: bool = False):
+        """
+        将缓冲结果写入DataFrame，并把可增量保存的结果追加到检查点日志。
+
+        日志写入在线程中执行，不阻塞浏览器工作器；Excel 由 _materialize_excel 统一生成。
+        is_final 为 True 时同时写入仅在最终保存时落盘的结果（失败、跳过等）。
+        """
         if not self.output_column:
             logger.warning("输出列未设置，跳过保存请求")
             return
 
         async with self.write_lock:
-            try:
-                if is_final:
-                    target_indices = list(self.results_buffer.keys())
-                else:
-                    target_indices = list(self._pending_indices)
+            if is_final:
+                target_indices = list(self.results_buffer.keys())
+            else:
+                target_indices = list(self._pending_indices)
 
-                if not target_indices:
-                    return
+            if not target_indices:
+                return
 
-                for index in target_indices:
-                    value = self.results_buffer.get(index)
-                    if value is None:
-                        continue
-                    df.at[index, self.output_column] = value
+            entries: List[Tuple[int, str, str]] = []
+            for index in target_indices:
+                value = self.results_buffer.get(index)
+                if value is None:
+                    continue
+                df.at[index, self.output_column] = value
+                self._excel_dirty = True
+                if self._can_partial_flush(value) and self.barcode_column:
+                    entries.append((index, str(df.at[index, self.barcode_column]).strip(), value))
 
-                temp_file = excel_file_path.replace('.xlsx', f'_tmp_{int(time.time())}.xlsx')
-                df.to_excel(temp_file, index=False, engine='openpyxl')
+            if entries and self._journal is not None:
+                try:
+                    await asyncio.to_thread(self._journal.append, entries)
+                    logger.debug(f"[保存] 检查点日志追加 {len(entries)} 条记录")
+                except Exception as e:
+                    # 结果仍保留在DataFrame中，最终生成Excel时一并写入
+                    logger.error(f"写入检查点日志失败: {e}")
+
+            if is_final:
+                self.results_buffer.clear()
+                self._pending_indices.clear()
+                self._final_only_indices.clear()
+            else:
+                for index in target_indices:
+                    self._pending_indices.discard(index)
+                    self.results_buffer.pop(index, None)
 
-                if os.path.exists(excel_file_path):
-                    os.remove(excel_file_path)
-                os.rename(temp_file, excel_file_path)
+    async def _materialize_excel(self, df: pd.DataFrame, excel_file_path: str):
+        """在线程中生成完整Excel（临时文件 + 原子替换），成功后清空检查点日志."""
+        async with self.write_lock:
+            if not self._excel_dirty:
+                return
+            temp_file = excel_file_path.replace('.xlsx', f'_tmp_{int(time.time())}.xlsx')
+            try:
+                await asyncio.to_thread(self._write_excel_atomic, df, temp_file, excel_file_path)
+            except Exception as e:
+                logger.error(f"保存Excel失败，检查点日志已保留，可重新运行恢复: {e}")
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                return
 
-                if is_final:
-                    logger.info(f"[保存] 已写入 {len(target_indices)} 条记录到Excel（最终保存）")
-                else:
-                    logger.debug(f"[保存] 增量写入 {len(target_indices)} 条记录到Excel")
+            self._excel_dirty = False
+            logger.info(f"[保存] 已写入Excel: {excel_file_path}")
+            if self._journal is not None:
+                self._journal.clear()
 
-                if is_final:
-                    self.results_buffer.clear()
-                    self._pending_indices.clear()
-                    self._final_only_indices.clear()
-                else:
-                    for index in target_indices:
-                        self._pending_indices.discard(index)
-                        self.results_buffer.pop(index, None)
+    @staticmethod
+    def _write_excel_atomic(df: pd.DataFrame, temp_file: str, excel_file_path: str) -> None:
+        df.to_excel(temp_file, index=False, engine='openpyxl')
+        os.replace(temp_file, excel_file_path)
 
-            except Exception as e:
-                logger.error(f"保存Excel失败: {e}")
-                if 'temp_file' in locals() and os.path.exists(temp_file):
-                    os.remove(temp_file)
     async def _save_batch_results(self, df: pd.DataFrame, excel_file_path: str, processed_count: int, is_final: bool = False):
         """批量保存所有结果到Excel（并发修复版）"""
         async with self.write_lock:
@@ -1012,14 +1066,22 @@ class ISBNAsyncProcessor:
             self._pending_indices.discard(index)
             self._final_only_indices.add(index)
 
-    async def _maybe_flush_results(self, df: pd.DataFrame, excel_file_path: str, *, force: bool = False):
-        """Flush buffered results when thresholds are met."""
-        if not self.results_buffer:
-            return
+    async def _maybe_flush_results(self, df: pd.DataFrame, excel_file_path: str, *,
+                                   force: bool = False, materialize: bool = False):
+        """
+        Flush buffered results when thresholds are met.
 
+        增量检查点只追加日志；materialize 为 True 时（处理结束）生成完整Excel。
+        """
         if force:
-            await self._save_results_to_excel(df, excel_file_path, len(self.results_buffer), is_final=True)
-            self._last_flush_ts = time.monotonic()
+            if self.results_buffer:
+                await self._checkpoint_results(df, is_final=True)
+                self._last_flush_ts = time.monotonic()
+            if materialize:
+                await self._materialize_excel(df, excel_file_path)
+            return
+
+        if not self.results_buffer:
             return
 
         should_flush = False
@@ -1034,7 +1096,7 @@ class ISBNAsyncProcessor:
                 should_flush = True
 
         if should_flush and self._pending_indices:
-            await self._save_results_to_excel(df, excel_file_path, len(self._pending_indices), is_final=False)
+            await self._checkpoint_results(df, is_final=False)
             self._last_flush_ts = time.monotonic()
 
     # ============================================================================
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""ISBN 处理结果日志（追加写 JSONL）.
+
+异步处理器的增量检查点只向日志追加 ``{行索引, 条码, 结果}``，
+不再反复重写整个 Excel；Excel 在处理结束时一次性生成。
+中断后重新运行时回放日志即可恢复已获取的 ISBN。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ISBNResultJournal:
+    """追加写的结果日志，每行一条 JSON 记录."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_excel(cls, excel_file_path: str) -> "ISBNResultJournal":
+        """日志与 Excel 放在同一目录：``<文件名>.isbn_journal.jsonl``."""
+        excel_path = Path(excel_file_path)
+        return cls(excel_path.with_name(f"{excel_path.stem}.isbn_journal.jsonl"))
+
+    def append(self, entries: Iterable[Tuple[int, str, str]]) -> int:
+        """追加 (行索引, 条码, 结果) 并落盘，返回写入条数（在工作线程中调用）."""
+        lines = [
+            json.dumps(
+                {"index": int(index), "barcode": barcode, "value": value, "ts": round(time.time(), 3)},
+                ensure_ascii=False,
+            )
+            for index, barcode, value in entries
+        ]
+        if not lines:
+            return 0
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+        return len(lines)
+
+    def load(self) -> Dict[int, Tuple[str, str]]:
+        """读取日志，返回 {行索引: (条码, 结果)}，同一行以最后一次记录为准."""
+        records: Dict[int, Tuple[str, str]] = {}
+        if not self.path.exists():
+            return records
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                    records[int(item["index"])] = (str(item.get("barcode", "")), str(item["value"]))
+                except (ValueError, KeyError, TypeError):
+                    # 中断时最后一行可能只写了一半
+                    logger.warning("跳过无法解析的日志行 %s:%s", self.path, line_no)
+        return records
+
+    def clear(self) -> None:
+        """Excel 完整落盘后删除日志."""
+        with self._lock:
+            if self.path.exists():
+                self.path.unlink()
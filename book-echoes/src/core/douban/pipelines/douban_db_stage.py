@@ -29,7 +29,7 @@ class DoubanDatabaseStage(PipelineStep):
         if not self.enabled:
             return
         db_path = self.db_config.get("db_path", "runtime/database/books_history.db")
-        self.db_manager = DatabaseManager(db_path)
+        self.db_manager = DatabaseManager(db_path, pragmas=self.db_config.get("pragmas"))
         self.db_manager.init_database(db_path)
         refresh_config = self.db_config.get("refresh_strategy", {})
         self.data_checker = DataChecker(self.db_manager, refresh_config)
@@ -72,7 +72,7 @@ class DatabaseChecker:
         actual_db_path = db_path or db_config.get("db_path", "runtime/database/books_history.db")
 
         try:
-            db_manager = DatabaseManager(actual_db_path)
+            db_manager = DatabaseManager(actual_db_path, pragmas=db_config.get("pragmas"))
             db_manager.init_database()
 
             # 构建 refresh_config
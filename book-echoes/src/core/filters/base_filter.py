@@ -6,6 +6,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Tuple, List
 import pandas as pd
 from src.utils.logger import get_logger
+from src.utils.pattern_matcher import get_pattern_matcher
 
 logger = get_logger(__name__)
 
@@ -118,6 +119,11 @@ class BaseFilter(ABC):
         
         return patterns
     
+    def _match_patterns(self, text_series: pd.Series, patterns: List[str], match_type: str) -> Tuple[pd.Series, pd.Series]:
+        """一次扫描匹配整组模式，返回 (命中掩码, 命中的模式)；大小写规则与 _match_pattern 一致"""
+        matcher = get_pattern_matcher(patterns, match_type, case_sensitive=match_type != "contains")
+        return matcher.match(text_series)
+
     def _match_pattern(self, text_series: pd.Series, pattern: str, match_type: str) -> pd.Series:
         """统一匹配算法"""
         if match_type == "contains":
@@ -93,6 +93,5 @@ class CallNumberFilter(BaseFilter):
         mask = pd.Series(False, index=dataframe.index)
         for column in columns:
             series = dataframe[column].fillna('').astype(str)
-            for pattern in patterns:
-                mask |= self._match_pattern(series, pattern, match_type)
+            mask |= self._match_patterns(series, patterns, match_type)[0]
         return mask
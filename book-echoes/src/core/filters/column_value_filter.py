@@ -7,6 +7,7 @@ import re
 from typing import Dict, Any, Tuple
 from .base_filter import BaseFilter
 from src.utils.logger import get_logger
+from src.utils.pattern_matcher import get_pattern_matcher
 
 logger = get_logger(__name__)
 
@@ -78,9 +79,5 @@ class ColumnValueFilter(BaseFilter):
         if not exclude_patterns:
             return pd.Series(False, index=text_series.index)
         
-        excluded_mask = pd.Series(False, index=text_series.index)
-        
-        for pattern in exclude_patterns:
-            excluded_mask |= text_series.astype(str).str.contains(pattern, na=False, case=False)
-        
-        return excluded_mask
\ No newline at end of file
+        matcher = get_pattern_matcher(exclude_patterns, "contains", case_sensitive=False)
+        return matcher.mask(text_series.astype(str))
\ No newline at end of file
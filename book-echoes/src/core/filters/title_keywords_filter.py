@@ -37,13 +37,10 @@ class TitleKeywordsFilter(BaseFilter):
 
         match_type = self.config['match_type']
 
-        # 应用筛选
-        excluded_mask = pd.Series(False, index=result_data.index)
-
-        for keyword in keywords:
-            excluded_mask |= self._match_pattern(
-                result_data[target_column].astype(str), keyword, match_type
-            )
+        # 应用筛选（全部关键词编译为一个匹配器，单次扫描）
+        excluded_mask, _ = self._match_patterns(
+            result_data[target_column].astype(str), keywords, match_type
+        )
 
         excluded_count = excluded_mask.sum()
         result_data = result_data[~excluded_mask]
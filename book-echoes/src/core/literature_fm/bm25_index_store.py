@@ -0,0 +1,584 @@
+"""
+BM25持久化倒排索引
+将分词结果按书籍内容哈希缓存到磁盘，并编译为可内存映射的倒排表（postings）
+
+目录结构:
+    <index_dir>/
+        doc_terms.db          # 每本书的分词结果、内容哈希与书籍信息缓存（增量更新的依据）
+        manifest.json         # 当前生效的索引代（generation）与统计信息
+        <generation>/         # 编译产物，启动时以 mmap 方式加载
+            book_ids.npy      # 文档序号 -> book_id
+            doc_len.npy       # 文档长度
+            idf.npy           # term_id -> IDF
+            offsets.npy       # term_id -> postings 起止位置（CSR）
+            postings_docs.npy # 文档序号
+            postings_tfs.npy  # 词频
+"""
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import jieba
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 索引格式版本，格式变化时递增以触发全量重建
+INDEX_FORMAT_VERSION = 1
+
+_ARRAY_NAMES = ("book_ids", "doc_len", "idf", "offsets", "postings_docs", "postings_tfs")
+
+
+class BM25IndexStore:
+    """
+    BM25持久化倒排索引
+
+    - 以 (title, call_no, tags_json) 的内容哈希判定书籍是否变化，只对新增/变化的书籍重新分词
+    - 编译产物为 .npy 数组，启动时 mmap 加载，数据库未变化时无需读取书籍正文
+    - 打分公式与 rank_bm25.BM25Okapi 保持一致（含 epsilon 负IDF下限）
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        table: str,
+        index_dir: str,
+        doc_builder: Callable[[Dict], str],
+        field_weights: Dict[str, float],
+        epsilon: float = 0.25
+    ):
+        """
+        初始化索引存储
+
+        Args:
+            db_path: 书籍数据库路径（literary_tags 所在库）
+            table: 表名
+            index_dir: 索引目录
+            doc_builder: 由书籍行构建文档文本的函数
+            field_weights: 字段权重（参与索引参数签名，变化时全量重建）
+            epsilon: 负IDF下限系数，与 BM25Okapi 一致
+        """
+        self.db_path = db_path
+        self.table = table
+        self.index_dir = Path(index_dir)
+        self.store_path = self.index_dir / "doc_terms.db"
+        self.manifest_path = self.index_dir / "manifest.json"
+        self.doc_builder = doc_builder
+        self.epsilon = epsilon
+        self.params_signature = json.dumps(
+            {"version": INDEX_FORMAT_VERSION, "field_weights": field_weights, "epsilon": epsilon},
+            sort_keys=True
+        )
+
+        # 已加载的索引（mmap）
+        self.manifest: Optional[Dict] = None
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.corpus_size = 0
+        self.avgdl = 0.0
+
+        # 进程内查找缓存
+        self._term_ids: Dict[str, int] = {}
+        self._book_cache: Dict[int, Dict] = {}
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+
+    def open(self, force_sync: bool = False) -> Dict:
+        """
+        打开索引：数据库未变化时直接 mmap 加载，否则先增量同步再加载
+
+        Args:
+            force_sync: 是否忽略指纹，逐本比对内容哈希
+
+        Returns:
+            同步统计信息
+        """
+        self._init_store()
+        stats = self.sync(force=force_sync)
+        self.load()
+        return stats
+
+    def sync(self, force: bool = False) -> Dict:
+        """
+        增量同步：只对新增或内容变化的书籍分词，并在有变化时重新编译倒排表
+
+        Args:
+            force: 是否忽略指纹强制比对
+
+        Returns:
+            {"changed": bool, "added": int, "updated": int, "removed": int, "unchanged": int}
+        """
+        fingerprint = self._read_fingerprint()
+        manifest = self._read_manifest()
+
+        if not force and self._manifest_is_current(manifest, fingerprint):
+            logger.info("BM25索引指纹未变化，跳过同步")
+            return {"changed": False, "added": 0, "updated": 0, "removed": 0, "unchanged": manifest["corpus_size"]}
+
+        stats = self._sync_doc_terms()
+        changed = bool(stats["added"] or stats["updated"] or stats["removed"])
+
+        if changed or not self._manifest_is_compiled(manifest):
+            self._compile(fingerprint)
+            changed = True
+        else:
+            # 内容未变化（例如仅状态字段更新），只刷新指纹
+            manifest["fingerprint"] = fingerprint
+            self._write_manifest(manifest)
+
+        stats["changed"] = changed
+        logger.info(
+            f"BM25索引同步完成: 新增={stats['added']}, 更新={stats['updated']}, "
+            f"删除={stats['removed']}, 未变化={stats['unchanged']}"
+        )
+        return stats
+
+    def load(self) -> bool:
+        """
+        以 mmap 方式加载当前代的编译产物
+
+        Returns:
+            bool: 索引是否可用（空语料返回 False）
+        """
+        self.close()
+        manifest = self._read_manifest()
+        if not self._manifest_is_compiled(manifest) or manifest["corpus_size"] == 0:
+            return False
+
+        gen_dir = self.index_dir / manifest["generation"]
+        self.arrays = {
+            name: np.load(gen_dir / f"{name}.npy", mmap_mode="r")
+            for name in _ARRAY_NAMES
+        }
+        self.manifest = manifest
+        self.corpus_size = manifest["corpus_size"]
+        self.avgdl = manifest["avgdl"]
+        logger.info(f"✓ BM25索引已加载(mmap): {self.corpus_size} 篇文档, 代={manifest['generation']}")
+        return True
+
+    def close(self):
+        """释放 mmap 与进程内缓存"""
+        self.arrays = {}
+        self.manifest = None
+        self.corpus_size = 0
+        self.avgdl = 0.0
+        self._term_ids = {}
+        self._book_cache = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self.arrays)
+
+    @property
+    def book_ids(self) -> np.ndarray:
+        return self.arrays["book_ids"]
+
+    def lookup_term_ids(self, tokens: Iterable[str]) -> Dict[str, int]:
+        """
+        查询词 -> term_id（未收录的词不返回）
+
+        Args:
+            tokens: 查询分词
+
+        Returns:
+            {term: term_id}
+        """
+        missing = [t for t in set(tokens) if t not in self._term_ids]
+        if missing:
+            conn = sqlite3.connect(self.store_path)
+            try:
+                placeholders = ",".join("?" * len(missing))
+                rows = conn.execute(
+                    f"SELECT term, term_id FROM terms WHERE term IN ({placeholders})", missing
+                ).fetchall()
+            finally:
+                conn.close()
+            found = dict(rows)
+            for term in missing:
+                # -1 表示未收录，同样缓存避免重复查询
+                self._term_ids[term] = found.get(term, -1)
+
+        vocab_size = len(self.arrays["idf"]) if self.arrays else 0
+        return {
+            t: self._term_ids[t] for t in set(tokens)
+            if 0 <= self._term_ids.get(t, -1) < vocab_size
+        }
+
+    def score_sparse(self, query_tokens: List[str], k1: float, b: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        只遍历查询词的 postings 计算BM25分数（与 BM25Okapi.get_scores 在命中文档上的结果一致）
+
+        Args:
+            query_tokens: 查询分词（重复词按次数累加）
+            k1: 词频饱和参数
+            b: 长度归一化参数
+
+        Returns:
+            (doc_indices, scores)：命中文档的序号（升序）与分数，未命中文档分数为 0 不返回
+        """
+        term_ids = self.lookup_term_ids(query_tokens)
+        offsets = self.arrays["offsets"]
+        idf = self.arrays["idf"]
+        doc_len = self.arrays["doc_len"]
+
+        doc_chunks = []
+        score_chunks = []
+        for token in query_tokens:
+            term_id = term_ids.get(token)
+            if term_id is None:
+                continue
+            start, end = int(offsets[term_id]), int(offsets[term_id + 1])
+            if start == end:
+                continue
+            docs = self.arrays["postings_docs"][start:end]
+            tfs = self.arrays["postings_tfs"][start:end].astype(np.float64)
+            norm = k1 * (1 - b + b * doc_len[docs] / self.avgdl)
+            doc_chunks.append(docs)
+            score_chunks.append(float(idf[term_id]) * (tfs * (k1 + 1) / (tfs + norm)))
+
+        if not doc_chunks:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+        # 按文档聚合各查询词的贡献
+        doc_indices, inverse = np.unique(np.concatenate(doc_chunks), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_chunks), minlength=len(doc_indices))
+        return doc_indices, scores
+
+    def get_book_info(self, book_id: int) -> Optional[Dict]:
+        """获取书籍信息（进程内缓存 -> doc_terms.db）"""
+        book_id = int(book_id)
+        if book_id not in self._book_cache:
+            self.prefetch_book_info([book_id])
+        return self._book_cache.get(book_id)
+
+    def prefetch_book_info(self, book_ids: Iterable[int]):
+        """批量预取书籍信息到进程内缓存"""
+        missing = [int(bid) for bid in book_ids if int(bid) not in self._book_cache]
+        if not missing:
+            return
+        conn = sqlite3.connect(self.store_path)
+        try:
+            placeholders = ",".join("?" * len(missing))
+            rows = conn.execute(
+                f"SELECT book_id, title, author, call_no, tags_json FROM doc_terms "
+                f"WHERE book_id IN ({placeholders})",
+                missing
+            ).fetchall()
+        finally:
+            conn.close()
+        for book_id, title, author, call_no, tags_json in rows:
+            self._book_cache[book_id] = {
+                "title": title or "",
+                "author": author or "",
+                "call_no": call_no or "",
+                "tags_json": tags_json or ""
+            }
+
+    def get_stats(self) -> Dict:
+        """获取索引统计信息"""
+        return {
+            "index_dir": str(self.index_dir),
+            "generation": self.manifest.get("generation") if self.manifest else None,
+            "total_docs": self.corpus_size,
+            "vocab_size": len(self.arrays["idf"]) if self.arrays else 0,
+            "postings": len(self.arrays["postings_docs"]) if self.arrays else 0,
+            "cached_books": len(self._book_cache)
+        }
+
+    # ------------------------------------------------------------------
+    # 增量同步
+    # ------------------------------------------------------------------
+
+    def _init_store(self):
+        """初始化 doc_terms.db；索引参数变化时清空重建"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.store_path)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS terms (
+                    term_id INTEGER PRIMARY KEY,
+                    term TEXT NOT NULL UNIQUE
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS doc_terms (
+                    book_id INTEGER PRIMARY KEY,
+                    row_id INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    doc_len INTEGER NOT NULL,
+                    term_ids BLOB NOT NULL,
+                    term_tfs BLOB NOT NULL,
+                    title TEXT,
+                    author TEXT,
+                    call_no TEXT,
+                    tags_json TEXT
+                )
+            """)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+            if row is None or row[0] != self.params_signature:
+                if row is not None:
+                    logger.info("BM25索引参数已变化，清空分词缓存并全量重建")
+                conn.execute("DELETE FROM doc_terms")
+                conn.execute("DELETE FROM terms")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)",
+                    (self.params_signature,)
+                )
+                if self.manifest_path.exists():
+                    self.manifest_path.unlink()
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _read_fingerprint(self) -> List:
+        """读取源表指纹（只做聚合查询，不读取正文）"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(f"""
+                SELECT COUNT(*), MAX(id), MAX(updated_at), TOTAL(book_id)
+                FROM {self.table}
+                WHERE llm_status = 'success'
+            """).fetchone()
+        finally:
+            conn.close()
+        return [row[0], row[1], str(row[2]) if row[2] is not None else None, row[3]]
+
+    def _sync_doc_terms(self) -> Dict:
+        """比对内容哈希，对新增/变化的书籍分词并写入 doc_terms"""
+        src = sqlite3.connect(self.db_path)
+        src.row_factory = sqlite3.Row
+        try:
+            books = [dict(row) for row in src.execute(f"""
+                SELECT id, book_id, call_no, title, tags_json
+                FROM {self.table}
+                WHERE llm_status = 'success'
+                ORDER BY id
+            """)]
+        finally:
+            src.close()
+
+        conn = sqlite3.connect(self.store_path)
+        try:
+            existing = {
+                book_id: (row_id, content_hash)
+                for book_id, row_id, content_hash in conn.execute(
+                    "SELECT book_id, row_id, content_hash FROM doc_terms"
+                )
+            }
+            term_ids = dict(conn.execute("SELECT term, term_id FROM terms"))
+            next_term_id = max(term_ids.values(), default=-1) + 1
+            new_terms: List[Tuple[int, str]] = []
+
+            upserts = []
+            moved = []
+            seen = set()
+            stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+            for book in books:
+                book_id = book.get("book_id") or book.get("id")
+                seen.add(book_id)
+                content_hash = self._content_hash(book)
+                previous = existing.get(book_id)
+
+                if previous and previous[1] == content_hash:
+                    stats["unchanged"] += 1
+                    if previous[0] != book["id"]:
+                        moved.append((book["id"], book_id))
+                    continue
+
+                tokens = list(jieba.cut(self.doc_builder(book)))
+                counts = Counter(tokens)
+                ids = []
+                for term in counts:
+                    if term not in term_ids:
+                        term_ids[term] = next_term_id
+                        new_terms.append((next_term_id, term))
+                        next_term_id += 1
+                    ids.append(term_ids[term])
+
+                upserts.append((
+                    book_id,
+                    book["id"],
+                    content_hash,
+                    len(tokens),
+                    np.asarray(ids, dtype=np.int32).tobytes(),
+                    np.asarray(list(counts.values()), dtype=np.int32).tobytes(),
+                    book.get("title", ""),
+                    _extract_author(book.get("tags_json", "")),
+                    book.get("call_no", ""),
+                    book.get("tags_json", "")
+                ))
+                stats["updated" if previous else "added"] += 1
+
+            removed = [(book_id,) for book_id in existing if book_id not in seen]
+            stats["removed"] = len(removed)
+
+            conn.executemany("INSERT INTO terms (term_id, term) VALUES (?, ?)", new_terms)
+            conn.executemany("""
+                INSERT OR REPLACE INTO doc_terms (
+                    book_id, row_id, content_hash, doc_len, term_ids, term_tfs,
+                    title, author, call_no, tags_json
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, upserts)
+            conn.executemany("UPDATE doc_terms SET row_id = ? WHERE book_id = ?", moved)
+            conn.executemany("DELETE FROM doc_terms WHERE book_id = ?", removed)
+            conn.commit()
+        finally:
+            conn.close()
+
+        return stats
+
+    @staticmethod
+    def _content_hash(book: Dict) -> str:
+        """书籍内容哈希（决定是否需要重新分词）"""
+        payload = "\x1f".join(
+            str(book.get(key) or "") for key in ("title", "call_no", "tags_json")
+        )
+        return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # 编译
+    # ------------------------------------------------------------------
+
+    def _compile(self, fingerprint: List):
+        """由 doc_terms 编译 CSR 倒排表与 IDF，写入新一代目录后切换 manifest"""
+        conn = sqlite3.connect(self.store_path)
+        try:
+            rows = conn.execute(
+                "SELECT book_id, doc_len, term_ids, term_tfs FROM doc_terms ORDER BY row_id"
+            ).fetchall()
+            vocab_size = conn.execute("SELECT COALESCE(MAX(term_id), -1) + 1 FROM terms").fetchone()[0]
+        finally:
+            conn.close()
+
+        corpus_size = len(rows)
+        generation = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        manifest = {
+            "version": INDEX_FORMAT_VERSION,
+            "generation": generation,
+            "fingerprint": fingerprint,
+            "corpus_size": corpus_size,
+            "avgdl": 0.0,
+            "vocab_size": vocab_size,
+            "built_at": datetime.now().isoformat()
+        }
+
+        if corpus_size == 0:
+            logger.warning("BM25索引语料为空")
+            self._write_manifest(manifest)
+            self._cleanup_generations(generation)
+            return
+
+        book_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=corpus_size)
+        doc_len = np.fromiter((r[1] for r in rows), dtype=np.int32, count=corpus_size)
+        term_chunks = [np.frombuffer(r[2], dtype=np.int32) for r in rows]
+        tf_chunks = [np.frombuffer(r[3], dtype=np.int32) for r in rows]
+
+        terms = np.concatenate(term_chunks)
+        tfs = np.concatenate(tf_chunks)
+        docs = np.repeat(
+            np.arange(corpus_size, dtype=np.int32),
+            [len(chunk) for chunk in term_chunks]
+        )
+
+        # 按 (term, doc) 排序得到 CSR
+        order = np.lexsort((docs, terms))
+        postings_docs = docs[order]
+        postings_tfs = tfs[order]
+        df = np.bincount(terms, minlength=vocab_size)
+        offsets = np.zeros(vocab_size + 1, dtype=np.int64)
+        np.cumsum(df, out=offsets[1:])
+
+        idf = self._calc_idf(df, corpus_size)
+        avgdl = float(doc_len.sum()) / corpus_size
+
+        gen_dir = self.index_dir / generation
+        gen_dir.mkdir(parents=True, exist_ok=True)
+        for name, array in (
+            ("book_ids", book_ids),
+            ("doc_len", doc_len),
+            ("idf", idf),
+            ("offsets", offsets),
+            ("postings_docs", postings_docs),
+            ("postings_tfs", postings_tfs)
+        ):
+            np.save(gen_dir / f"{name}.npy", array)
+
+        manifest["avgdl"] = avgdl
+        self._write_manifest(manifest)
+        self._cleanup_generations(generation)
+        logger.info(
+            f"✓ BM25倒排表编译完成: {corpus_size} 篇文档, 词表={vocab_size}, "
+            f"postings={len(postings_docs)}"
+        )
+
+    def _calc_idf(self, df: np.ndarray, corpus_size: int) -> np.ndarray:
+        """与 BM25Okapi._calc_idf 一致：负IDF取 epsilon * 平均IDF"""
+        idf = np.zeros(len(df), dtype=np.float64)
+        present = df > 0
+        if not present.any():
+            return idf
+        values = np.log(corpus_size - df[present] + 0.5) - np.log(df[present] + 0.5)
+        average_idf = math.fsum(values) / len(values)
+        values[values < 0] = self.epsilon * average_idf
+        idf[present] = values
+        return idf
+
+    # ------------------------------------------------------------------
+    # manifest
+    # ------------------------------------------------------------------
+
+    def _read_manifest(self) -> Optional[Dict]:
+        if not self.manifest_path.exists():
+            return None
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"读取BM25索引manifest失败，将重建: {e}")
+            return None
+
+    def _write_manifest(self, manifest: Dict):
+        """先写临时文件再替换，保证读者看到完整的 manifest"""
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _manifest_is_compiled(self, manifest: Optional[Dict]) -> bool:
+        if not manifest or manifest.get("version") != INDEX_FORMAT_VERSION:
+            return False
+        if manifest.get("corpus_size") == 0:
+            return True
+        gen_dir = self.index_dir / manifest.get("generation", "")
+        return all((gen_dir / f"{name}.npy").exists() for name in _ARRAY_NAMES)
+
+    def _manifest_is_current(self, manifest: Optional[Dict], fingerprint: List) -> bool:
+        return self._manifest_is_compiled(manifest) and manifest.get("fingerprint") == fingerprint
+
+    def _cleanup_generations(self, keep: str):
+        """删除旧代目录（其他进程仍在 mmap 时可能删除失败，忽略即可）"""
+        for path in self.index_dir.iterdir():
+            if path.is_dir() and path.name != keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def _extract_author(tags_json: str) -> str:
+    """从 tags_json 中提取作者"""
+    try:
+        tags = json.loads(tags_json) if tags_json else {}
+        return tags.get("douban_author", "")
+    except json.JSONDecodeError:
+        return ""
@@ -1,18 +1,17 @@
 """
 BM25检索器
-基于 rank-bm25 实现字面召回（关键词匹配检索）
+基于持久化倒排索引实现字面召回（关键词匹配检索），打分与 rank-bm25 的 BM25Okapi 一致
 """
 
 import json
 import random
-import sqlite3
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import jieba
 import numpy as np
-from rank_bm25 import BM25Okapi
 
 from src.utils.logger import get_logger
+from .bm25_index_store import BM25IndexStore
 
 logger = get_logger(__name__)
 
@@ -22,7 +21,8 @@ class BM25Searcher:
     BM25全文检索器
 
     基于 search_keywords 对书名、作者、简介进行BM25检索
-    支持懒加载：首次调用 search() 时构建索引
+    支持懒加载：首次调用 search() 时打开索引
+    索引持久化在 index_dir 下，数据库未变化时直接 mmap 加载，变化时只对新增/修改的书籍重新分词
     """
 
     def __init__(
@@ -31,7 +31,8 @@ class BM25Searcher:
         table: str = "literary_tags",
         k1: float = 1.5,
         b: float = 0.75,
-        field_weights: Optional[Dict[str, float]] = None
+        field_weights: Optional[Dict[str, float]] = None,
+        index_dir: str = "runtime/cache/bm25_index/literature_fm"
     ):
         """
         初始化BM25检索器
@@ -42,6 +43,7 @@ class BM25Searcher:
             k1: BM25词频饱和参数 (1.2-2.0)
             b: BM25长度归一化参数 (0.5-0.75)
             field_weights: 字段权重 {"title": 2.0, "author": 1.0, "summary": 1.5}
+            index_dir: 持久化索引目录
         """
         self.db_path = db_path
         self.table = table
@@ -51,10 +53,13 @@ class BM25Searcher:
 
         # 懒加载相关
         self._index_loaded = False
-        self.bm25 = None
-        self.corpus = []  # 分词后的文档列表
-        self.book_mapping = []  # 索引 -> book_id 映射
-        self.book_cache = {}  # book_id -> 书籍信息缓存
+        self.index = BM25IndexStore(
+            db_path=db_path,
+            table=table,
+            index_dir=index_dir,
+            doc_builder=self._build_doc_text,
+            field_weights=self.field_weights
+        )
 
     def search(
         self,
@@ -65,6 +70,8 @@ class BM25Searcher:
         """
         BM25检索
 
+        只遍历查询词的 postings 打分，argpartition 取 TopK，排除项以向量化掩码过滤
+
         Args:
             keywords: 关键词列表
             top_k: 返回结果数量
@@ -88,54 +95,29 @@ class BM25Searcher:
             if not self._index_loaded:
                 self._load_index()
 
-            if not self.bm25:
+            if not self.index.is_loaded:
                 logger.warning("BM25索引未构建，返回空结果")
                 return []
 
-            # 分词查询
-            query_text = " ".join(keywords)
-            query_tokens = list(jieba.cut(query_text))
-
-            if not query_tokens:
-                logger.warning("查询分词为空，返回空结果")
+            candidates = self._score_candidates(keywords, excluded_ids)
+            if candidates is None:
                 return []
+            book_ids, scores = candidates
 
-            logger.debug(f"BM25查询分词: {query_tokens[:10]}...")
-
-            # BM25打分
-            scores = self.bm25.get_scores(query_tokens)
-
-            # 排序并返回TopK
-            top_indices = np.argsort(scores)[::-1]
+            # 取TopK（按分数降序）
+            top = self._top_k_order(scores, top_k)
+            self.index.prefetch_book_info(book_ids[top])
 
             results = []
-            for idx in top_indices:
-                book_id = self.book_mapping[idx]
-                score = scores[idx]
-
-                # 过滤掉零分和排除项
-                if score <= 0:
-                    break
-                if excluded_ids and book_id in excluded_ids:
-                    continue
+            for i in top:
+                book_id = int(book_ids[i])
 
                 # 获取书籍信息
                 book_info = self._get_book_info(book_id)
                 if not book_info:
                     continue
 
-                results.append({
-                    "book_id": book_id,
-                    "title": book_info.get("title", ""),
-                    "author": book_info.get("author", ""),
-                    "call_no": book_info.get("call_no", ""),
-                    "tags_json": book_info.get("tags_json", ""),
-                    "bm25_score": round(float(score), 4),
-                    "source": "bm25"
-                })
-
-                if len(results) >= top_k:
-                    break
+                results.append(self._build_result(book_id, book_info, scores[i], "bm25"))
 
             logger.info(f"BM25检索完成: 关键词={keywords}, 结果数={len(results)}")
             return results
@@ -161,6 +143,8 @@ class BM25Searcher:
         3. 从扩展候选中随机抽取部分结果
         4. 合并并去重
 
+        与 search() 共用稀疏打分路径，只对零分以上的候选排序
+
         Args:
             keywords: 关键词列表
             top_k: 返回结果数量
@@ -176,7 +160,7 @@ class BM25Searcher:
             if not self._index_loaded:
                 self._load_index()
 
-            if not self.bm25:
+            if not self.index.is_loaded:
                 logger.warning("BM25索引未构建，返回空结果")
                 return []
 
@@ -184,72 +168,56 @@ class BM25Searcher:
                 # 无随机性，使用标准检索
                 return self.search(keywords, top_k, excluded_ids)
 
-            # 分词查询
-            query_text = " ".join(keywords)
-            query_tokens = list(jieba.cut(query_text))
-
-            if not query_tokens:
-                logger.warning("查询分词为空，返回空结果")
+            # 1. 计算命中文档的分数（排除项在阈值推断之后再过滤，与全量排序语义一致）
+            candidates = self._score_candidates(keywords)
+            if candidates is None:
                 return []
+            book_ids, scores = candidates
 
-            # 1. 计算所有文档的分数
-            scores = self.bm25.get_scores(query_tokens)
-
-            # 2. 自动推断分数阈值（取 top_k * 3 的分数作为基准）
+            # 2. 自动推断分数阈值（取 top_k * 3 的分数作为基准，未命中文档按零分计）
             if score_threshold is None:
-                threshold_idx = min(top_k * 3, len(scores) - 1)
-                sorted_indices = np.argsort(scores)[::-1]
-                score_threshold = max(0.1, scores[sorted_indices[threshold_idx]] * 0.5)
+                threshold_idx = min(top_k * 3, self.index.corpus_size - 1)
+                if threshold_idx < len(scores):
+                    kth_score = np.partition(scores, len(scores) - 1 - threshold_idx)[len(scores) - 1 - threshold_idx]
+                else:
+                    kth_score = 0.0
+                score_threshold = max(0.1, kth_score * 0.5)
 
-            # 3. 筛选高分候选
-            high_score_indices = np.where(scores >= score_threshold)[0]
-            logger.debug(f"高分候选数: {len(high_score_indices)}, 阈值: {score_threshold:.4f}")
+            # 3. 筛选高分候选并应用排除掩码
+            keep = scores >= score_threshold
+            if excluded_ids:
+                keep &= ~self._excluded_mask(book_ids, excluded_ids)
+            book_ids = book_ids[keep]
+            scores = scores[keep]
+            logger.debug(f"高分候选数: {len(scores)}, 阈值: {score_threshold:.4f}")
 
             # 4. 按分数排序
-            sorted_candidates = sorted(
-                high_score_indices,
-                key=lambda idx: scores[idx],
-                reverse=True
-            )
+            sorted_candidates = self._top_k_order(scores, len(scores))
 
-            # 5. 分离主结果和随机候选池
+            # 5. 分离主结果和随机候选池（高分段在排序结果的最前面）
             main_count = int(top_k * (1 - randomness))
             random_count = top_k - main_count
 
-            main_results = []
-            random_pool = []
-
-            for idx in sorted_candidates:
-                book_id = self.book_mapping[idx]
-                score = scores[idx]
+            high_count = int(np.count_nonzero(scores >= score_threshold * 1.5))
+            main_indices = list(sorted_candidates[:min(main_count, high_count)])
+            random_pool = list(sorted_candidates[len(main_indices):])
 
-                if excluded_ids and book_id in excluded_ids:
-                    continue
+            # 6. 从候选池随机采样
+            if random_count > 0 and len(random_pool) > 0:
+                sample_size = min(random_count, len(random_pool))
+                main_indices.extend(random.sample(random_pool, sample_size))
 
+            self.index.prefetch_book_info(book_ids[main_indices])
+            main_results = []
+            for i in main_indices:
+                book_id = int(book_ids[i])
                 book_info = self._get_book_info(book_id)
                 if not book_info:
                     continue
 
-                result = {
-                    "book_id": book_id,
-                    "title": book_info.get("title", ""),
-                    "author": book_info.get("author", ""),
-                    "call_no": book_info.get("call_no", ""),
-                    "tags_json": book_info.get("tags_json", ""),
-                    "bm25_score": round(float(score), 4),
-                    "source": "bm25_random" if score < score_threshold * 1.5 else "bm25"
-                }
-
-                if len(main_results) < main_count and score >= score_threshold * 1.5:
-                    main_results.append(result)
-                else:
-                    random_pool.append(result)
-
-            # 6. 从候选池随机采样
-            if random_count > 0 and len(random_pool) > 0:
-                sample_size = min(random_count, len(random_pool))
-                random_sample = random.sample(random_pool, sample_size)
-                main_results.extend(random_sample)
+                score = scores[i]
+                source = "bm25_random" if score < score_threshold * 1.5 else "bm25"
+                main_results.append(self._build_result(book_id, book_info, score, source))
 
             # 7. 按分数排序最终结果
             main_results.sort(key=lambda x: x["bm25_score"], reverse=True)
@@ -271,57 +239,96 @@ class BM25Searcher:
             # 降级到标准检索
             return self.search(keywords, top_k, excluded_ids)
 
-    def _load_index(self):
+    def _score_candidates(
+        self,
+        keywords: List[str],
+        excluded_ids: Optional[Set[int]] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        分词并对命中文档稀疏打分
+
+        Args:
+            keywords: 关键词列表
+            excluded_ids: 排除的book_id集合
+
+        Returns:
+            (book_ids, scores)，只包含分数大于零且未被排除的文档；分词为空时返回 None
         """
-        懒加载：从数据库加载书籍数据并构建BM25索引
+        query_text = " ".join(keywords)
+        query_tokens = list(jieba.cut(query_text))
+
+        if not query_tokens:
+            logger.warning("查询分词为空，返回空结果")
+            return None
+
+        logger.debug(f"BM25查询分词: {query_tokens[:10]}...")
+
+        doc_indices, scores = self.index.score_sparse(query_tokens, self.k1, self.b)
+        book_ids = self.index.book_ids[doc_indices]
+
+        # 过滤掉零分和排除项
+        keep = scores > 0
+        if excluded_ids:
+            keep &= ~self._excluded_mask(book_ids, excluded_ids)
+
+        return book_ids[keep], scores[keep]
+
+    @staticmethod
+    def _excluded_mask(book_ids: np.ndarray, excluded_ids: Set[int]) -> np.ndarray:
+        """排除项掩码"""
+        return np.isin(book_ids, np.fromiter(excluded_ids, dtype=np.int64, count=len(excluded_ids)))
+
+    @staticmethod
+    def _top_k_order(scores: np.ndarray, k: int) -> np.ndarray:
         """
-        try:
-            logger.info("开始构建BM25索引...")
-
-            # 从数据库加载书籍数据
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(f"""
-                SELECT id, book_id, call_no, title, tags_json
-                FROM {self.table}
-                WHERE llm_status = 'success'
-            """)
-
-            books = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-
-            logger.info(f"从数据库加载 {len(books)} 本书籍")
-
-            # 构建索引
-            self.corpus = []
-            self.book_mapping = []
-
-            for book in books:
-                book_id = book.get("book_id") or book.get("id")
-
-                # 缓存书籍信息
-                self.book_cache[book_id] = {
-                    "title": book.get("title", ""),
-                    "author": self._extract_author_from_tags(book.get("tags_json", "")),
-                    "call_no": book.get("call_no", ""),
-                    "tags_json": book.get("tags_json", "")
-                }
+        取分数最高的 k 个位置（降序）
 
-                # 构建文档文本（加权）
-                doc_text = self._build_doc_text(book)
-                doc_tokens = list(jieba.cut(doc_text))
+        argpartition 先选出 TopK，再只对这 k 个排序，复杂度 O(n + k log k)
+        """
+        n = len(scores)
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    @staticmethod
+    def _build_result(book_id: int, book_info: Dict, score: float, source: str) -> Dict:
+        """构建检索结果"""
+        return {
+            "book_id": book_id,
+            "title": book_info.get("title", ""),
+            "author": book_info.get("author", ""),
+            "call_no": book_info.get("call_no", ""),
+            "tags_json": book_info.get("tags_json", ""),
+            "bm25_score": round(float(score), 4),
+            "source": source
+        }
 
-                self.corpus.append(doc_tokens)
-                self.book_mapping.append(book_id)
+    def _load_index(self, force_sync: bool = False):
+        """
+        懒加载：打开持久化BM25索引（必要时先增量同步）
 
-            # 构建BM25索引
-            self.bm25 = BM25Okapi(self.corpus, k1=self.k1, b=self.b)
+        Args:
+            force_sync: 是否忽略表指纹，逐本比对内容哈希
+        """
+        try:
+            logger.info("开始加载BM25索引...")
+            stats = self.index.open(force_sync=force_sync)
             self._index_loaded = True
 
-            logger.info(f"✓ BM25索引构建完成: {len(self.corpus)} 篇文档")
+            if stats.get("changed"):
+                logger.info(
+                    f"✓ BM25索引已更新: 新增={stats['added']}, 更新={stats['updated']}, "
+                    f"删除={stats['removed']}"
+                )
+            logger.info(f"✓ BM25索引加载完成: {self.index.corpus_size} 篇文档")
 
         except Exception as e:
-            logger.error(f"BM25索引构建失败: {str(e)}")
+            logger.error(f"BM25索引加载失败: {str(e)}")
             raise
 
     def _build_doc_text(self, book: Dict) -> str:
@@ -368,37 +375,24 @@ class BM25Searcher:
 
         return " ".join(parts)
 
-    def _extract_author_from_tags(self, tags_json: str) -> str:
-        """从 tags_json 中提取作者"""
-        try:
-            tags = json.loads(tags_json) if tags_json else {}
-            return tags.get("douban_author", "")
-        except json.JSONDecodeError:
-            return ""
-
     def _get_book_info(self, book_id: int) -> Optional[Dict]:
-        """获取书籍信息（从缓存）"""
-        return self.book_cache.get(book_id)
+        """获取书籍信息（从索引的书籍缓存）"""
+        return self.index.get_book_info(book_id)
 
     def reload_index(self):
         """
         重新加载索引（用于数据更新后）
 
-        Note: 这会清空现有索引并重新构建
+        Note: 逐本比对内容哈希，只对变化的书籍重新分词
         """
         logger.info("重新加载BM25索引...")
         self._index_loaded = False
-        self.bm25 = None
-        self.corpus = []
-        self.book_mapping = []
-        self.book_cache = {}
-        self._load_index()
+        self.index.close()
+        self._load_index(force_sync=True)
 
     def get_index_stats(self) -> Dict:
         """获取索引统计信息"""
-        return {
-            "index_loaded": self._index_loaded,
-            "total_docs": len(self.corpus),
-            "total_books": len(self.book_mapping),
-            "cached_books": len(self.book_cache)
-        }
+        stats = self.index.get_stats()
+        stats["index_loaded"] = self._index_loaded
+        stats["total_books"] = stats["total_docs"]
+        return stats
@@ -16,7 +16,6 @@ from dotenv import load_dotenv
 load_dotenv(root_dir / "config" / ".env")
 
 import sqlite3
-import time
 from typing import List, Dict
 
 from src.utils.logger import get_logger
@@ -69,29 +68,6 @@ def get_books_to_vectorize(
     return books
 
 
-def update_embedding_status(
-    db_path: str,
-    book_id: int,
-    embedding_id: str,
-    status: str = 'completed'
-) -> bool:
-    """更新向量化状态"""
-    try:
-        from datetime import datetime
-        conn = sqlite3.connect(db_path)
-        conn.execute("""
-            UPDATE literary_tags
-            SET embedding_status = ?, embedding_id = ?, embedding_date = ?
-            WHERE book_id = ?
-        """, (status, embedding_id, datetime.now().isoformat(), book_id))
-        conn.commit()
-        conn.close()
-        return True
-    except Exception as e:
-        logger.error(f"更新向量化状态失败: {e}")
-        return False
-
-
 def vectorize_database(
     db_path: str = "runtime/database/books_history.db",
     config_path: str = "config/literature_fm_vector.yaml",
@@ -104,7 +80,7 @@ def vectorize_database(
     Args:
         db_path: 数据库路径
         config_path: 配置文件路径
-        batch_size: 每批处理数量
+        batch_size: 每次 embedding 请求的书籍数（并发批次数见 embedding.concurrency）
         max_books: 最大处理数量（0表示全部）
 
     Returns:
@@ -116,7 +92,8 @@ def vectorize_database(
 
     # 初始化
     init_literary_tags_table(db_path)
-    vector_searcher = VectorSearcher(config_path)
+    # 状态写回与读取使用同一个库（相对路径按当前目录解析，与下方 sqlite3.connect 一致）
+    vector_searcher = VectorSearcher(config_path, db_path=str(Path(db_path).resolve()))
 
     stats = {
         'total': 0,
@@ -125,18 +102,20 @@ def vectorize_database(
         'skipped': 0
     }
 
-    offset = 0
+    # 按 lt.id 游标分页：已完成的书籍不会再被查询（断点续跑），本轮失败的书籍也不会被反复拉取
+    last_id = 0
+    page_size = batch_size * vector_searcher.config['embedding'].get('concurrency', 4) * 2
     while True:
-        # 获取一批待向量化的书籍
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        if max_books > 0 and stats['total'] >= max_books:
+            break
 
+        limit = page_size
         if max_books > 0:
-            limit_clause = f"LIMIT {batch_size} OFFSET {offset}"
-        else:
-            limit_clause = f"LIMIT {batch_size}"
+            limit = min(limit, max_books - stats['total'])
 
-        cursor = conn.execute(f"""
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.execute("""
             SELECT
                 lt.id as id,
                 lt.book_id,
@@ -154,9 +133,10 @@ def vectorize_database(
             LEFT JOIN books b ON lt.book_id = b.id
             WHERE lt.llm_status = 'success'
               AND (lt.embedding_status IS NULL OR lt.embedding_status != 'completed')
+              AND lt.id > ?
             ORDER BY lt.id ASC
-            {limit_clause}
-        """, () if max_books > 0 else ())
+            LIMIT ?
+        """, (last_id, limit))
 
         books = [dict(row) for row in cursor.fetchall()]
         conn.close()
@@ -164,52 +144,17 @@ def vectorize_database(
         if not books:
             break
 
-        if max_books > 0 and offset >= max_books:
-            break
+        last_id = books[-1]['id']
+        stats['total'] += len(books)
+        logger.info(f"处理批次: {len(books)} 本 (累计处理 {stats['total']} 本)")
+
+        to_index = [book for book in books if book.get('tags_json')]
+        stats['skipped'] += len(books) - len(to_index)
 
-        logger.info(f"处理批次: {len(books)} 本 (累计处理 {offset + len(books)} 本)")
-
-        # 批量向量化
-        for book in books:
-            try:
-                if not book.get('tags_json'):
-                    stats['skipped'] += 1
-                    continue
-
-                # 生成向量并添加到 ChromaDB
-                doc, metadata = vector_searcher._build_context_text(
-                    book_id=book['book_id'],
-                    call_no=book.get('call_no', ''),
-                    tags_json=book.get('tags_json', ''),
-                    douban_title=book.get('douban_title', ''),
-                    douban_subtitle=book.get('douban_subtitle', ''),
-                    douban_author=book.get('douban_author', ''),
-                    douban_summary=book.get('douban_summary', ''),
-                    douban_author_intro=book.get('douban_author_intro', ''),
-                    douban_catalog=book.get('douban_catalog', '')
-                )
-                embedding = vector_searcher.embedding_client.get_embedding(doc)
-
-                embedding_id = vector_searcher.vector_store.add(
-                    embedding=embedding,
-                    metadata=metadata,
-                    document=doc
-                )
-
-                # 更新状态
-                update_embedding_status(db_path, book['book_id'], embedding_id, 'completed')
-                stats['success'] += 1
-
-            except Exception as e:
-                logger.error(f"向量化失败 (book_id={book['book_id']}): {e}")
-                update_embedding_status(db_path, book['book_id'], '', 'failed')
-                stats['failed'] += 1
-
-        offset += len(books)
-        stats['total'] = offset
-
-        # 批次间延迟
-        time.sleep(1)
+        # 批量并发向量化（每批一次 embedding 请求、一次 upsert、一次状态更新）
+        batch_stats = vector_searcher.index_books(to_index, batch_size=batch_size)
+        stats['success'] += batch_stats['success']
+        stats['failed'] += batch_stats['failed']
 
     # 统计完成
     logger.info("\n" + "="*80)
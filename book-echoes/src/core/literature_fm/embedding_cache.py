@@ -0,0 +1,177 @@
+"""
+Embedding 本地缓存
+按 (model, dimensions, 归一化文本) 的内容哈希缓存向量，查询路径与建索引路径共用
+
+存储: SQLite（向量以 float32 BLOB 保存），超过 max_entries 时按最近访问时间（LRU）淘汰
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingCache:
+    """Embedding 内容寻址缓存（线程安全）"""
+
+    def __init__(self, path: str, max_entries: int = 200000):
+        """
+        初始化缓存
+
+        Args:
+            path: SQLite 缓存文件路径
+            max_entries: 最大条目数，超过后按 LRU 淘汰到 90%
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dimensions INTEGER,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """文本归一化：NFKC + 折叠空白"""
+        return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+    @classmethod
+    def make_key(cls, model: str, dimensions: Optional[int], text: str) -> str:
+        payload = f"{model}\x1f{dimensions}\x1f{cls.normalize(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, dimensions: Optional[int], texts: List[str]) -> Dict[str, List[float]]:
+        """
+        批量查询缓存
+
+        Args:
+            model: 模型名
+            dimensions: 向量维度
+            texts: 文本列表
+
+        Returns:
+            {text: embedding}，只包含命中的文本
+        """
+        keys: Dict[str, List[str]] = {}
+        for text in dict.fromkeys(texts):
+            keys.setdefault(self.make_key(model, dimensions, text), []).append(text)
+        if not keys:
+            return {}
+
+        now = time.time()
+        found = {}
+        with self._lock:
+            key_list = list(keys)
+            # SQLite 变量上限，分块查询
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    embedding = np.frombuffer(blob, dtype=np.float32).tolist()
+                    for text in keys[key]:
+                        found[text] = embedding
+                if rows:
+                    self.conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows]
+                    )
+            self.conn.commit()
+
+            hit_count = sum(1 for text in set(texts) if text in found)
+            self.hits += hit_count
+            self.misses += len(set(texts)) - hit_count
+
+        return found
+
+    def put_many(self, model: str, dimensions: Optional[int], items: Dict[str, List[float]]):
+        """
+        批量写入缓存
+
+        Args:
+            model: 模型名
+            dimensions: 向量维度
+            items: {text: embedding}
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (
+                self.make_key(model, dimensions, text),
+                model,
+                dimensions,
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                now,
+                now
+            )
+            for text, embedding in items.items()
+        ]
+        with self._lock:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO embeddings (key, model, dimensions, vector, last_access, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.commit()
+            self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        """超过上限时按 LRU 淘汰到 90%（调用方持有锁）"""
+        count = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        to_delete = count - int(self.max_entries * 0.9)
+        self.conn.execute("""
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?
+            )
+        """, (to_delete,))
+        self.conn.commit()
+        logger.info(f"Embedding 缓存淘汰 {to_delete} 条 (上限 {self.max_entries})")
+
+    def get_stats(self) -> Dict:
+        """获取缓存统计信息"""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -191,18 +191,19 @@ class HybridVectorSearcher:
         # 在循环外部获取一次 embedding，避免重复调用 API
         query_vector = self.base_searcher.embedding_client.get_embedding(query_text)
 
-        # 对每个SHOULD查询组合执行检索
-        for idx, should_filter in enumerate(should_queries):
-            # 合并MUST和SHOULD过滤器
-            combined_filter = self._merge_filters(must_conditions, should_filter)
-
-            # 检索（复用 query_vector）
-            results = self.base_searcher.vector_store.search(
-                query_embedding=query_vector,
-                top_k=top_k,
-                filter_metadata=combined_filter
-            )
+        # 合并MUST和SHOULD过滤器，并行执行所有SHOULD查询（复用 query_vector）
+        combined_filters = [
+            self._merge_filters(must_conditions, should_filter)
+            for should_filter in should_queries
+        ]
+        results_per_filter = self.base_searcher.vector_store.search_filters(
+            query_embedding=query_vector,
+            filters=combined_filters,
+            top_k=top_k
+        )
 
+        # 按原顺序合并，保持与串行执行相同的结果
+        for results in results_per_filter:
             # 应用MUST_NOT过滤器
             if must_not_conditions:
                 results = self._apply_must_not_filter(results, must_not_conditions)
@@ -392,13 +393,12 @@ class HybridVectorSearcher:
         else:
             actual_threshold = min_confidence
 
-        for book_id, similarity, result in candidates:
-            # 置信度过滤
-            if similarity < actual_threshold:
-                continue
+        # 置信度过滤后一次性批量获取书籍完整信息
+        passed = [item for item in candidates if item[1] >= actual_threshold]
+        books = self.base_searcher.db_reader.get_books_by_ids([book_id for book_id, _, _ in passed])
 
-            # 获取书籍完整信息
-            book_info = self.base_searcher.db_reader.get_book_by_id(book_id)
+        for book_id, similarity, result in passed:
+            book_info = books.get(book_id)
             if not book_info:
                 continue
 
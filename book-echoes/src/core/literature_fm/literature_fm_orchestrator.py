@@ -352,7 +352,8 @@ class LiteratureFMPipeline:
                     table=db_config['table'],
                     k1=bm25_config.get('k1', 1.5),
                     b=bm25_config.get('b', 0.75),
-                    field_weights=bm25_config.get('field_weights', {})
+                    field_weights=bm25_config.get('field_weights', {}),
+                    index_dir=bm25_config.get('index_dir', 'runtime/cache/bm25_index/literature_fm')
                 )
                 # 读取随机性配置
                 bm25_randomness = bm25_config.get('randomness', 0)
@@ -4,8 +4,11 @@ LLM打标器
 """
 
 import json
+import re
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import yaml
 
@@ -15,6 +18,55 @@ from .tag_manager import TagManager
 
 logger = get_logger(__name__)
 
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u9fff\uff00-\uffef]')
+
+
+def _estimate_tokens(text: str) -> int:
+    """粗略估算 token 数（中文约 1 字 1 token，其余约 4 字符 1 token）"""
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk) // 4
+
+
+class _RateLimiter:
+    """按固定间隔放行请求的限速器（线程安全），rpm <= 0 表示不限速"""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute and requests_per_minute > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class _ThroughputMeter:
+    """统计打标吞吐（本/分钟、token/分钟）"""
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self.count = 0
+        self.tokens = 0
+
+    def add(self, tokens: int):
+        self.count += 1
+        self.tokens += tokens
+
+    def summary(self) -> str:
+        minutes = max(time.monotonic() - self.start, 1e-6) / 60
+        return (
+            f"耗时 {minutes:.1f} 分钟 | {self.count / minutes:.1f} 本/分钟 | "
+            f"约 {self.tokens / minutes:.0f} tokens/分钟"
+        )
+
 
 class LLMTagger:
     """负责调用LLM为书目生成标签"""
@@ -28,6 +80,8 @@ class LLMTagger:
         self.llm_client = UnifiedLLMClient()
         self.tag_manager = TagManager()
         self.vocabulary = self._load_vocabulary()
+        self._rate_limiters: Dict[str, _RateLimiter] = {}
+        self._limiter_lock = threading.Lock()
     
     def _load_vocabulary(self) -> dict:
         """加载标签词表"""
@@ -47,8 +101,10 @@ class LLMTagger:
 
     def tag_books(self, books: List[Dict]) -> Dict[str, int]:
         """
-        批量打标
-        
+        批量打标（并发执行，结果分批落库）
+
+        已在 literary_tags 中标记为 success 的书目会被跳过，中断后重跑即可从断点续做
+
         Args:
             books: 书目列表，每个元素包含 id, title, author, douban_summary 等
             
@@ -58,68 +114,123 @@ class LLMTagger:
         if not books:
             logger.warning("待打标书目列表为空")
             return {'success': 0, 'failed': 0}
-        
-        batch_config = self.config.get('batch_processing', {})
-        batch_size = batch_config.get('batch_size', 10)
-        delay = batch_config.get('delay_between_batches', 2)
-        show_progress = batch_config.get('show_progress', True)
-        
-        stats = {'success': 0, 'failed': 0}
-        total_batches = (len(books) - 1) // batch_size + 1
-        
-        logger.info(f"开始批量打标，共 {len(books)} 本书，分 {total_batches} 批处理")
-        
-        for i in range(0, len(books), batch_size):
-            batch = books[i:i+batch_size]
-            batch_num = i // batch_size + 1
-            
-            if show_progress:
-                logger.info(f"{'='*60}")
-                logger.info(f"处理批次 {batch_num}/{total_batches} (共 {len(batch)} 本)")
-                logger.info(f"{'='*60}")
-            
-            for idx, book in enumerate(batch, 1):
-                if show_progress:
-                    title = book.get('douban_title') or book.get('book_title', 'Unknown')
-                    logger.info(f"[{batch_num}-{idx}/{len(batch)}] 正在处理: {title}")
-                
-                success = self._tag_single_book(book)
-                
-                if success:
-                    stats['success'] += 1
-                else:
-                    stats['failed'] += 1
-            
-            # 批次间延迟
-            if i + batch_size < len(books):
-                logger.info(f"批次完成，等待 {delay} 秒后继续...")
-                time.sleep(delay)
-        
+
+        done_ids = set(self.tag_manager.get_tagged_book_ids(status='success'))
+        pending = [book for book in books if book['id'] not in done_ids]
+        if len(pending) < len(books):
+            logger.info(f"跳过已打标成功的 {len(books) - len(pending)} 本书（断点续做）")
+        if not pending:
+            return {'success': 0, 'failed': 0}
+
+        logger.info(f"开始批量打标，共 {len(pending)} 本书")
+        stats = self._run_engine(pending, label="批量打标")
+
         logger.info(f"\n{'='*60}")
         logger.info(f"批量打标完成！成功: {stats['success']}, 失败: {stats['failed']}")
         logger.info(f"{'='*60}\n")
         
         return stats
+
+    def _run_engine(self, books: List[Dict], label: str, increment_retry: bool = False) -> Dict[str, int]:
+        """
+        并发打标引擎
+
+        线程池并发调用 LLM（在途任务数有上限，按 Provider 限速），
+        主线程收集结果并每 batch_size 条用一次 executemany 落库
+
+        Args:
+            books: 待打标书目
+            label: 日志前缀
+            increment_retry: 失败时是否增加重试计数（兜底重试使用）
+
+        Returns:
+            Dict[str, int]: {'success': n, 'failed': n}
+        """
+        batch_config = self.config.get('batch_processing', {})
+        batch_size = max(1, batch_config.get('batch_size', 10))
+        concurrency = max(1, batch_config.get('concurrency', 4))
+        show_progress = batch_config.get('show_progress', True)
+
+        stats = {'success': 0, 'failed': 0}
+        meter = _ThroughputMeter()
+        buffer: List[Dict] = []
+        total = len(books)
+        book_iter = iter(books)
+
+        def flush():
+            # 落库失败时 save_tags_batch 直接抛出，中止本轮；重跑时已落库的书目按断点续做跳过
+            if buffer:
+                self.tag_manager.save_tags_batch(buffer)
+                buffer.clear()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = {}
+
+            def submit_next() -> bool:
+                book = next(book_iter, None)
+                if book is None:
+                    return False
+                in_flight[executor.submit(self._tag_single_book, book)] = book
+                return True
+
+            # 在途任务数限制为 concurrency * 2，避免一次性提交全部书目
+            for _ in range(concurrency * 2):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    book = in_flight.pop(future)
+                    record, tokens = future.result()
+                    record['increment_retry'] = increment_retry and record['llm_status'] != 'success'
+                    buffer.append(record)
+                    meter.add(tokens)
+
+                    if record['llm_status'] == 'success':
+                        stats['success'] += 1
+                    else:
+                        stats['failed'] += 1
+
+                    if show_progress:
+                        title = book.get('douban_title') or book.get('book_title', 'Unknown')
+                        mark = "✓" if record['llm_status'] == 'success' else "✗"
+                        logger.info(f"[{label} {meter.count}/{total}] {mark} {title}")
+
+                    if len(buffer) >= batch_size:
+                        flush()
+                        logger.info(f"[{label}] 进度 {meter.count}/{total} | {meter.summary()}")
+
+                    submit_next()
+
+        flush()
+        logger.info(f"[{label}] 结束 | {meter.summary()}")
+        return stats
     
-    def _tag_single_book(self, book: Dict) -> bool:
+    def _tag_single_book(self, book: Dict) -> Tuple[Dict, int]:
         """
-        为单本书打标
+        为单本书打标（只调用 LLM，不写库，可在工作线程中执行）
 
         Args:
             book: 书目信息字典
 
         Returns:
-            bool: 是否成功
+            Tuple[Dict, int]: (待落库记录, 估算的 token 数)
         """
+        tokens = 0
         try:
             # 1. 构建Prompt
             user_prompt = self._build_user_prompt(book)
+            tokens += _estimate_tokens(user_prompt)
 
-            # 2. 调用LLM
+            # 2. 按 Provider 限速后调用LLM
+            llm_model, llm_provider = self._get_model_info()
+            self._get_rate_limiter(llm_provider).acquire()
             response = self.llm_client.call(
                 task_name='literary_tagging',
                 user_prompt=user_prompt
             )
+            tokens += _estimate_tokens(response if isinstance(response, str) else json.dumps(response, ensure_ascii=False))
             
             # 3. 解析响应
             tags_data = self._parse_response(response)
@@ -128,41 +239,45 @@ class LLMTagger:
             if not self._validate_tags(tags_data):
                 raise ValueError("标签数据验证失败")
             
-            # 5. 获取使用的模型信息（从配置中读取）
-            llm_model, llm_provider = self._get_model_info()
-            
-            # 6. 保存到数据库
             book_title = book.get('douban_title') or book.get('book_title', '')
-            self.tag_manager.save_tags(
-                book_id=book['id'],
-                call_no=book.get('call_no', ''),
-                title=book_title,
-                tags_json=json.dumps(tags_data, ensure_ascii=False),
-                llm_model=llm_model,
-                llm_provider=llm_provider,
-                llm_status='success'
-            )
-            
-            logger.info(f"  ✓ 打标成功")
-            return True
+            return {
+                'book_id': book['id'],
+                'call_no': book.get('call_no', ''),
+                'title': book_title,
+                'tags_json': json.dumps(tags_data, ensure_ascii=False),
+                'llm_model': llm_model,
+                'llm_provider': llm_provider,
+                'llm_status': 'success'
+            }, tokens
             
         except Exception as e:
-            logger.error(f"  ✗ 打标失败: {str(e)}")
+            logger.error(f"  ✗ 打标失败 (book_id={book.get('id')}): {str(e)}")
 
             # 记录失败状态 - 优先使用 book_title,其次用 douban_title
             title = book.get('book_title') or book.get('douban_title', '')
-            self.tag_manager.save_tags(
-                book_id=book['id'],
-                call_no=book.get('call_no', ''),
-                title=title,
-                tags_json='',
-                llm_model='',
-                llm_provider='',
-                llm_status='failed',
-                error_message=str(e)[:500]
-            )
-
-            return False
+            return {
+                'book_id': book['id'],
+                'call_no': book.get('call_no', ''),
+                'title': title,
+                'tags_json': '',
+                'llm_model': '',
+                'llm_provider': '',
+                'llm_status': 'failed',
+                'error_message': str(e)[:500]
+            }, tokens
+
+    def _get_rate_limiter(self, provider: str) -> "_RateLimiter":
+        """获取 Provider 对应的限速器（rate_limits 中单独配置，否则用 requests_per_minute）"""
+        with self._limiter_lock:
+            limiter = self._rate_limiters.get(provider)
+            if limiter is None:
+                batch_config = self.config.get('batch_processing', {})
+                rpm = batch_config.get('rate_limits', {}).get(
+                    provider, batch_config.get('requests_per_minute', 0)
+                )
+                limiter = _RateLimiter(rpm)
+                self._rate_limiters[provider] = limiter
+            return limiter
     
     def _get_model_info(self) -> tuple:
         """
@@ -360,26 +475,9 @@ class LLMTagger:
         logger.info(f"开始兜底重试，共 {len(failed_records)} 条记录")
         logger.info(f"{'='*60}\n")
         
-        stats = {'success': 0, 'failed': 0}
-        
-        for idx, record in enumerate(failed_records, 1):
-            logger.info(f"[{idx}/{len(failed_records)}] 重试: {record.get('title', 'Unknown')}")
-            
-            time.sleep(delay)
-            
-            # 重新打标
-            success = self._tag_single_book(record)
-            
-            if success:
-                stats['success'] += 1
-            else:
-                # 更新重试计数
-                self.tag_manager.update_status(
-                    book_id=record['id'],
-                    llm_status='failed',
-                    increment_retry=True
-                )
-                stats['failed'] += 1
+        # 等待 Provider 恢复后再统一重试
+        time.sleep(delay)
+        stats = self._run_engine(failed_records, label="兜底重试", increment_retry=True)
         
         logger.info(f"\n{'='*60}")
         logger.info(f"兜底重试完成！成功: {stats['success']}, 失败: {stats['failed']}")
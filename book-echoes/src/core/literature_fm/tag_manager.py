@@ -110,6 +110,64 @@ class TagManager:
             logger.error(f"保存标签失败 (book_id={book_id}): {str(e)}")
             return False
     
+    def save_tags_batch(self, records: List[Dict]) -> int:
+        """
+        批量保存标签数据（单事务 executemany）
+
+        与 save_tags 不同，已有记录走 UPSERT 更新，保留 created_at 与 retry_count，
+        record 中 increment_retry 为 True 时重试计数 +1
+
+        Args:
+            records: 记录列表，字段同 save_tags 参数，另可带 increment_retry
+
+        Returns:
+            int: 写入条数
+
+        Raises:
+            sqlite3.Error: 写入失败时抛出（整批已回滚），由调用方决定中止或重试
+        """
+        if not records:
+            return 0
+
+        now = datetime.now()
+        rows = [
+            (
+                r['book_id'], r.get('call_no', ''), r.get('title', ''), r.get('tags_json', ''),
+                r.get('llm_model', ''), r.get('llm_provider', ''), r.get('llm_status', 'success'),
+                1 if r.get('increment_retry') else 0, r.get('error_message'), now
+            )
+            for r in records
+        ]
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO literary_tags (
+                        book_id, call_no, title, tags_json,
+                        llm_model, llm_provider, llm_status,
+                        retry_count, error_message, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(book_id) DO UPDATE SET
+                        call_no = excluded.call_no,
+                        title = excluded.title,
+                        tags_json = excluded.tags_json,
+                        llm_model = excluded.llm_model,
+                        llm_provider = excluded.llm_provider,
+                        llm_status = excluded.llm_status,
+                        retry_count = literary_tags.retry_count + excluded.retry_count,
+                        error_message = excluded.error_message,
+                        updated_at = excluded.updated_at
+                """, rows)
+            return len(rows)
+
+        except sqlite3.Error as e:
+            logger.error(f"批量保存标签失败 ({len(rows)} 条): {str(e)}")
+            raise
+
+        finally:
+            conn.close()
+
     def update_status(
         self,
         book_id: int,
@@ -5,7 +5,11 @@
 
 import json
 import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
@@ -16,6 +20,7 @@ from openai import OpenAI
 import sqlite3
 
 from src.utils.logger import get_logger
+from .embedding_cache import EmbeddingCache
 
 # 加载环境变量
 try:
@@ -30,14 +35,17 @@ logger = get_logger(__name__)
 class VectorSearcher:
     """向量语义检索器（基于 ChromaDB）"""
 
-    def __init__(self, config_path: str = "config/literature_fm_vector.yaml"):
+    def __init__(self, config_path: str = "config/literature_fm_vector.yaml", db_path: Optional[str] = None):
         """
         初始化向量检索器
 
         Args:
             config_path: 配置文件路径
+            db_path: 可选，覆盖配置中的数据库路径（读取书籍与写回 embedding_status 使用同一个库）
         """
         self.config = self._load_config(config_path)
+        if db_path:
+            self.config['database'] = {**self.config['database'], 'path': db_path}
         self.embedding_client = _EmbeddingClient(self.config['embedding'])
         self.vector_store = _VectorStore(self.config['vector_db'])
         self.db_reader = _DatabaseReader(self.config['database'])
@@ -72,17 +80,15 @@ class VectorSearcher:
             if query_expansion:
                 queries = self._expand_query(processed_query)
 
-            # 3. 多路查询与结果融合
-            all_results = {}
-            for i, query in enumerate(queries):
-                query_vector = self.embedding_client.get_embedding(query)
-
-                # ChromaDB 检索
-                results = self.vector_store.search(
-                    query_embedding=query_vector,
-                    top_k=top_k
-                )
+            # 3. 多路查询与结果融合（所有变体一次批量 embedding、一次 ChromaDB 多向量查询）
+            query_vectors = self.embedding_client.get_embeddings(queries)
+            results_per_query = self.vector_store.search_many(
+                query_embeddings=query_vectors,
+                top_k=top_k
+            )
 
+            all_results = {}
+            for results in results_per_query:
                 # 融合结果（取最高相似度）
                 for result in results:
                     book_id = result['metadata'].get('id')
@@ -123,24 +129,29 @@ class VectorSearcher:
                     logger.info(f"原始相似度 Top5: {[(f'book_{bid}', f'{s:.4f}') for bid, s in raw_similarities[:5]]}")
                     logger.info(f"使用固定阈值: {actual_threshold:.4f}")
 
-            for book_id, result in all_results.items():
-                similarity = 1 - result['distance']
-                if similarity >= actual_threshold:
-                    book_info = self.db_reader.get_book_by_id(book_id)
-                    if not book_info:
-                        continue
-
-                    enriched.append({
-                        'book_id': book_id,
-                        'title': book_info.get('title', ''),
-                        'author': book_info.get('author', ''),
-                        'call_no': book_info.get('call_no', ''),
-                        'rating': book_info.get('rating', 0),
-                        'tags_json': book_info.get('tags_json', ''),
-                        'vector_score': round(similarity, 4),
-                        'embedding_id': result['embedding_id'],
-                        'source': 'vector'
-                    })
+            passed = [
+                (book_id, result, 1 - result['distance'])
+                for book_id, result in all_results.items()
+                if 1 - result['distance'] >= actual_threshold
+            ]
+            books = self.db_reader.get_books_by_ids([book_id for book_id, _, _ in passed])
+
+            for book_id, result, similarity in passed:
+                book_info = books.get(book_id)
+                if not book_info:
+                    continue
+
+                enriched.append({
+                    'book_id': book_id,
+                    'title': book_info.get('title', ''),
+                    'author': book_info.get('author', ''),
+                    'call_no': book_info.get('call_no', ''),
+                    'rating': book_info.get('rating', 0),
+                    'tags_json': book_info.get('tags_json', ''),
+                    'vector_score': round(similarity, 4),
+                    'embedding_id': result['embedding_id'],
+                    'source': 'vector'
+                })
 
             # 按相似度排序
             enriched.sort(key=lambda x: x['vector_score'], reverse=True)
@@ -224,71 +235,126 @@ class VectorSearcher:
     def build_index(
         self,
         books: List[Dict],
-        batch_size: int = 32
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
     ) -> int:
         """
         为书籍列表构建向量索引
 
         Args:
             books: 书籍列表（包含 id 和 tags_json）
-            batch_size: 批处理大小
+            batch_size: 每次 embedding 请求的书籍数，默认取 embedding.batch_size
+            concurrency: 同时在途的 embedding 请求数，默认取 embedding.concurrency
 
         Returns:
-            索引构建的书籍数量
+            索引构建成功的书籍数量
         """
-        try:
-            embeddings = []
-            metadatas = []
-            documents = []
-
-            for book in books:
-                # 1. 构建情境描述文本和 Metadata
-                doc, metadata = self._build_context_text(
-                    book_id=book.get('book_id') or book.get('id'),
-                    call_no=book.get('call_no', ''),
-                    tags_json=book.get('tags_json', ''),
-                    douban_title=book.get('douban_title', ''),
-                    douban_subtitle=book.get('douban_subtitle', ''),
-                    douban_author=book.get('douban_author', ''),
-                    douban_summary=book.get('douban_summary', ''),
-                    douban_author_intro=book.get('douban_author_intro', ''),
-                    douban_catalog=book.get('douban_catalog', '')
-                )
-
-                # 2. 生成向量
-                embedding = self.embedding_client.get_embedding(doc)
+        stats = self.index_books(books, batch_size=batch_size, concurrency=concurrency)
+        return stats['success']
 
-                # 3. 收集数据
-                embeddings.append(embedding)
-                metadatas.append(metadata)
-                documents.append(doc)
+    def index_books(
+        self,
+        books: List[Dict],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict:
+        """
+        批量并发向量化书籍
 
-                # 批次处理
-                if len(embeddings) >= batch_size:
-                    self.vector_store.add_batch(embeddings, metadatas, documents)
+        流程（按批）：
+        1. 一次 embeddings.create 请求整批文本，最多 concurrency 个批次同时在途
+        2. 每批完成后一次 upsert 写入 ChromaDB（ID 固定为 book_{id}，重跑幂等）
+        3. 每批一次 executemany 更新 embedding_status
 
-                    # 更新数据库状态
-                    for m in metadatas:
-                        self.db_reader.update_embedding_status(
-                            m['id'], status='completed'
-                        )
+        数据库中的 embedding_status 即断点：已完成的批次在中断后不会被重新处理
 
-                    embeddings = []
-                    metadatas = []
-                    documents = []
+        Args:
+            books: 书籍列表
+            batch_size: 每批书籍数
+            concurrency: 在途批次数
 
-            # 处理剩余数据
-            if embeddings:
-                self.vector_store.add_batch(embeddings, metadatas, documents)
-                for m in metadatas:
-                    self.db_reader.update_embedding_status(m['id'], status='completed')
+        Returns:
+            {"success": int, "failed": int}
+        """
+        embedding_config = self.config['embedding']
+        batch_size = batch_size or embedding_config.get('batch_size', 32)
+        concurrency = concurrency or embedding_config.get('concurrency', 4)
+        stats = {'success': 0, 'failed': 0}
+
+        # 1. 构建情境描述文本和 Metadata
+        prepared = []
+        for book in books:
+            doc, metadata = self._build_context_text(
+                book_id=book.get('book_id') or book.get('id'),
+                call_no=book.get('call_no', ''),
+                tags_json=book.get('tags_json', ''),
+                douban_title=book.get('douban_title', ''),
+                douban_subtitle=book.get('douban_subtitle', ''),
+                douban_author=book.get('douban_author', ''),
+                douban_summary=book.get('douban_summary', ''),
+                douban_author_intro=book.get('douban_author_intro', ''),
+                douban_catalog=book.get('douban_catalog', '')
+            )
+            prepared.append((doc, metadata))
+
+        batches = [prepared[i:i + batch_size] for i in range(0, len(prepared), batch_size)]
+        if not batches:
+            return stats
+
+        # 2. 并发请求 embedding，主线程按完成顺序写入（ChromaDB 与 SQLite 只在主线程访问）
+        pending = iter(batches)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            def submit_next() -> bool:
+                batch = next(pending, None)
+                if batch is None:
+                    return False
+                future = executor.submit(self.embedding_client.get_embeddings, [doc for doc, _ in batch])
+                in_flight[future] = batch
+                return True
+
+            for _ in range(concurrency):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    self._commit_batch(future, batch, stats)
+                    submit_next()
+
+                logger.info(
+                    f"向量化进度: {stats['success'] + stats['failed']}/{len(prepared)} "
+                    f"(成功 {stats['success']}, 失败 {stats['failed']})"
+                )
 
-            logger.info(f"向量索引构建完成: 书籍数={len(books)}")
-            return len(books)
+        logger.info(f"向量索引构建完成: 书籍数={len(books)}, 成功={stats['success']}, 失败={stats['failed']}")
+        return stats
 
+    def _commit_batch(self, future, batch: List[Tuple[str, Dict]], stats: Dict):
+        """写入一批 embedding 结果并更新状态"""
+        book_ids = [metadata['id'] for _, metadata in batch]
+        try:
+            embeddings = future.result()
+            embedding_ids = self.vector_store.upsert_batch(
+                embeddings,
+                [metadata for _, metadata in batch],
+                [doc for doc, _ in batch]
+            )
+            self.db_reader.update_embedding_status_batch(
+                list(zip(book_ids, embedding_ids)), status='completed'
+            )
+            stats['success'] += len(batch)
         except Exception as e:
-            logger.error(f"向量索引构建失败: {str(e)}")
-            return 0
+            logger.error(f"批次向量化失败 (book_id={book_ids[0]}..{book_ids[-1]}): {e}")
+            try:
+                self.db_reader.update_embedding_status_batch(
+                    [(book_id, None) for book_id in book_ids], status='failed'
+                )
+            except Exception as db_error:
+                logger.error(f"更新失败状态时出错: {db_error}")
+            stats['failed'] += len(batch)
 
     def _build_context_text(
         self,
@@ -419,6 +485,31 @@ class VectorSearcher:
     def close(self):
         """关闭资源"""
         self.db_reader.close()
+        self.embedding_client.close()
+
+
+class _AdaptiveBackoff:
+    """
+    并发请求共享的自适应退避
+
+    失败（限流/超时）时退避时长翻倍，成功时逐步回落到基础值，避免多个线程同时重试打爆接口
+    """
+
+    def __init__(self, base_delay: float, max_delay: float):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.current = base_delay
+        self._lock = threading.Lock()
+
+    def failure(self) -> float:
+        with self._lock:
+            delay = self.current
+            self.current = min(self.current * 2, self.max_delay)
+        return delay + random.uniform(0, delay * 0.25)
+
+    def success(self):
+        with self._lock:
+            self.current = max(self.base_delay, self.current / 2)
 
 
 class _EmbeddingClient:
@@ -427,12 +518,36 @@ class _EmbeddingClient:
     def __init__(self, config: Dict):
         self.config = config
         self.client = self._init_client()
+        self._backoff = _AdaptiveBackoff(
+            base_delay=self.config.get('retry_delay', 2),
+            max_delay=self.config.get('max_backoff', 60)
+        )
+        self.cache = self._init_cache()
+
+    def _init_cache(self) -> Optional[EmbeddingCache]:
+        cache_config = self.config.get('cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+
+        cache_path = Path(cache_config.get('path', 'runtime/cache/embedding_cache.db'))
+        if not cache_path.is_absolute():
+            # 从 vector_searcher.py 向上4级到项目根目录 (book-echoes)
+            cache_path = Path(__file__).parent.parent.parent.parent / cache_path
+        try:
+            return EmbeddingCache(str(cache_path), max_entries=cache_config.get('max_entries', 200000))
+        except Exception as e:
+            logger.warning(f"Embedding 缓存初始化失败，将直接调用 API: {e}")
+            return None
 
     def _init_client(self) -> OpenAI:
         api_key = self._resolve_env(self.config['api_key'])
+        concurrency = self.config.get('concurrency', 4)
         http_client = httpx.Client(
             timeout=self.config['timeout'],
-            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            limits=httpx.Limits(
+                max_connections=max(10, concurrency * 2),
+                max_keepalive_connections=max(5, concurrency)
+            ),
             trust_env=False
         )
         return OpenAI(
@@ -443,17 +558,53 @@ class _EmbeddingClient:
         )
 
     def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        批量获取 embedding（线程安全，可并发调用）
+
+        先查本地缓存，未命中的文本去重后单次请求 API 并写回缓存
+
+        Args:
+            texts: 文本列表
+
+        Returns:
+            与输入顺序一致的向量列表
+        """
+        model = self.config['model']
+        dimensions = self.config.get('dimensions', 4096)
+
+        cached = self.cache.get_many(model, dimensions, texts) if self.cache else {}
+        missing = list(dict.fromkeys(text for text in texts if text not in cached))
+
+        if missing:
+            fetched = dict(zip(missing, self._request_embeddings(missing)))
+            if self.cache:
+                self.cache.put_many(model, dimensions, fetched)
+            cached.update(fetched)
+        else:
+            logger.debug(f"Embedding 全部命中缓存: {len(texts)} 条")
+
+        return [cached[text] for text in texts]
+
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """单次请求 embedding API（带自适应退避重试）"""
         for attempt in range(self.config['max_retries']):
             try:
                 response = self.client.embeddings.create(
                     model=self.config['model'],
-                    input=text,
+                    input=texts,
                     dimensions=self.config.get('dimensions', 4096)
                 )
-                return response.data[0].embedding
+                self._backoff.success()
+                data = sorted(response.data, key=lambda item: item.index)
+                return [item.embedding for item in data]
             except Exception as e:
                 if attempt < self.config['max_retries'] - 1:
-                    time.sleep(self.config['retry_delay'])
+                    delay = self._backoff.failure()
+                    logger.warning(f"Embedding 请求失败，{delay:.1f}s 后重试 ({attempt + 1}): {e}")
+                    time.sleep(delay)
                 else:
                     raise
 
@@ -462,6 +613,11 @@ class _EmbeddingClient:
             return os.getenv(value[4:], '')
         return value
 
+    def close(self):
+        if self.cache:
+            logger.info(f"Embedding 缓存统计: {self.cache.get_stats()}")
+            self.cache.close()
+
 
 class _VectorStore:
     """ChromaDB 向量存储（内部类）"""
@@ -496,28 +652,95 @@ class _VectorStore:
             ids=embedding_ids
         )
 
+    def upsert_batch(
+        self,
+        embeddings: List[List[float]],
+        metadatas: List[Dict],
+        documents: List[str]
+    ) -> List[str]:
+        """
+        批量写入（ID 固定为 book_{id}，重复写入覆盖旧向量）
+
+        先 upsert，成功后再删除同一本书的历史向量（兼容旧的带时间戳 ID），
+        upsert 失败时已有向量保持不变
+        """
+        embedding_ids = [f"book_{m['id']}" for m in metadatas]
+        self.collection.upsert(
+            embeddings=embeddings,
+            metadatas=metadatas,
+            documents=documents,
+            ids=embedding_ids
+        )
+        existing = self.collection.get(where={"id": {"$in": [m['id'] for m in metadatas]}}, include=[])
+        new_ids = set(embedding_ids)
+        legacy_ids = [i for i in existing.get("ids", []) if i not in new_ids]
+        if legacy_ids:
+            self.collection.delete(ids=legacy_ids)
+        return embedding_ids
+
     def search(
         self,
         query_embedding: List[float],
         top_k: int = 10,
         filter_metadata: Optional[Dict] = None
     ) -> List[Dict]:
+        return self.search_many([query_embedding], top_k, filter_metadata)[0]
+
+    def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 10,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """
+        单次 collection.query 检索多个查询向量（共用同一过滤条件）
+
+        Returns:
+            与 query_embeddings 顺序一致的结果列表
+        """
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings,
             n_results=top_k,
             where=filter_metadata
         )
 
-        formatted = []
-        if results and results.get('ids') and results['ids'][0]:
-            for i in range(len(results['ids'][0])):
-                formatted.append({
-                    'embedding_id': results['ids'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i],
-                    'document': results['documents'][0][i]
-                })
-        return formatted
+        all_formatted = []
+        for q in range(len(query_embeddings)):
+            formatted = []
+            if results and results.get('ids') and q < len(results['ids']) and results['ids'][q]:
+                for i in range(len(results['ids'][q])):
+                    formatted.append({
+                        'embedding_id': results['ids'][q][i],
+                        'metadata': results['metadatas'][q][i],
+                        'distance': results['distances'][q][i],
+                        'document': results['documents'][q][i]
+                    })
+            all_formatted.append(formatted)
+        return all_formatted
+
+    def search_filters(
+        self,
+        query_embedding: List[float],
+        filters: List[Optional[Dict]],
+        top_k: int = 10
+    ) -> List[List[Dict]]:
+        """
+        同一查询向量按多个过滤条件并行检索
+
+        ChromaDB 的 where 不支持在一次 query 中给不同向量指定不同条件，因此使用线程池并发
+
+        Returns:
+            与 filters 顺序一致的结果列表
+        """
+        if len(filters) <= 1:
+            return [self.search(query_embedding, top_k, f) for f in filters]
+
+        max_workers = min(len(filters), self.config.get('query_concurrency', 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda f: self.search(query_embedding, top_k, f),
+                filters
+            ))
 
 
 class _DatabaseReader:
@@ -534,28 +757,78 @@ class _DatabaseReader:
         self.table = config.get('table', 'literary_tags')
         self.table_columns = self._get_table_columns()
 
+        # 预先确定查询字段与列清单，批量查询时复用同一条 SQL
+        self._query_fields = (['book_id'] if 'book_id' in self.table_columns else []) + ['id']
+        self._select_columns = (
+            ", ".join(f'"{c}"' for c in sorted(self.table_columns)) if self.table_columns else "*"
+        )
+        self.row_cache_size = config.get('row_cache_size', 4096)
+        self._row_cache: OrderedDict = OrderedDict()
+
     def get_book_by_id(self, book_id: int) -> Optional[Dict]:
         """
         兼容 book_id 与 id 字段，避免因字段混用导致查不到书籍
         """
-        query_fields = []
-        if 'book_id' in self.table_columns:
-            query_fields.append('book_id')
-        query_fields.append('id')
+        return self.get_books_by_ids([book_id]).get(book_id)
+
+    def get_books_by_ids(self, book_ids: List[int]) -> Dict[int, Dict]:
+        """
+        批量获取书籍信息（每个查询字段一次 IN 查询，结果进入进程内行缓存）
+
+        与 get_book_by_id 相同，先按 book_id 匹配，未命中的再按 id 匹配
+
+        Args:
+            book_ids: 书籍ID列表
+
+        Returns:
+            {book_id: row_dict}，查不到的ID不返回
+        """
+        found = {}
+        missing = []
+        for book_id in dict.fromkeys(book_ids):
+            row = self._row_cache.get(book_id)
+            if row is not None:
+                self._row_cache.move_to_end(book_id)
+                found[book_id] = row
+            else:
+                missing.append(book_id)
 
-        for field in query_fields:
+        for field in self._query_fields:
+            if not missing:
+                break
             try:
-                cursor = self.conn.execute(
-                    f"SELECT * FROM {self.table} WHERE {field} = ?",
-                    (book_id,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(zip([c[0] for c in cursor.description], row))
+                rows = self._select_in(field, missing)
             except sqlite3.OperationalError:
                 # 目标表不存在该字段时直接尝试下一个字段
                 continue
-        return None
+            for row in rows:
+                book_id = row[field]
+                if book_id in found:
+                    continue
+                found[book_id] = row
+                self._cache_row(book_id, row)
+            missing = [book_id for book_id in missing if book_id not in found]
+
+        return found
+
+    def _select_in(self, field: str, ids: List[int]) -> List[Dict]:
+        """按字段批量查询（分块避免超出 SQLite 变量上限）"""
+        rows = []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT {self._select_columns} FROM {self.table} WHERE {field} IN ({placeholders})",
+                chunk
+            )
+            names = [c[0] for c in cursor.description]
+            rows.extend(dict(zip(names, row)) for row in cursor.fetchall())
+        return rows
+
+    def _cache_row(self, book_id: int, row: Dict):
+        self._row_cache[book_id] = row
+        if len(self._row_cache) > self.row_cache_size:
+            self._row_cache.popitem(last=False)
 
     def update_embedding_status(self, book_id: int, status: str):
         from datetime import datetime
@@ -564,6 +837,25 @@ class _DatabaseReader:
             (status, datetime.now().isoformat(), book_id)
         )
         self.conn.commit()
+        self._row_cache.pop(book_id, None)
+
+    def update_embedding_status_batch(self, rows: List[Tuple[int, Optional[str]]], status: str):
+        """
+        批量更新向量化状态（单次 executemany + 单次提交）
+
+        Args:
+            rows: [(book_id, embedding_id), ...]
+            status: 状态
+        """
+        embedding_date = datetime.now().isoformat()
+        self.conn.executemany(
+            f"UPDATE {self.table} SET embedding_status = ?, embedding_id = ?, embedding_date = ? "
+            f"WHERE book_id = ?",
+            [(status, embedding_id, embedding_date, book_id) for book_id, embedding_id in rows]
+        )
+        self.conn.commit()
+        for book_id, _ in rows:
+            self._row_cache.pop(book_id, None)
 
     def close(self):
         self.conn.close()
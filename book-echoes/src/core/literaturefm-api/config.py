@@ -91,7 +91,8 @@ def get_default_config() -> Dict[str, Any]:
                 "summary": 1.5
             },
             "randomness": 0.15,
-            "score_threshold": None
+            "score_threshold": None,
+            "index_dir": "runtime/cache/bm25_index/literature_fm"
         },
         "rrf": {
             "k": 60
@@ -70,7 +70,8 @@ class LiterarySearchService:
                 table=db_config.get('table', 'literary_tags'),
                 k1=bm25_config.get('k1', 1.5),
                 b=bm25_config.get('b', 0.75),
-                field_weights=bm25_config.get('field_weights', {})
+                field_weights=bm25_config.get('field_weights', {}),
+                index_dir=bm25_config.get('index_dir', 'runtime/cache/bm25_index/literature_fm')
             )
             logger.info("✓ BM25检索器初始化成功")
         else:
@@ -191,11 +191,8 @@ class DataFilterEngine:
             # 2. 应用索书号规则
             if call_number_col and self.call_number_matcher.has_rules:
                 try:
-                    call_number_mask = self.call_number_matcher.apply(df[call_number_col])
-                    call_number_reasons = pd.Series(
-                        f"索书号匹配排除规则",
-                        index=df.index
-                    )
+                    call_number_mask, matched_rules = self.call_number_matcher.match(df[call_number_col])
+                    call_number_reasons = "索书号匹配排除规则[" + matched_rules.astype(str) + "]"
                     filter_mask |= call_number_mask
                     filter_reasons = self._merge_reasons(filter_reasons, call_number_reasons, call_number_mask)
                 except Exception as e:
@@ -204,11 +201,8 @@ class DataFilterEngine:
             # 3. 应用题名关键词规则
             if title_col and self.title_matcher.has_keywords:
                 try:
-                    title_mask = self.title_matcher.apply(df[title_col])
-                    title_reasons = pd.Series(
-                        f"题名包含排除关键词",
-                        index=df.index
-                    )
+                    title_mask, matched_keywords = self.title_matcher.match(df[title_col])
+                    title_reasons = "题名包含排除关键词[" + matched_keywords.fillna("").astype(str) + "]"
                     filter_mask |= title_mask
                     filter_reasons = self._merge_reasons(filter_reasons, title_reasons, title_mask)
                 except Exception as e:
@@ -263,7 +257,7 @@ class DataFilterEngine:
         return result_df
     
     def _count_filter_reasons(self, reasons: pd.Series) -> Dict[str, int]:
-        """统计过滤原因"""
+        """统计过滤原因（按原因类别汇总，忽略 [] 中的具体规则）"""
         reason_counts = {}
         
         for reason in reasons:
@@ -272,7 +266,7 @@ class DataFilterEngine:
                 
             # 分割多个原因
             for part in reason.split(";"):
-                part = part.strip()
+                part = part.split("[", 1)[0].strip()
                 if part:
                     if part in reason_counts:
                         reason_counts[part] += 1
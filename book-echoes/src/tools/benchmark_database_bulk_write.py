@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+数据库批量写入基准测试
+
+对比 DatabaseManager.batch_save_data 的两种写入方式（rows/sec）：
+- legacy: 逐行拼接SQL并单条 execute（旧实现）
+- bulk:   按列组合分组 executemany + 可配置 PRAGMA（当前实现）
+
+数据为合成数据：books 在合并模式下字段随机缺失（模拟列组合不一致），
+每本书附带若干借阅记录与月度统计。另测逐行提交场景（对应 ProgressManager
+的逐行增量刷写），该场景主要受 journal_mode / synchronous 影响。
+
+用法:
+    python -m src.tools.benchmark_database_bulk_write --books 20000 --records-per-book 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.core.douban.database.database_manager import DatabaseManager
+
+OPTIONAL_BOOK_FIELDS = [
+    "isbn", "douban_url", "douban_rating", "douban_title", "douban_author",
+    "douban_publisher", "douban_pub_year", "douban_summary", "douban_cover_image",
+]
+
+
+def build_dataset(book_count: int, records_per_book: int, seed: int = 42) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """生成合成数据 (books, borrow_records, borrow_statistics)"""
+    rng = random.Random(seed)
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    books, records, statistics = [], [], []
+    for i in range(book_count):
+        barcode = f"B{i:08d}"
+        book = {"barcode": barcode, "call_no": f"I247.5/{i % 997}", "book_title": f"测试图书{i}"}
+        for field in OPTIONAL_BOOK_FIELDS:
+            if rng.random() < 0.6:
+                book[field] = rng.randint(1, 10) if field in ("douban_rating", "douban_pub_year") else f"{field}-{i}"
+        books.append(book)
+        for j in range(records_per_book):
+            records.append({
+                "barcode": barcode,
+                "reader_card_no": f"R{rng.randint(1, 50000):06d}",
+                "submit_time": now,
+                "return_time": now,
+            })
+        for month in (1, 2, 3):
+            statistics.append({
+                "barcode": barcode,
+                "stat_period": f"2025-{month:02d}",
+                "stat_year": 2025,
+                "stat_month": month,
+                "borrow_count_3m": rng.randint(0, 9),
+            })
+    return books, records, statistics
+
+
+def _copy(rows: List[Dict]) -> List[Dict]:
+    # batch_save_data 会原地补充字段，每轮使用独立副本
+    return [dict(row) for row in rows]
+
+
+def legacy_save(manager: DatabaseManager, books: List[Dict], records: List[Dict], statistics: List[Dict],
+                update_mode: str = "merge") -> None:
+    """旧实现：每行单独构造SQL并 execute"""
+    conn = manager.conn
+    conn.execute("BEGIN TRANSACTION")
+    existing = manager.batch_get_books_by_barcodes([b["barcode"] for b in books])
+    for book in books:
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        book.setdefault("updated_at", now)
+        old = existing.get(book["barcode"])
+        book["data_version"] = manager._increment_version_in_memory(old.get("data_version", "1.0")) if old else "1.0"
+        book["created_at"] = old["created_at"] if old and old.get("created_at") else book.get("created_at", now)
+        if update_mode == "overwrite" or not old:
+            columns = list(book.keys())
+            values = list(book.values())
+            set_clauses = [f"{c} = excluded.{c}" for c in columns if c != "barcode"]
+        else:
+            columns, values = ["barcode"], [book["barcode"]]
+            set_clauses = []
+            for key, value in book.items():
+                if key != "barcode" and value is not None and str(value).strip() != "":
+                    columns.append(key)
+                    values.append(value)
+                    set_clauses.append(f"{key} = excluded.{key}")
+            set_clauses += ["updated_at = excluded.updated_at", "data_version = excluded.data_version"]
+        conn.execute(
+            f"INSERT INTO books ({','.join(columns)}) VALUES ({','.join('?' for _ in columns)}) "
+            f"ON CONFLICT(barcode) DO UPDATE SET {', '.join(set_clauses)} WHERE books.barcode = excluded.barcode",
+            values,
+        )
+    for record in records:
+        record.setdefault("created_at", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        conn.execute(
+            f"INSERT INTO borrow_records ({','.join(record.keys())}) VALUES ({','.join('?' for _ in record)})",
+            list(record.values()),
+        )
+    for stat in statistics:
+        stat.setdefault("created_at", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        stat.setdefault("updated_at", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        conn.execute(
+            f"INSERT OR REPLACE INTO borrow_statistics ({','.join(stat.keys())}) VALUES ({','.join('?' for _ in stat)})",
+            list(stat.values()),
+        )
+    conn.commit()
+
+
+def run_case(name: str, pragmas: Dict, dataset, batch_size: int, legacy: bool) -> float:
+    """在新建的临时库中写入两轮（首轮插入、次轮合并更新），返回 rows/sec"""
+    books, records, statistics = dataset
+    total_rows = (len(books) + len(records) + len(statistics)) * 2
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"), pragmas=pragmas)
+        manager.init_database()
+        start = time.perf_counter()
+        for _ in range(2):
+            if legacy:
+                legacy_save(manager, _copy(books), _copy(records), _copy(statistics))
+            else:
+                manager.batch_save_data(_copy(books), _copy(records), _copy(statistics), batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        manager.close()
+    rate = total_rows / elapsed if elapsed else float("inf")
+    print(f"{name:<28} {total_rows:>10} 行  {elapsed:>8.2f} 秒  {rate:>12,.0f} rows/sec")
+    return rate
+
+
+def run_per_row_case(name: str, pragmas: Dict, dataset, rows: int, legacy: bool) -> float:
+    """逐行调用并提交（每次一本书 + 其借阅记录与统计），返回 rows/sec"""
+    books, records, statistics = dataset
+    per_book = len(records) // max(1, len(books))
+    items = []
+    for i, book in enumerate(books[:rows]):
+        items.append(([book], records[i * per_book:(i + 1) * per_book], statistics[i * 3:(i + 1) * 3]))
+    total_rows = sum(len(b) + len(r) + len(s) for b, r, s in items)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseManager(os.path.join(tmp, "bench.db"), pragmas=pragmas)
+        manager.init_database()
+        start = time.perf_counter()
+        for book, recs, stats in items:
+            if legacy:
+                legacy_save(manager, _copy(book), _copy(recs), _copy(stats))
+            else:
+                manager.batch_save_data(_copy(book), _copy(recs), _copy(stats), batch_size=1)
+        elapsed = time.perf_counter() - start
+        manager.close()
+    rate = total_rows / elapsed if elapsed else float("inf")
+    print(f"{name:<28} {total_rows:>10} 行  {elapsed:>8.2f} 秒  {rate:>12,.0f} rows/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DatabaseManager 批量写入基准测试")
+    parser.add_argument("--books", type=int, default=20000, help="books 行数")
+    parser.add_argument("--records-per-book", type=int, default=10, help="每本书的借阅记录数")
+    parser.add_argument("--batch-size", type=int, default=1000, help="batch_save_data 的 batch_size")
+    parser.add_argument("--per-row-books", type=int, default=1000, help="逐行提交场景的书籍数")
+    args = parser.parse_args()
+
+    dataset = build_dataset(args.books, args.records_per_book)
+    tuned = {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536}
+
+    print(f"books={len(dataset[0])}, borrow_records={len(dataset[1])}, borrow_statistics={len(dataset[2])}")
+    print("[大批量单事务]")
+    before = run_case("legacy (逐行 execute)", {}, dataset, args.batch_size, legacy=True)
+    run_case("bulk (executemany)", {}, dataset, args.batch_size, legacy=False)
+    after = run_case("bulk + PRAGMA", tuned, dataset, args.batch_size, legacy=False)
+    print(f"提升: {after / before:.2f}x")
+
+    print("[逐行提交]")
+    before = run_per_row_case("legacy (逐行 execute)", {}, dataset, args.per_row_books, legacy=True)
+    run_per_row_case("bulk (executemany)", {}, dataset, args.per_row_books, legacy=False)
+    after = run_per_row_case("bulk + PRAGMA", tuned, dataset, args.per_row_books, legacy=False)
+    print(f"提升: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ from .config_loader import ConfigLoader
 from .exceptions import ConfigurationError
 from .json_utils import JSONHandler
 from .prompt_loader import PromptLoader
+from .response_cache import get_response_cache, make_cache_key
 from .retry import RetryManager
 
 try:
@@ -87,6 +88,7 @@ class UnifiedLLMClient:
         self.prompt_loader = PromptLoader()
         self.json_handler = JSONHandler()
         self._client_cache: Dict[str, Any] = {}
+        self._response_cache = None
 
     def call(self, task_name: str, user_prompt: Union[str, List[Message]], **overrides: Any) -> Any:
         """同步调用统一入口。"""
@@ -99,12 +101,15 @@ class UnifiedLLMClient:
         if not provider_type:
             raise ConfigurationError(f"任务 {task_name} 缺少 provider_type")
 
+        # 记录最终成功的响应文本（response_handler 处理前），用于写入缓存
+        processed_holder: Dict[str, str] = {}
+
         def _request(provider):
             raw_text = self._execute_request(provider, task_config, messages)
             processed = self._post_process(raw_text, task_config)
-            if response_handler:
-                return response_handler(processed)
-            return processed
+            result = response_handler(processed) if response_handler else processed
+            processed_holder["text"] = processed
+            return result
 
         request_fn = self._wrap_with_observer(
             task_name,
@@ -112,13 +117,56 @@ class UnifiedLLMClient:
             _request,
         )
 
-        response = self.retry_manager.call_with_retry(
-            task_name=task_name,
-            provider_type=provider_type,
-            request_fn=request_fn,
-            retry_config=task_config.get("retry", {}),
+        def _call_provider():
+            response = self.retry_manager.call_with_retry(
+                task_name=task_name,
+                provider_type=provider_type,
+                request_fn=request_fn,
+                retry_config=task_config.get("retry", {}),
+            )
+            return response, processed_holder.get("text")
+
+        cache = self._get_response_cache(task_config)
+        if cache is None:
+            return _call_provider()[0]
+
+        cache_key = self._build_cache_key(task_name, task_config, messages)
+        value, shared = cache.get_or_compute(cache_key, task_name, _call_provider)
+        if not shared:
+            return value
+        try:
+            return response_handler(value) if response_handler else value
+        except Exception as exc:
+            self.logger.warning("缓存响应处理失败，重新请求 | 任务=%s | 错误=%s", task_name, exc)
+            return _call_provider()[0]
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """按任务返回响应缓存命中统计（缓存在进程内共享，统计包含所有客户端），未使用缓存时为空。"""
+        return self._response_cache.stats() if self._response_cache else {}
+
+    def _get_response_cache(self, task_config: Dict[str, Any]):
+        """任务级 cache 配置优先于全局 response_cache.enabled。"""
+        cache_settings = dict(self.settings.get("response_cache") or {})
+        if "cache" in task_config:
+            cache_settings["enabled"] = bool(task_config["cache"])
+        cache = get_response_cache(cache_settings)
+        if cache is not None:
+            self._response_cache = cache
+        return cache
+
+    def _build_cache_key(self, task_name: str, task_config: Dict[str, Any], messages: List[Message]) -> str:
+        """缓存键：任务、候选模型、消息与影响输出的参数。"""
+        providers = self.settings.get("api_providers", {}).get(task_config.get("provider_type"), {}) or {}
+        return make_cache_key(
+            {
+                "task": task_name,
+                "models": {slot: (cfg or {}).get("model") for slot, cfg in providers.items()},
+                "messages": messages,
+                "temperature": task_config.get("temperature"),
+                "top_p": task_config.get("top_p"),
+                "json_repair": task_config.get("json_repair"),
+            }
         )
-        return response
 
     def get_task_config(self, task_name: str) -> Dict[str, Any]:
         tasks = self.settings.get("tasks", {})
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多模式编译匹配器 - 一次扫描完成整组规则匹配
+
+筛选规则动辄数百条，逐条调用 str.contains / str.match 意味着对同一列做数百次全量扫描。
+本模块把一组模式编译成单个正则，每个单元格只匹配一次，同时返回命中的规则：
+
+- 纯字面量（关键词、前缀、后缀）：构建前缀树并生成公共前缀合并后的正则分支
+- 其余正则：以命名分组合并为一个正则，命中后通过分组名定位原规则
+- 无法合并的正则（含反向引用、内联全局标志等）：单独编译，逐条兜底
+
+匹配语义与 pandas 保持一致：
+- contains   → re.search（str.contains 默认按正则处理）
+- starts_with / ends_with → 字面量前缀 / 后缀（str.startswith / str.endswith）
+- regex      → re.match（str.match，从开头匹配）
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SUPPORTED_MATCH_TYPES = ("contains", "starts_with", "ends_with", "regex")
+
+_REGEX_META_CHARS = set(".^$*+?{}[]\\|()")
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)")
+_LITERAL_GROUP = "_lit"
+
+
+def is_literal_pattern(pattern: str) -> bool:
+    """模式中不含正则元字符时视为字面量"""
+    return not any(ch in _REGEX_META_CHARS for ch in pattern)
+
+
+def build_trie_regex(literals: Sequence[str]) -> str:
+    """
+    将字面量列表构建为前缀树并生成等价正则
+
+    例如 ["Java", "JavaScript", "Python"] → "(?:Java(?:Script)?|Python)"。
+    可选分支为贪婪匹配，同一位置总是优先匹配更长的字面量。
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        if not literal:
+            continue
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + _render(node[ch]) for ch in sorted(key for key in node if key)]
+        if not branches:
+            return ""
+        if "" in node:
+            # 当前位置已构成完整字面量，后续分支可选（贪婪，优先匹配更长者）
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return _render(trie)
+
+
+class CompiledPatternMatcher:
+    """编译后的多模式匹配器"""
+
+    def __init__(self, patterns: Sequence[str], match_type: str = "contains", case_sensitive: bool = False):
+        """
+        Args:
+            patterns: 模式列表（顺序即规则优先级，重复项会被去重）
+            match_type: contains / starts_with / ends_with / regex
+            case_sensitive: 是否区分大小写；starts_with / ends_with 与 pandas 一致始终区分
+        """
+        if match_type not in SUPPORTED_MATCH_TYPES:
+            raise ValueError(f"不支持的匹配类型: {match_type}")
+
+        self.patterns: List[str] = list(dict.fromkeys(p for p in patterns if p))
+        self.match_type = match_type
+        self.case_sensitive = case_sensitive or match_type in ("starts_with", "ends_with")
+        self.invalid_patterns: List[str] = []
+
+        self._flags = 0 if self.case_sensitive else re.IGNORECASE
+        self._literal_lookup: Dict[str, str] = {}
+        self._group_lookup: Dict[str, str] = {}
+        self._combined: Optional[re.Pattern] = None
+        self._standalone: List[Tuple[str, re.Pattern]] = []
+        self._compile()
+
+    # ------------------------------------------------------------------
+    # 编译
+    # ------------------------------------------------------------------
+    def _literal_key(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _compile(self) -> None:
+        literal_mode = self.match_type in ("starts_with", "ends_with")
+        literals: List[str] = []
+        regex_patterns: List[str] = []
+
+        for pattern in self.patterns:
+            if literal_mode or is_literal_pattern(pattern):
+                key = self._literal_key(pattern[::-1] if self.match_type == "ends_with" else pattern)
+                # 同一字面量只记录第一条规则
+                if key not in self._literal_lookup:
+                    self._literal_lookup[key] = pattern
+                    literals.append(key)
+                continue
+            try:
+                re.compile(pattern, self._flags)
+            except re.error as exc:
+                self.invalid_patterns.append(pattern)
+                logger.warning(f"无效的正则模式，已跳过: {pattern} ({exc})")
+                continue
+            if _BACKREFERENCE.search(pattern):
+                self._standalone.append((pattern, re.compile(pattern, self._flags)))
+            else:
+                regex_patterns.append(pattern)
+
+        branches = []
+        if literals:
+            branches.append(f"(?P<{_LITERAL_GROUP}>{build_trie_regex(literals)})")
+        for index, pattern in enumerate(regex_patterns):
+            group = f"_r{index}"
+            self._group_lookup[group] = pattern
+            branches.append(f"(?P<{group}>{pattern})")
+
+        if not branches:
+            return
+        try:
+            self._combined = re.compile("|".join(branches), self._flags)
+        except re.error as exc:
+            # 模式间分组名冲突等情况：字面量仍合并，正则改为逐条匹配
+            logger.debug(f"合并正则失败，改为逐条匹配: {exc}")
+            self._standalone.extend((p, re.compile(p, self._flags)) for p in regex_patterns)
+            self._group_lookup.clear()
+            self._combined = re.compile(branches[0], self._flags) if literals else None
+
+    # ------------------------------------------------------------------
+    # 匹配
+    # ------------------------------------------------------------------
+    def match_one(self, value) -> Optional[str]:
+        """返回命中的规则（未命中返回 None）"""
+        if not isinstance(value, str):
+            return None
+        text = value[::-1] if self.match_type == "ends_with" else value
+        find = self._find_method(self.match_type)
+
+        if self._combined is not None:
+            found = getattr(self._combined, find)(text)
+            if found:
+                group = found.lastgroup
+                if group == _LITERAL_GROUP:
+                    return self._literal_lookup.get(self._literal_key(found.group(group)), found.group(group))
+                return self._group_lookup.get(group, found.group(0))
+
+        for pattern, compiled in self._standalone:
+            if getattr(compiled, find)(text):
+                return pattern
+        return None
+
+    @staticmethod
+    def _find_method(match_type: str) -> str:
+        return "search" if match_type == "contains" else "match"
+
+    def match(self, series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        一次扫描整列
+
+        Returns:
+            (命中掩码, 命中的规则)；未命中的行规则为 None
+        """
+        if not self.patterns or series.empty:
+            return pd.Series(False, index=series.index), pd.Series(None, index=series.index, dtype=object)
+        matched = series.map(self.match_one)
+        return matched.notna(), matched
+
+    def mask(self, series: pd.Series) -> pd.Series:
+        """只返回命中掩码"""
+        return self.match(series)[0]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(patterns: Tuple[str, ...], match_type: str, case_sensitive: bool) -> CompiledPatternMatcher:
+    return CompiledPatternMatcher(patterns, match_type, case_sensitive)
+
+
+def get_pattern_matcher(
+    patterns: Sequence[str], match_type: str = "contains", case_sensitive: bool = False
+) -> CompiledPatternMatcher:
+    """获取（缓存的）编译匹配器，同一组规则在多个筛选器间共享"""
+    return _cached_matcher(tuple(patterns), match_type, case_sensitive)
@@ -17,11 +17,12 @@
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
 from src.utils.logger import get_logger
+from src.utils.pattern_matcher import get_pattern_matcher
 
 logger = get_logger(__name__)
 
@@ -211,36 +212,55 @@ class CallNumberMatcher:
         Returns:
             需要排除的布尔掩码（True 表示需要排除）
         """
+        return self.match(call_no_series)[0]
+
+    def match(self, call_no_series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        与 apply 相同的过滤逻辑，同时返回排除原因
+
+        Returns:
+            (排除掩码, 排除原因)；原因形如 "DROP! <规则>"、"未命中KEEP"、"DROP <规则>"，
+            未排除的行为空字符串
+        """
         call_nos = call_no_series.fillna("").astype(str)
 
         # 1. 高优先级排除（无条件排除）
-        high_priority_mask = self._build_mask(
+        high_priority_mask, high_priority_rules = self._build_mask(
             call_nos, self.rules.high_priority_exclude, "高优先级排除"
         )
 
         # 2. 构建保留掩码
-        include_mask = self._build_mask(call_nos, self.rules.include, "保留")
+        include_mask, _ = self._build_mask(call_nos, self.rules.include, "保留")
 
         # 3. 构建普通排除掩码
-        normal_exclude_mask = self._build_mask(call_nos, self.rules.exclude, "排除")
+        normal_exclude_mask, normal_exclude_rules = self._build_mask(
+            call_nos, self.rules.exclude, "排除"
+        )
 
         # 组合逻辑：
         # - 高优先级排除（DROP!）：直接排除
         # - 保留规则（KEEP）：未匹配则排除
         # - 普通排除（DROP）：直接排除
-        return high_priority_mask | (~include_mask) | normal_exclude_mask
+        mask = high_priority_mask | (~include_mask) | normal_exclude_mask
+
+        reasons = pd.Series("", index=call_nos.index, dtype=object)
+        reasons[normal_exclude_mask] = "DROP " + normal_exclude_rules[normal_exclude_mask].astype(str)
+        reasons[~include_mask & ~normal_exclude_mask] = "未命中KEEP"
+        reasons[high_priority_mask] = "DROP! " + high_priority_rules[high_priority_mask].astype(str)
+        return mask, reasons
 
     def _build_mask(
         self, series: pd.Series, patterns: List[str], rule_type: str
-    ) -> pd.Series:
-        """构建匹配掩码"""
-        mask = pd.Series(False, index=series.index)
-        for pattern in patterns:
-            try:
-                mask |= series.str.match(pattern, na=False)
-            except re.error:
-                logger.warning(f"无效的{rule_type}正则: {pattern}")
-        return mask
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        构建匹配掩码（整组规则编译为一个匹配器，单次扫描），返回 (掩码, 命中的规则)
+
+        无效正则在编译时跳过并记录警告；rule_type 仅用于调试日志。
+        """
+        matcher = get_pattern_matcher(patterns, "regex", case_sensitive=True)
+        if matcher.invalid_patterns:
+            logger.debug(f"{rule_type}规则中已跳过 {len(matcher.invalid_patterns)} 条无效正则")
+        return matcher.match(series)
 
     @property
     def has_rules(self) -> bool:
@@ -275,13 +295,18 @@ class TitleKeywordsMatcher:
         Returns:
             需要排除的布尔掩码（True 表示需要排除）
         """
-        mask = pd.Series(False, index=title_series.index)
-        titles = title_series.fillna("").astype(str)
+        return self.match(title_series, case_sensitive)[0]
 
-        for keyword in self.keywords:
-            mask |= titles.str.contains(keyword, case=case_sensitive, na=False)
+    def match(self, title_series: pd.Series, case_sensitive: bool = False) -> Tuple[pd.Series, pd.Series]:
+        """
+        单次扫描匹配全部关键词
 
-        return mask
+        Returns:
+            (排除掩码, 命中的关键词)；未命中的行关键词为 None
+        """
+        titles = title_series.fillna("").astype(str)
+        matcher = get_pattern_matcher(self.keywords, "contains", case_sensitive=case_sensitive)
+        return matcher.match(titles)
 
     @property
     def has_keywords(self) -> bool:
@@ -5,6 +5,8 @@ from typing import List, Tuple, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 from src.core.l0_image_description.main import run as run_l0
 from src.utils.logger import init_logging, get_logger
+from src.utils.concurrency import RowScheduler
+from src.utils.llm_client_pool import get_client_pool
 from dotenv import load_dotenv
 
 # deep_analysis 任务模块导入
@@ -577,8 +579,7 @@ def _run_pipeline(l0_tasks: List[str], l1_enabled: bool, l2_enabled: bool,
                 logger.warning("deep_no_ids_from_excel: Excel 中未找到有效编号，跳过 deep_* 执行。")
                 return
 
-        # 逐个编号执行
-        for rid in ids:
+        def _process_deep_row(rid: str) -> None:
             logger.info(f"deep_process_started row_id={rid}")
             try:
                 if "deep_all" in deep_phases:
@@ -589,7 +590,7 @@ def _run_pipeline(l0_tasks: List[str], l1_enabled: bool, l2_enabled: bool,
                             raise RuntimeError(msg)
                         else:
                             logger.warning(f"deep_skip_missing_input row_id={rid} expected={epath}")
-                            continue
+                            return
                     run_deep_all(rid, settings)
                     logger.info(f"[OK] deep_all 完成：{rid}")
                 else:
@@ -640,7 +641,11 @@ def _run_pipeline(l0_tasks: List[str], l1_enabled: bool, l2_enabled: bool,
                     raise
                 else:
                     logger.error(f"deep_process_error row_id={rid} error={e}")
-                    continue
+                    return
+
+        # 各编号的 deep 文件相互独立，经行级调度器并发执行（单编号模式保持失败即抛出）
+        scheduler = RowScheduler.from_settings(settings, "deep_analysis")
+        scheduler.run(ids, _process_deep_row, raise_errors=explicit_single)
 
 
 def _interactive_mode(settings: Dict[str, Any]) -> None:
@@ -741,6 +746,8 @@ def _interactive_mode(settings: Dict[str, Any]) -> None:
             row_id=row_id,
             settings=settings
         )
+        # 输出本轮 LLM 调用的连接复用率与耗时分位数
+        get_client_pool().log_summary()
         print("\n执行完成！\n")
 
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+图像预处理自检脚本
+
+用合成图像验证 ImagePreparer 对特殊模式的处理：
+1. 16 位灰度 TIFF（I;16）：缩放到 8 位，而不是截断成几乎全白
+2. 带透明通道的 RGBA PNG：透明区域铺白底，而不是变黑
+3. 带透明色的调色板 PNG（P + transparency）：同上
+4. 无法解码的文件：退化为原图直传
+
+使用方式：
+    python scripts/check_image_preprocess.py
+    python scripts/check_image_preprocess.py --format webp
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.image_preprocess import ImagePreparer
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# 输出像素与期望值允许的误差（有损压缩）
+TOLERANCE = 12
+
+
+def _decode(data: bytes) -> "Image.Image":
+    return Image.open(io.BytesIO(data)).convert("RGB")
+
+
+def _near(pixel, expected) -> bool:
+    return all(abs(a - b) <= TOLERANCE for a, b in zip(pixel, expected))
+
+
+def make_16bit_tiff(path: Path) -> None:
+    """左右两半分别为 1/4、3/4 满量程的 16 位灰度图"""
+    row = [16384] * 32 + [49152] * 32
+    raw = b"".join(v.to_bytes(2, "little") for v in row * 32)
+    Image.frombytes("I;16", (64, 32), raw).save(path, format="TIFF")
+
+
+def make_rgba_png(path: Path) -> None:
+    """左半不透明红色，右半完全透明"""
+    img = Image.new("RGBA", (64, 32), (0, 0, 0, 0))
+    img.paste((255, 0, 0, 255), (0, 0, 32, 32))
+    img.save(path, format="PNG")
+
+
+def make_transparent_p_png(path: Path) -> None:
+    """调色板图：索引 0 为透明色，左半为蓝色"""
+    img = Image.new("P", (64, 32), 0)
+    img.putpalette([0, 0, 0, 0, 0, 255] + [0] * 762)
+    img.paste(1, (0, 0, 32, 32))
+    img.save(path, format="PNG", transparency=0)
+
+
+def run_checks(output_format: str) -> int:
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        preparer = ImagePreparer({"format": output_format, "cache_dir": str(tmp_dir / "cache")})
+        if not preparer.enabled:
+            print("未安装 Pillow，跳过检查")
+            return 1
+
+        cases = [
+            ("16 位 TIFF", "scan16.tif", make_16bit_tiff, {(8, 16): (64, 64, 64), (56, 16): (191, 191, 191)}),
+            ("RGBA PNG", "alpha.png", make_rgba_png, {(8, 16): (255, 0, 0), (56, 16): (255, 255, 255)}),
+            ("透明调色板 PNG", "palette.png", make_transparent_p_png, {(8, 16): (0, 0, 255), (56, 16): (255, 255, 255)}),
+        ]
+        for name, filename, make, expected in cases:
+            path = tmp_dir / filename
+            make(path)
+            prepared = preparer.prepare(str(path))
+            img = _decode(prepared.data)
+            for xy, want in expected.items():
+                got = img.getpixel(xy)
+                status = "OK" if _near(got, want) else "FAIL"
+                print(f"[{status}] {name} 像素{xy} 期望≈{want} 实际={got}")
+                if status == "FAIL":
+                    failures.append(name)
+
+        broken = tmp_dir / "broken.png"
+        broken.write_bytes(b"not an image")
+        prepared = preparer.prepare(str(broken))
+        ok = prepared.data == b"not an image" and prepared.mime == "image/png"
+        print(f"[{'OK' if ok else 'FAIL'}] 无法解码的文件直传原图 mime={prepared.mime}")
+        if not ok:
+            failures.append("原图直传")
+
+    print(f"\n检查完成：{'全部通过' if not failures else '失败 ' + ', '.join(sorted(set(failures)))}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="图像预处理自检")
+    parser.add_argument("--format", default="jpeg", choices=["jpeg", "webp"], help="输出格式")
+    args = parser.parse_args()
+    return run_checks(args.format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
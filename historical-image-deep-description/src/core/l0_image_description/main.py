@@ -3,7 +3,9 @@ import os
 from typing import Dict, List, Optional, Tuple
 
 from ...utils.logger import get_logger
-from ...utils.llm_api import load_settings, invoke_model, image_to_base64
+from ...utils.llm_api import load_settings, invoke_model
+from ...utils.image_preprocess import ImagePreparer
+from ...utils.concurrency import RowScheduler
 from ...utils.excel_io import ExcelIO, ExcelConfig
 from ...utils.metadata_context import build_metadata_context as _shared_build_metadata_context
 
@@ -50,9 +52,9 @@ def _strip_json_code_fence(s: str) -> str:
                 return s[start:end+1]
     return s
 
-def _build_vision_messages(system_prompt: str, image_b64: str, user_text: str) -> list:
+def _build_vision_messages(system_prompt: str, image_b64: str, user_text: str, mime: str = "image/jpeg") -> list:
     # 智谱AI要求完整的data URI格式
-    image_data_uri = f"data:image/jpeg;base64,{image_b64}"
+    image_data_uri = f"data:{mime};base64,{image_b64}"
     return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": [
@@ -196,6 +198,9 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
     # 扫描图片映射
     id2img = _scan_images(images_dir, supported_exts)
 
+    # 图像预处理（缩放/转码/去元数据，结果按文件哈希缓存）
+    preparer = ImagePreparer(settings.get("image_preprocessing"))
+
     # 读取提示词
     sys_prompts = {
         "long_description": _read_text(os.path.join(PROMPTS_DIR, settings["tasks"]["long_description"]["system_prompt_file"])),
@@ -203,15 +208,16 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
         "keywords": _read_text(os.path.join(PROMPTS_DIR, settings["tasks"]["keywords"]["system_prompt_file"])),
     }
 
-    def _run_long_description(row_cells, rid_norm, image_b64):
+    def _run_long_description(row_cells, rid_norm, image):
         # 统一上下文：仅元数据块，不追加参考描述
         context_block = build_unified_context(row_cells, cols, xio, settings, include_reference=False)
         user_text = f"{context_block}\n\n请生成详尽、客观、分层的图像长描述。" if context_block else "请生成详尽、客观、分层的图像长描述。"
         task_name = "long_description"
         messages = _build_vision_messages(
             sys_prompts[task_name],
-            image_b64,
-            user_text
+            image.base64,
+            user_text,
+            mime=image.mime,
         )
         out = invoke_model(task_name, messages, settings)
         # 获取实际使用的模型名称用于日志
@@ -225,7 +231,7 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
         logger.info(f'LLM原始输出 task={task_name} model={model_name} id={rid_norm} output="{safe_out}"')
         xio.set_value(row_cells, cols["long_desc_col"], out or "")
 
-    def _run_alt_text(row_cells, rid_norm, image_b64):
+    def _run_alt_text(row_cells, rid_norm, image):
         # 统一上下文：元数据 + [参考描述]（优先长描述）
         context_block = build_unified_context(row_cells, cols, xio, settings, include_reference=True, reference_priority=["long_desc_col"])
         parts = ["请基于下方图像与上下文，生成高质量的替代文本（Alt Text），适合无障碍与SEO，同时提取图像中的可见文本（OCR）。"]
@@ -236,8 +242,9 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
         task_name = "alt_text"
         messages = _build_vision_messages(
             sys_prompts[task_name],
-            image_b64,
-            user_text
+            image.base64,
+            user_text,
+            mime=image.mime,
         )
         out = invoke_model(task_name, messages, settings)
         # 获取实际使用的模型名称用于日志
@@ -296,7 +303,8 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
             logger.warning(f"关键词JSON解析失败 id={rid_norm}")
         xio.set_value(row_cells, cols["keywords_col"], to_write or "")
 
-    processed = 0
+    # 收集待处理行（编号、图片匹配与条数上限在主线程判定，保持原有 limit 语义）
+    pending: List[Tuple[int, tuple, str, str]] = []
     for row_idx, row in xio.iter_rows():
         row_cells = row["cells"]
         rid = xio.get_value(row_cells, cols["id_col"])
@@ -311,9 +319,12 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
             continue
 
         # 限流处理
-        if limit is not None and processed >= limit:
+        if limit is not None and len(pending) >= limit:
             break
+        pending.append((row_idx, row_cells, rid_norm, img_path))
 
+    def _process_row(item) -> None:
+        row_idx, row_cells, rid_norm, img_path = item
         # 读取已有值，提前检查是否需要处理
         cur_long = xio.get_value(row_cells, cols["long_desc_col"])
         cur_alt = xio.get_value(row_cells, cols["alt_text_col"])
@@ -321,37 +332,37 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
         cur_ocr = xio.get_value(row_cells, ocr_col) if ocr_col else None
         cur_kw = xio.get_value(row_cells, cols["keywords_col"])
 
+        # 任务：Alt Text（仅在需要时调用）
+        # 如果 OCR 列存在但为空，也视为需要重新生成
+        need_alt = "alt_text" in tasks and (not cur_alt or not settings["write_policy"]["skip_if_present"])
+        if not need_alt and cur_ocr is not None and not cur_ocr:
+            need_alt = True
+
         # 判断是否需要图像处理任务
         need_vision_tasks = (
             ("long_description" in tasks and (not cur_long or not settings["write_policy"]["skip_if_present"])) or
-            ("alt_text" in tasks and (not cur_alt or not settings["write_policy"]["skip_if_present"]))
+            need_alt
         )
 
-        # base64编码（仅在需要时进行）
-        image_b64 = None
+        # 图像预处理与base64编码（仅在需要时进行，长描述与替代文本共用同一份载荷）
+        image = None
         if need_vision_tasks:
             try:
-                image_b64 = image_to_base64(img_path)
+                image = preparer.prepare(img_path)
             except Exception as e:
-                logger.error(f"图片Base64编码失败 id={rid_norm} err={e}")
-                continue
+                logger.error(f"图片预处理失败 id={rid_norm} err={e}")
+                return
 
         # 任务：长描述（仅在需要时调用）
         if "long_description" in tasks and (not cur_long or not settings["write_policy"]["skip_if_present"]):
             logger.info(f"开始生成长描述 id={rid_norm}")
-            _run_long_description(row_cells, rid_norm, image_b64)
+            _run_long_description(row_cells, rid_norm, image)
         elif "long_description" in tasks:
             logger.info(f"跳过长描述生成 id={rid_norm} 原因=值已存在")
 
-        # 任务：Alt Text（仅在需要时调用）
-        # 如果 OCR 列存在但为空，也视为需要重新生成
-        need_alt = "alt_text" in tasks and (not cur_alt or not settings["write_policy"]["skip_if_present"])
-        if not need_alt and cur_ocr is not None and not cur_ocr:
-            need_alt = True
-
         if need_alt:
             logger.info(f"开始生成替代文本 id={rid_norm}")
-            _run_alt_text(row_cells, rid_norm, image_b64)
+            _run_alt_text(row_cells, rid_norm, image)
         elif "alt_text" in tasks:
             logger.info(f"跳过替代文本生成 id={rid_norm} 原因=值已存在")
 
@@ -362,7 +373,11 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, task
         elif "keywords" in tasks:
             logger.info(f"跳过关键词生成 id={rid_norm} 原因=值已存在")
 
-        processed += 1
+    # 行级并发：同一行内任务仍按 长描述 → 替代文本 → 关键词 顺序执行
+    scheduler = RowScheduler.from_settings(settings, "l0")
+    scheduler.run(pending, _process_row, describe=lambda item: item[2])
+
+    preparer.log_summary()
 
     # 保存
     xio.save()
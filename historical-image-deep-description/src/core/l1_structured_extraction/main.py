@@ -1,10 +1,11 @@
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ...utils.logger import get_logger
 from ...utils.llm_api import load_settings, invoke_model
 from ...utils.excel_io import ExcelIO, ExcelConfig
+from ...utils.concurrency import RowScheduler
 from ...utils.metadata_context import (
     build_metadata_context,
     build_unified_context_with_outputs
@@ -107,7 +108,8 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, limi
     sys_prompt_file = settings["tasks"][task_name]["system_prompt_file"]
     system_prompt = _read_text(os.path.join(PROMPTS_DIR, sys_prompt_file))
 
-    processed = 0
+    # 收集待处理行（编号、跳过策略与条数上限在主线程判定）
+    pending: List[Tuple[int, tuple, str]] = []
     for row_idx, row in xio.iter_rows():
         row_cells = row["cells"]
         # 读编号列（兼容旧配置键）
@@ -127,11 +129,12 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, limi
             continue
 
         # 限制处理数量
-        if limit is not None and processed >= limit:
+        if limit is not None and len(pending) >= limit:
             break
+        pending.append((row_idx, row_cells, rid_norm))
 
-
-
+    def _process_row(item) -> None:
+        row_idx, row_cells, rid_norm = item
         # 元数据上下文（可选长描述或OCR文本）
         l1_cfg = settings.get("tasks", {}).get("l1_extraction", {})
         use_long_desc = l1_cfg.get("use_long_description", False)
@@ -185,7 +188,8 @@ def run(excel_path: Optional[str] = None, images_dir: Optional[str] = None, limi
 
         # 写回 Excel（列不存在会自动创建）
         xio.set_value(row_cells, out_col_header, to_write or "")
-        processed += 1
+
+    RowScheduler.from_settings(settings, "l1").run(pending, _process_row, describe=lambda item: item[2])
 
     # 保存 Excel
     xio.save()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import Any, Dict, List, Optional, Literal
+import hashlib
 import json
 import os
 import time
@@ -7,12 +8,14 @@ from datetime import datetime
 from ...utils.logger import get_logger
 from ...utils.llm_api import invoke_model
 from ...utils.json_repair import repair_json_output
+from ...utils.lookup_cache import get_lookup_cache
 
 logger = get_logger(__name__)
 
 PROMPTS_DIR = os.path.join("src", "prompts")
 DIS_PROMPT_PATH = os.path.join(PROMPTS_DIR, "l2_entity_disambiguation.md")
 INTERNAL_API_DIS_PROMPT_PATH = os.path.join(PROMPTS_DIR, "l2_internal_api_disambiguation.md")
+_PARSE_FAILED_REASON = "输出解析失败"
 
 
 def _read_text(path: str) -> str:
@@ -20,6 +23,12 @@ def _read_text(path: str) -> str:
         return f.read()
 
 
+def _judge_cache_variant(messages: List[Dict[str, Any]], model_name: Optional[str]) -> str:
+    """判定缓存的区分键：提示词、上下文、候选与模型任一变化即视为新判定"""
+    payload = json.dumps({"messages": messages, "model": model_name}, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def _build_messages(label: str, ent_type: Optional[str], context_hint: str,
                     source: Literal["wikipedia", "wikidata", "internal_api"],
                     candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -101,7 +110,7 @@ def _parse_llm_output(txt: str, source: Literal["wikipedia", "wikidata", "intern
             data = repaired_data
         else:
             logger.warning("llm_output_not_json")
-            return {"matched": False, "confidence": 0.0, "reason": "输出解析失败", "selected": None}
+            return {"matched": False, "confidence": 0.0, "reason": _PARSE_FAILED_REASON, "selected": None}
 
     # 兼容顶层 selection（当前协议），优先使用
     sel: Optional[Dict[str, Any]] = None
@@ -218,60 +227,73 @@ def judge_best_match(
     if not candidates:
         return {"matched": False, "confidence": 0.0, "reason": "无候选", "selected": None}
 
-    # 获取执行时间戳
-    executed_at = datetime.now().isoformat()
-    
+    # 所用模型名：附加到判定结果便于下游写入 meta，同时参与缓存键（换模型后重新判定）
+    try:
+        task_cfg = settings.get("tasks", {}).get("l2_disambiguation") or {}
+        provider_type = task_cfg.get("provider_type")
+        if provider_type:
+            model_name = settings.get("api_providers", {}).get(provider_type, {}).get("primary", {}).get("model")
+        else:
+            model_name = None
+    except Exception:
+        model_name = None
+
     try:
         messages = _build_messages(label, ent_type, context_hint, source, candidates)
-        out = invoke_model("l2_disambiguation", messages, settings)
-        parsed = _parse_llm_output(out, source)
 
-        # 内部API选择项充实：将 LLM 返回的最小 selected 映射回原候选，保留 __api_name 与 _raw 等字段
-        if source == "internal_api" and isinstance(parsed, dict):
-            sel = parsed.get("selected")
-            if isinstance(sel, dict):
-                sel_uri = sel.get("uri")
-                matched_candidate = None
-                if sel_uri:
-                    for c in candidates:
-                        try:
-                            if c.get("uri") == sel_uri:
-                                matched_candidate = c
-                                break
-                        except Exception:
-                            pass
-                if not matched_candidate:
-                    sel_label = sel.get("label")
-                    if sel_label:
+        def _judge() -> Dict[str, Any]:
+            out = invoke_model("l2_disambiguation", messages, settings)
+            parsed = _parse_llm_output(out, source)
+
+            # 内部API选择项充实：将 LLM 返回的最小 selected 映射回原候选，保留 __api_name 与 _raw 等字段
+            if source == "internal_api" and isinstance(parsed, dict):
+                sel = parsed.get("selected")
+                if isinstance(sel, dict):
+                    sel_uri = sel.get("uri")
+                    matched_candidate = None
+                    if sel_uri:
                         for c in candidates:
                             try:
-                                if c.get("label") == sel_label:
+                                if c.get("uri") == sel_uri:
                                     matched_candidate = c
                                     break
                             except Exception:
                                 pass
-                if matched_candidate:
-                    parsed["selected"] = matched_candidate
-                    logger.info(
-                        f"internal_api_selected_enriched uri={matched_candidate.get('uri')} "
-                        f"has_raw={matched_candidate.get('_raw') is not None} "
-                        f"api={matched_candidate.get('__api_name')}"
-                    )
+                    if not matched_candidate:
+                        sel_label = sel.get("label")
+                        if sel_label:
+                            for c in candidates:
+                                try:
+                                    if c.get("label") == sel_label:
+                                        matched_candidate = c
+                                        break
+                                except Exception:
+                                    pass
+                    if matched_candidate:
+                        parsed["selected"] = matched_candidate
+                        logger.info(
+                            f"internal_api_selected_enriched uri={matched_candidate.get('uri')} "
+                            f"has_raw={matched_candidate.get('_raw') is not None} "
+                            f"api={matched_candidate.get('__api_name')}"
+                        )
 
-        # 将所用模型名和执行时间附加到判定结果，便于下游写入 meta
-        try:
-            task_cfg = settings.get("tasks", {}).get("l2_disambiguation") or {}
-            provider_type = task_cfg.get("provider_type")
-            if provider_type:
-                model_name = settings.get("api_providers", {}).get(provider_type, {}).get("primary", {}).get("model")
-            else:
-                model_name = None
-        except Exception:
-            model_name = None
-        if isinstance(parsed, dict):
-            parsed["model"] = model_name
-            parsed["executed_at"] = executed_at
-        return parsed
+            if isinstance(parsed, dict):
+                parsed["model"] = model_name
+            return parsed
+
+        # 相同提示词、上下文与候选的判定结果直接复用；输出解析失败的结果不缓存
+        result = get_lookup_cache(settings).fetch(
+            f"judge:{source}",
+            label,
+            _judge,
+            type_hint=ent_type,
+            variant=_judge_cache_variant(messages, model_name),
+            cache_if=lambda r: isinstance(r, dict) and r.get("reason") != _PARSE_FAILED_REASON,
+        )
+        # 执行时间按本次调用记录（命中缓存时同样为当前时间）
+        if isinstance(result, dict):
+            result["executed_at"] = datetime.now().isoformat()
+        return result
     except Exception as e:
         logger.warning(f"llm_judge_failed source={source} label={label} err={e}")
-        return {"matched": False, "confidence": 0.0, "reason": f"异常: {e}", "selected": None}
\ No newline at end of file
+        return {"matched": False, "confidence": 0.0, "reason": f"异常: {e}", "selected": None}
@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional
 from ...utils.logger import get_logger
 from ...utils.llm_api import load_settings, invoke_model
 from ...utils.excel_io import ExcelIO
+from ...utils.concurrency import RowScheduler
+from ...utils.lookup_cache import get_lookup_cache
 from ...utils.metadata_context import build_metadata_context
 from .tools.registry import get_tool, initialize_internal_apis, get_internal_api_router
 from .task_builder import build_task_list
@@ -152,7 +154,8 @@ def process_entities(task_list: List[Dict[str, Any]], xio: ExcelIO, settings: Di
             logger.error(f"outputs_json_build_failed dir={out_dir} err={_e}")
             return []
 
-    for fname in files:
+    # 每个行级 JSON 相互独立，按文件并发处理；外部服务的请求间隔由共享限流器控制
+    def _process_file(fname: str) -> List[Dict[str, Any]]:
         fpath = os.path.join(out_dir, fname)
         try:
             import json
@@ -160,9 +163,10 @@ def process_entities(task_list: List[Dict[str, Any]], xio: ExcelIO, settings: Di
                 data = json.load(rf)
         except Exception as e:
             logger.warning(f"json_read_failed file={fpath} err={e}")
-            continue
+            return []
 
         row_id = str(data.get("row_id") or os.path.splitext(fname)[0])
+        file_summary: List[Dict[str, Any]] = []
         entities = data.get("entities") or []
         updated = False
 
@@ -205,7 +209,7 @@ def process_entities(task_list: List[Dict[str, Any]], xio: ExcelIO, settings: Di
                 ):
                     updated = True
      
-            processed_summary.append({
+            file_summary.append({
                 "row_id": row_id,
                 "label": label,
                 "wikipedia_status": (ent.get("wikipedia") or {}).get("meta", {}).get("status")
@@ -231,8 +235,14 @@ def process_entities(task_list: List[Dict[str, Any]], xio: ExcelIO, settings: Di
                 logger.info(f"json_updated file={fpath} row_id={row_id}")
             except Exception as e:
                 logger.error(f"json_write_failed file={fpath} err={e}")
+        return file_summary
+
+    scheduler = RowScheduler.from_settings(settings, "l2")
+    for file_summary in scheduler.run(files, _process_file):
+        processed_summary.extend(file_summary or [])
 
     logger.info(f"entities_processed_from_json files={len(files)}")
+    get_lookup_cache(settings).log_summary()
     return processed_summary
 
 
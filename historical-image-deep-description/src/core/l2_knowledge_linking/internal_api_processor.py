@@ -1,4 +1,3 @@
-import time
 from typing import Any, Dict, List, Optional
 
 from ...utils.logger import get_logger
@@ -41,6 +40,7 @@ def process_internal_api_entity(
         if not api_enabled:
             logger.debug(f"internal_api_disabled api={api_name} type={ent_type} label={label}")
             return False
+        # 按 API 限流由路由器在检索缓存未命中时执行，重复实体无需等待
         try:
             # 使用支持别名检索的新方法：优先原始检索 + LLM 判定，不匹配时触发别名循环
             alias_search_result = internal_api_router.route_to_api_with_aliases(
@@ -144,12 +144,4 @@ def process_internal_api_entity(
             }
             logger.error(f"internal_api_error label={label} err={e}")
             return True
-        finally:
-            # 添加延迟（如果配置了）
-            delay = int(rate_limit.get("internal_api_ms", 1000))
-            if delay > 0:
-                try:
-                    time.sleep(delay / 1000.0)
-                except Exception:
-                    pass
     return False
\ No newline at end of file
@@ -13,9 +13,9 @@
 - 配置化管理机制
 """
 
-import time
 from typing import Any, Dict, List, Optional
 from ...utils.logger import get_logger
+from ...utils.concurrency import throttle
 from ...utils.llm_api import invoke_model
 from ...utils.json_repair import repair_json_output
 
@@ -114,6 +114,8 @@ class RelatedEventSearcher:
             logger.debug(f"related_event_search_disabled type={entity_type} label={entity_label}")
             return {"events": [], "metadata": {"reason": "实体类型未启用相关事件检索"}}
         
+        # 速率限制（跨行共享）
+        throttle("related_event_search", self.rate_limit_ms)
         try:
             # Step 1: 生成搜索关键词
             search_keyword, keyword_extracted = self._generate_search_keyword(
@@ -191,13 +193,6 @@ class RelatedEventSearcher:
                     "executed_at": datetime.now().isoformat()
                 }
             }
-        finally:
-            # 添加速率限制延时
-            if self.rate_limit_ms > 0:
-                try:
-                    time.sleep(self.rate_limit_ms / 1000.0)
-                except Exception:
-                    pass
     
     def _generate_search_keyword(
         self, 
@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Optional
-import time
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 
 from .....utils.logger import get_logger
+from .....utils.concurrency import get_executor, throttle
 from .alias_extraction import AliasExtractor
 from .base import InternalAPIRouter
 
@@ -79,69 +81,81 @@ class AliasSearchManager:
                 "alias_attempts": 0,
             }
 
-        # 4. 依次尝试别名检索
+        # 4. 批量检索别名：所有候选别名一次性提交到共享线程池（受别名限流约束），
+        #    按置信度顺序依次判定，命中即取消其余检索
         max_attempts = min(len(aliases), int(self.config.get("max_alias_attempts", 3)))
         rate_limit_ms = int(self.config.get("rate_limit_ms", 1000))
-
+        min_confidence = float(self.config.get("min_confidence_threshold", 0.6))
+        cancelled = threading.Event()
+
+        def _search_alias(alias: str) -> Optional[List[Dict[str, Any]]]:
+            if cancelled.is_set():
+                return None
+            # 速率限制（跨行共享）
+            throttle("alias_search", rate_limit_ms)
+            if cancelled.is_set():
+                return None
+            # 传入取消事件：启用分页时，其他别名命中后本别名的分页检索不再继续取页和 LLM 判定
+            return api_router.route_to_api(entity_type, alias, "zh", entity_type, cancelled=cancelled)
+
+        executor = get_executor("alias_search", self.settings)
+        attempts: List[Tuple[int, str, float, Future]] = []
         for i, alias_data in enumerate(aliases[:max_attempts]):
             alias = alias_data.get("alias")
             confidence = float(alias_data.get("confidence", 0.0))
-
             # 置信度过滤
-            min_confidence = float(self.config.get("min_confidence_threshold", 0.6))
             if not alias or confidence < min_confidence:
                 logger.info(
                     f"alias_skipped_low_confidence label={entity_label} alias={alias} confidence={confidence}"
                 )
                 continue
+            attempts.append((i, alias, confidence, executor.submit(_search_alias, alias)))
 
-            logger.info(
-                f"alias_search_attempt label={entity_label} alias={alias} confidence={confidence} attempt={i+1}/{max_attempts}"
-            )
-
-            try:
-                # 使用别名检索候选
-                alias_candidates = api_router.route_to_api(entity_type, alias, "zh", entity_type)
-                if not alias_candidates:
-                    continue
-
-                # 使用 LLM 判断匹配
-                from ...entity_matcher import judge_best_match
-
-                judge = judge_best_match(
-                    label=entity_label,  # 使用原始标签进行判断
-                    ent_type=entity_type,
-                    context_hint=context_hint,
-                    source="internal_api",
-                    candidates=alias_candidates,
-                    settings=self.settings,
+        try:
+            for i, alias, confidence, future in attempts:
+                logger.info(
+                    f"alias_search_attempt label={entity_label} alias={alias} confidence={confidence} attempt={i+1}/{max_attempts}"
                 )
-
-                if judge.get("matched"):
-                    sel = judge.get("selected") or {}
-                    logger.info(
-                        f"alias_search_success label={entity_label} alias={alias} uri={sel.get('uri')} confidence={judge.get('confidence')}"
+                try:
+                    # 取别名检索候选
+                    alias_candidates = future.result()
+                    if not alias_candidates:
+                        continue
+
+                    # 使用 LLM 判断匹配
+                    from ...entity_matcher import judge_best_match
+
+                    judge = judge_best_match(
+                        label=entity_label,  # 使用原始标签进行判断
+                        ent_type=entity_type,
+                        context_hint=context_hint,
+                        source="internal_api",
+                        candidates=alias_candidates,
+                        settings=self.settings,
                     )
-                    return {
-                        "matched": True,
-                        "selected": sel,
-                        "confidence": judge.get("confidence"),
-                        "reason": f"使用别名'{alias}'匹配成功: {judge.get('reason')}",
-                        "alias_used": alias,
-                        "alias_attempts": i + 1,
-                        "model": judge.get("model"),
-                    }
-
-            except Exception as e:
-                logger.warning(f"alias_search_error label={entity_label} alias={alias} err={e}")
-                continue
 
-            # 速率限制
-            if rate_limit_ms > 0 and i < max_attempts - 1:
-                try:
-                    time.sleep(rate_limit_ms / 1000.0)
-                except Exception:
-                    pass
+                    if judge.get("matched"):
+                        sel = judge.get("selected") or {}
+                        logger.info(
+                            f"alias_search_success label={entity_label} alias={alias} uri={sel.get('uri')} confidence={judge.get('confidence')}"
+                        )
+                        return {
+                            "matched": True,
+                            "selected": sel,
+                            "confidence": judge.get("confidence"),
+                            "reason": f"使用别名'{alias}'匹配成功: {judge.get('reason')}",
+                            "alias_used": alias,
+                            "alias_attempts": i + 1,
+                            "model": judge.get("model"),
+                        }
+
+                except Exception as e:
+                    logger.warning(f"alias_search_error label={entity_label} alias={alias} err={e}")
+                    continue
+        finally:
+            cancelled.set()
+            for _, _, _, future in attempts:
+                future.cancel()
 
         # 5. 所有别名都尝试失败
         logger.info(f"alias_search_failed label={entity_label} attempts={max_attempts}")
@@ -1,3 +1,4 @@
+import threading
 from typing import Any, Dict, List, Optional
 import time
 import httpx
@@ -5,6 +6,8 @@ from abc import ABC, abstractmethod
 
 from .....utils.logger import get_logger
 from .....utils.llm_api import load_settings, _resolve_env
+from .....utils.concurrency import throttle
+from .....utils.lookup_cache import get_lookup_cache
 
 logger = get_logger(__name__)
 
@@ -147,8 +150,15 @@ class InternalAPIRouter:
         """根据实体类型获取对应的API名称"""
         return self.type_mapping.get(entity_type)
     
-    def route_to_api(self, entity_type: str, entity_label: str, lang: str = "zh", type_hint: Optional[str] = None) -> List[Dict[str, Any]]:
-        """路由到对应的API并返回结果"""
+    def route_to_api(
+        self,
+        entity_type: str,
+        entity_label: str,
+        lang: str = "zh",
+        type_hint: Optional[str] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> List[Dict[str, Any]]:
+        """路由到对应的API并返回结果；cancelled 被置位后分页检索不再取页与判定（用于别名批量检索）"""
         api_name = self.get_api_name(entity_type)
         if not api_name:
             logger.warning(f"no_api_mapping_for_type type={entity_type}")
@@ -176,7 +186,7 @@ class InternalAPIRouter:
                 from .paginated_searcher import PaginatedAPISearcher
                 searcher = PaginatedAPISearcher(api_client, pagination_config, self.settings)
                 # 返回单纯的候选列表，不进行LLM判断（由上层调用者处理）
-                result = searcher.search_with_llm_judgment(entity_label, entity_type, "", lang, type_hint)
+                result = searcher.search_with_llm_judgment(entity_label, entity_type, "", lang, type_hint, cancelled=cancelled)
                 
                 # 将分页搜索结果转换为标准格式
                 if result.get("matched") and result.get("selected"):
@@ -193,24 +203,41 @@ class InternalAPIRouter:
                 # 失败时回退到原有逻辑
                 pass
         
-        # 使用原有的单页搜索逻辑
-        try:
-            raw_data = api_client.search(entity_label, lang, type_hint)
-            if not raw_data:
-                return []
-            parsed_data = ResponseParser.parse(api_name, raw_data, self.settings)
-            # 为每条候选注入来源 api_name，便于后续按 API 配置输出字段
+        # 使用原有的单页搜索逻辑（结果写入检索缓存；请求失败返回 None，不缓存）
+        def _load() -> Optional[List[Dict[str, Any]]]:
+            # 缓存未命中时才按 API 限流（跨行共享）
+            throttle(api_name, self._rate_limit_ms(api_name))
             try:
-                for _it in parsed_data:
-                    if isinstance(_it, dict):
-                        _it["__api_name"] = api_name
-            except Exception:
-                pass
-            logger.info(f"api_search_ok api={api_name} label={entity_label} count={len(parsed_data)}")
-            return parsed_data
-        except Exception as e:
-            logger.error(f"api_call_failed api={api_name} label={entity_label} err={e}")
-            return []
+                raw_data = api_client.search(entity_label, lang, type_hint)
+                if raw_data is None:
+                    # 缺少配置或 HTTP 请求失败（_make_request 返回 None）
+                    return None
+                if not raw_data:
+                    return []
+                parsed_data = ResponseParser.parse(api_name, raw_data, self.settings)
+                # 为每条候选注入来源 api_name，便于后续按 API 配置输出字段
+                try:
+                    for _it in parsed_data:
+                        if isinstance(_it, dict):
+                            _it["__api_name"] = api_name
+                except Exception:
+                    pass
+                logger.info(f"api_search_ok api={api_name} label={entity_label} count={len(parsed_data)}")
+                return parsed_data
+            except Exception as e:
+                logger.error(f"api_call_failed api={api_name} label={entity_label} err={e}")
+                return None
+
+        parsed = get_lookup_cache(self.settings).fetch(
+            api_name, entity_label, _load, lang=lang, type_hint=type_hint, variant="search",
+            cache_if=lambda r: r is not None,
+        )
+        return parsed or []
+
+    def _rate_limit_ms(self, api_name: str) -> int:
+        """按 API 的请求间隔：优先 <api_name>_ms，其次 internal_api_ms"""
+        rate_limit = {**(self.settings.get("rate_limit", {}) or {}), **(self.settings.get("internal_api_rate_limits", {}) or {})}
+        return int(rate_limit.get(f"{api_name}_ms", rate_limit.get("internal_api_ms", 1000)))
     
     def route_to_api_with_aliases(
         self,
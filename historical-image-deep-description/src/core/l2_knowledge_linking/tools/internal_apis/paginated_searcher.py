@@ -2,16 +2,21 @@
 通用分页搜索器 - 为内部API提供分页搜索和智能LLM匹配判断能力
 
 该模块实现了通用的分页搜索功能，支持：
-1. 循环调用API的不同页面
+1. 循环调用API的不同页面，判定当前页时并发预取后续页面（受分页限流约束）
 2. 每页结果立即进行LLM匹配判断
-3. 找到高置信度匹配时立即停止（早停机制）
+3. 找到高置信度匹配时立即停止并取消未完成的预取（早停机制）
 4. 完整的错误处理和重试逻辑
 5. 详细的日志记录和性能监控
+6. 每页候选写入检索缓存，重复实体不再请求
 """
 
+import threading
 import time
+from concurrent.futures import Future
 from typing import Any, Dict, List, Optional, Protocol
 from .....utils.logger import get_logger
+from .....utils.concurrency import get_executor, throttle
+from .....utils.lookup_cache import get_lookup_cache
 from .base import ResponseParser
 
 logger = get_logger(__name__)
@@ -44,6 +49,46 @@ class APIClientProtocol(Protocol):
         ...
 
 
+class _PagePrefetcher:
+    """
+    单次分页搜索的页面预取窗口：
+    取第 N 页时确保 N+1..N+prefetch_pages 页已提交到共享线程池，
+    请求间隔仍由分页限流器控制；cancel() 后未开始的预取直接取消，等待中的预取不再发出请求。
+    """
+
+    def __init__(self, searcher: "PaginatedAPISearcher", entity_label: str, lang: str, type_hint: Optional[str]):
+        self._searcher = searcher
+        self._entity_label = entity_label
+        self._lang = lang
+        self._type_hint = type_hint
+        self._cancelled = threading.Event()
+        self._futures: Dict[int, Future] = {}
+
+    def _submit(self, page: int) -> None:
+        if page > self._searcher.max_pages or page in self._futures:
+            return
+        executor = get_executor("page_prefetch", self._searcher.settings)
+        self._futures[page] = executor.submit(
+            self._searcher._fetch_page, self._entity_label, page, self._lang, self._type_hint, self._cancelled
+        )
+
+    def get(self, page: int) -> List[Dict[str, Any]]:
+        if self._searcher.prefetch_pages <= 0:
+            return self._searcher._fetch_page(self._entity_label, page, self._lang, self._type_hint)
+        for ahead in range(page, page + self._searcher.prefetch_pages + 1):
+            self._submit(ahead)
+        return self._futures.pop(page).result()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        pending = [p for p, f in self._futures.items() if not f.done()]
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        if pending:
+            logger.info(f"paginated_prefetch_cancelled api={self._searcher.api_client.api_name} label={self._entity_label} pages={pending}")
+
+
 class PaginatedAPISearcher:
     """通用分页搜索器"""
     
@@ -66,8 +111,10 @@ class PaginatedAPISearcher:
         self.early_stop = pagination_config.get("early_stop", True)
         self.min_confidence = float(pagination_config.get("min_confidence", 0.7))
         self.rate_limit_ms = int(pagination_config.get("rate_limit_ms", 1000))
+        # 当前页判定期间提前请求的后续页数，0 表示逐页顺序请求
+        self.prefetch_pages = max(0, int(pagination_config.get("prefetch_pages", 2)))
         
-        logger.info(f"paginated_searcher_initialized api={api_client.api_name} page_size={self.page_size} max_pages={self.max_pages} early_stop={self.early_stop}")
+        logger.info(f"paginated_searcher_initialized api={api_client.api_name} page_size={self.page_size} max_pages={self.max_pages} early_stop={self.early_stop} prefetch_pages={self.prefetch_pages}")
     
     def search_with_llm_judgment(
         self,
@@ -75,7 +122,8 @@ class PaginatedAPISearcher:
         entity_type: str,
         context_hint: str = "",
         lang: str = "zh",
-        type_hint: Optional[str] = None
+        type_hint: Optional[str] = None,
+        cancelled: Optional[threading.Event] = None,
     ) -> Dict[str, Any]:
         """
         执行分页搜索并进行LLM匹配判断
@@ -86,6 +134,7 @@ class PaginatedAPISearcher:
             context_hint: 上下文提示
             lang: 语言
             type_hint: 类型提示
+            cancelled: 调用方的取消事件，置位后不再取页和判定，按未匹配返回
         
         Returns:
             匹配结果字典，格式：
@@ -102,81 +151,80 @@ class PaginatedAPISearcher:
         """
         api_name = self.api_client.api_name
         start_time = time.time()
-        total_candidates = 0
+        all_candidates: List[Dict[str, Any]] = []
+
+        def _stopped(page: int) -> bool:
+            if cancelled is None or not cancelled.is_set():
+                return False
+            logger.info(f"paginated_search_cancelled api={api_name} label={entity_label} page={page}")
+            return True
         
-        logger.info(f"paginated_search_start api={api_name} label={entity_label} type={entity_type} max_pages={self.max_pages}")
+        logger.info(f"paginated_search_start api={api_name} label={entity_label} type={entity_type} max_pages={self.max_pages} prefetch_pages={self.prefetch_pages}")
         
-        for page in range(1, self.max_pages + 1):
-            try:
-                # 搜索当前页
-                page_candidates = self._search_single_page(entity_label, page, lang, type_hint)
-                if not page_candidates:
-                    logger.info(f"paginated_search_empty_page api={api_name} label={entity_label} page={page}")
-                    # 空页面通常意味着没有更多数据，可以提前终止
+        # 判定当前页的同时，后续页面已在后台请求；找到匹配或遇到空页后取消其余预取
+        pages = _PagePrefetcher(self, entity_label, lang, type_hint)
+        try:
+            for page in range(1, self.max_pages + 1):
+                if _stopped(page):
                     break
-                
-                total_candidates += len(page_candidates)
-                logger.info(f"paginated_search_page_result api={api_name} label={entity_label} page={page} candidates_count={len(page_candidates)}")
-                
-                # 如果启用早停，立即进行LLM判断
-                if self.early_stop:
-                    judgment = self._judge_candidates(page_candidates, entity_label, entity_type, context_hint)
-                    
-                    if judgment.get("matched", False) and judgment.get("confidence", 0) >= self.min_confidence:
-                        # 找到高置信度匹配，立即返回
-                        elapsed = time.time() - start_time
-                        result = {
-                            "matched": True,
-                            "selected": judgment.get("selected"),
-                            "confidence": judgment.get("confidence"),
-                            "reason": judgment.get("reason"),
-                            "page_found": page,
-                            "total_pages_searched": page,
-                            "total_candidates": total_candidates,
-                            "model": judgment.get("model"),
-                            "search_time_ms": int(elapsed * 1000)
-                        }
-                        logger.info(f"paginated_search_early_stop api={api_name} label={entity_label} page={page} confidence={judgment.get('confidence')} time_ms={int(elapsed * 1000)}")
-                        return result
-                
-                # 页面间延时，避免API速率限制
-                if page < self.max_pages and self.rate_limit_ms > 0:
-                    time.sleep(self.rate_limit_ms / 1000.0)
-                    
-            except Exception as e:
-                logger.error(f"paginated_search_page_error api={api_name} label={entity_label} page={page} error={e}")
-                # 单页失败不影响后续页面搜索
-                continue
-        
-        # 所有页面搜索完毕，如果未启用早停或未找到匹配，则对所有候选进行最终判断
-        if not self.early_stop and total_candidates > 0:
-            # 收集所有页面的候选（重新搜索，实际应用中可考虑缓存优化）
-            all_candidates = []
-            for page in range(1, min(self.max_pages + 1, 11)):  # 限制重新搜索的页数
                 try:
-                    page_candidates = self._search_single_page(entity_label, page, lang, type_hint)
+                    # 取当前页（优先读取缓存或已完成的预取）
+                    page_candidates = pages.get(page)
+                    if _stopped(page):
+                        break
                     if not page_candidates:
+                        logger.info(f"paginated_search_empty_page api={api_name} label={entity_label} page={page}")
+                        # 空页面通常意味着没有更多数据，可以提前终止
                         break
+                    
                     all_candidates.extend(page_candidates)
-                except Exception:
+                    logger.info(f"paginated_search_page_result api={api_name} label={entity_label} page={page} candidates_count={len(page_candidates)}")
+                    
+                    # 如果启用早停，立即进行LLM判断
+                    if self.early_stop:
+                        judgment = self._judge_candidates(page_candidates, entity_label, entity_type, context_hint)
+                        
+                        if judgment.get("matched", False) and judgment.get("confidence", 0) >= self.min_confidence:
+                            # 找到高置信度匹配，立即返回
+                            elapsed = time.time() - start_time
+                            result = {
+                                "matched": True,
+                                "selected": judgment.get("selected"),
+                                "confidence": judgment.get("confidence"),
+                                "reason": judgment.get("reason"),
+                                "page_found": page,
+                                "total_pages_searched": page,
+                                "total_candidates": len(all_candidates),
+                                "model": judgment.get("model"),
+                                "search_time_ms": int(elapsed * 1000)
+                            }
+                            logger.info(f"paginated_search_early_stop api={api_name} label={entity_label} page={page} confidence={judgment.get('confidence')} time_ms={int(elapsed * 1000)}")
+                            return result
+                        
+                except Exception as e:
+                    logger.error(f"paginated_search_page_error api={api_name} label={entity_label} page={page} error={e}")
+                    # 单页失败不影响后续页面搜索
                     continue
-            
-            if all_candidates:
-                judgment = self._judge_candidates(all_candidates, entity_label, entity_type, context_hint)
-                elapsed = time.time() - start_time
-                result = {
-                    "matched": judgment.get("matched", False),
-                    "selected": judgment.get("selected"),
-                    "confidence": judgment.get("confidence", 0.0),
-                    "reason": judgment.get("reason", ""),
-                    "page_found": None,
-                    "total_pages_searched": self.max_pages,
-                    "total_candidates": len(all_candidates),
-                    "model": judgment.get("model"),
-                    "search_time_ms": int(elapsed * 1000)
-                }
-                logger.info(f"paginated_search_final_judgment api={api_name} label={entity_label} matched={judgment.get('matched')} confidence={judgment.get('confidence')} time_ms={int(elapsed * 1000)}")
-                return result
+        finally:
+            pages.cancel()
+        
+        # 未启用早停时，对已取得的全部候选进行一次最终判断（无需重新搜索）
+        if not self.early_stop and all_candidates and not (cancelled is not None and cancelled.is_set()):
+            judgment = self._judge_candidates(all_candidates, entity_label, entity_type, context_hint)
+            elapsed = time.time() - start_time
+            result = {
+                "matched": judgment.get("matched", False),
+                "selected": judgment.get("selected"),
+                "confidence": judgment.get("confidence", 0.0),
+                "reason": judgment.get("reason", ""),
+                "page_found": None,
+                "total_pages_searched": self.max_pages,
+                "total_candidates": len(all_candidates),
+                "model": judgment.get("model"),
+                "search_time_ms": int(elapsed * 1000)
+            }
+            logger.info(f"paginated_search_final_judgment api={api_name} label={entity_label} matched={judgment.get('matched')} confidence={judgment.get('confidence')} time_ms={int(elapsed * 1000)}")
+            return result
         
         # 未找到任何匹配
         elapsed = time.time() - start_time
@@ -187,14 +235,47 @@ class PaginatedAPISearcher:
             "reason": "在所有页面中未找到匹配的候选",
             "page_found": None,
             "total_pages_searched": self.max_pages,
-            "total_candidates": total_candidates,
+            "total_candidates": len(all_candidates),
             "model": None,
             "search_time_ms": int(elapsed * 1000)
         }
-        logger.info(f"paginated_search_no_match api={api_name} label={entity_label} pages_searched={self.max_pages} total_candidates={total_candidates} time_ms={int(elapsed * 1000)}")
+        logger.info(f"paginated_search_no_match api={api_name} label={entity_label} pages_searched={self.max_pages} total_candidates={len(all_candidates)} time_ms={int(elapsed * 1000)}")
         return result
     
-    def _search_single_page(self, entity_label: str, page: int, lang: str, type_hint: Optional[str] = None) -> List[Dict[str, Any]]:
+    def _fetch_page(
+        self,
+        entity_label: str,
+        page: int,
+        lang: str,
+        type_hint: Optional[str] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        读取指定页面：优先使用检索缓存，未命中时按页限流后请求。
+        预取任务在限流等待前后检查 cancelled，已取消则不再发起请求（结果不缓存）。
+        """
+        def _load() -> Optional[List[Dict[str, Any]]]:
+            if cancelled is not None and cancelled.is_set():
+                return None
+            # 分页请求限流（跨行共享）：并发预取的请求同样按间隔依次发出
+            throttle(f"{self.api_client.api_name}:page", self.rate_limit_ms)
+            if cancelled is not None and cancelled.is_set():
+                return None
+            return self._search_single_page(entity_label, page, lang, type_hint)
+
+        result = get_lookup_cache(self.settings).fetch(
+            self.api_client.api_name,
+            entity_label,
+            _load,
+            lang=lang,
+            type_hint=type_hint,
+            page=page,
+            variant=f"page_size={self.page_size}",
+            cache_if=lambda r: r is not None,
+        )
+        return result or []
+
+    def _search_single_page(self, entity_label: str, page: int, lang: str, type_hint: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
         """
         搜索指定页面
         
@@ -205,7 +286,7 @@ class PaginatedAPISearcher:
             type_hint: 类型提示
         
         Returns:
-            该页的候选列表
+            该页的候选列表；缺少配置或请求失败时返回 None（不写入缓存）
         """
         try:
             # 构建分页请求参数
@@ -218,13 +299,15 @@ class PaginatedAPISearcher:
             
             if not api_url or not api_key:
                 logger.warning(f"paginated_search_missing_config api={self.api_client.api_name}")
-                return []
+                return None
             
             # 根据API类型构建参数
             params = self._build_api_params(entity_label, page, api_key)
             
             # 发起请求
             raw_data = self.api_client._make_request(api_url, params)
+            if raw_data is None:
+                return None
             if not raw_data:
                 return []
             
@@ -240,7 +323,7 @@ class PaginatedAPISearcher:
             
         except Exception as e:
             logger.error(f"paginated_search_single_page_error api={self.api_client.api_name} page={page} error={e}")
-            return []
+            return None
     
     def _build_api_params(self, entity_label: str, page: int, api_key: str) -> Dict[str, Any]:
         """
@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Optional
 import os
 import re
 import time
+from functools import lru_cache
 from pathlib import Path
 try:
     import yaml  # 用于读取 settings.yaml
@@ -25,6 +26,7 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+@lru_cache(maxsize=1)
 def _load_wikidata_preferred() -> str:
     """
     从 config/settings.yaml 读取 Wikidata 首选实现：
@@ -34,6 +36,7 @@ def _load_wikidata_preferred() -> str:
         * "1" -> "lc"
         * "0" -> "api"
     返回值始终为 "lc" 或 "api"
+    结果在进程内缓存，避免每次检索都重新读取配置文件
     """
     # 默认优先 LC
     preferred = "lc"
@@ -73,11 +76,12 @@ def _load_wikidata_preferred() -> str:
 
     return preferred
 
-def search_wikidata(entity_label: str, lang: str = "zh", type_hint: Optional[str] = None) -> List[Dict[str, Any]]:
+def search_wikidata(entity_label: str, lang: str = "zh", type_hint: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
     """
     Wikidata 搜索（简化实现）：
     - 默认使用官方 wbsearchentities API
     - 若设置环境变量 WD_USE_LC=1，则使用 LangChain WikidataQueryRun
+    - 无结果返回空列表；依赖缺失或请求失败返回 None（上层据此区分，失败结果不缓存）
     """
     t0 = time.time()
     preferred = _load_wikidata_preferred()
@@ -141,14 +145,14 @@ def search_wikidata(entity_label: str, lang: str = "zh", type_hint: Optional[str
             
         except Exception as e:
             logger.warning(f"wikidata_search_failed label={entity_label} err={e}")
-            return []
+            return None
 
     # 使用官方 API 实现
     try:
         import httpx
     except Exception as e:
         logger.warning(f"httpx_import_failed err={e}")
-        return []
+        return None
 
     params = {
         "action": "wbsearchentities",
@@ -181,12 +185,12 @@ def search_wikidata(entity_label: str, lang: str = "zh", type_hint: Optional[str
             return results
     except Exception as e:
         logger.warning(f"wikidata_search_failed label={entity_label} err={e}")
-        return []
+        return None
 
 if __name__ == "__main__":
     # 简单测试入口：检索"欧阳予倩"
     query = "欧阳予倩"
-    results = search_wikidata(query, lang="en")
+    results = search_wikidata(query, lang="en") or []
     print("查询词：", query)
     print("返回数量：", len(results))
     for i, r in enumerate(results, 1):
@@ -15,11 +15,12 @@ except ImportError:
 
 logger = get_logger(__name__)
 
-def search_wikipedia(entity_label: str, lang: str = "zh", type_hint: Optional[str] = None) -> List[Dict[str, Any]]:
+def search_wikipedia(entity_label: str, lang: str = "zh", type_hint: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
     """
     Wikipedia 搜索（函数式）：
     - 使用 wikipediaapi（user_agent='HPD (wzjlxy@gmail.com)'）
     - 返回 title、canonicalurl、summary(<=1000) 与 _page（供上层写 MD），工具自身不进行任何文件写入。
+    - 页面不存在返回空列表；依赖缺失或请求失败返回 None（上层据此区分，失败结果不缓存）
     """
     try:
         import wikipediaapi  # noqa: F401
@@ -28,7 +29,7 @@ def search_wikipedia(entity_label: str, lang: str = "zh", type_hint: Optional[st
         logger.warning(f"wikipedia_import_failed err={e}")
         available = False
     if not available:
-        return []
+        return None
 
     t0 = time.time()
     try:
@@ -57,7 +58,7 @@ def search_wikipedia(entity_label: str, lang: str = "zh", type_hint: Optional[st
         return results
     except Exception as e:
         logger.warning(f"wikipedia_search_failed label={entity_label} err={e}")
-        return []
+        return None
 
 if __name__ == "__main__":
     # 可独立运行的测试入口：默认检索“上海戏剧工作社”，可通过命令行参数覆盖
@@ -70,7 +71,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     t0 = time.time()
-    results = search_wikipedia(args.query, lang=args.lang)
+    results = search_wikipedia(args.query, lang=args.lang) or []
     elapsed_ms = int((time.time() - t0) * 1000)
 
     # 打印总体信息
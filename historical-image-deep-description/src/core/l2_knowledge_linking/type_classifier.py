@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from ...utils.logger import get_logger
 from ...utils.llm_api import load_settings, invoke_model
+from ...utils.concurrency import RowScheduler
 
 logger = get_logger(__name__)
 
@@ -90,14 +91,14 @@ def classify_types(json_paths: Optional[List[str]] = None, settings: Optional[Di
     settings = settings or load_settings()
     out_dir = output_dir or settings.get("data", {}).get("outputs", {}).get("dir", DEFAULT_OUTPUT_DIR) or DEFAULT_OUTPUT_DIR
     targets = list(json_paths) if json_paths else _find_target_jsons(out_dir)
-    updated: List[str] = []
-    for path in targets:
+    # 各行级 JSON 相互独立，按文件并发分类
+    def _classify_file(path: str) -> Optional[str]:
         try:
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except Exception as e:
             logger.warning(f"读取JSON失败 path={path} err={e}")
-            continue
+            return None
 
         # 兼容两种结构：{row_id, entities} 或 {items: [...]}
         entities: Optional[List[Dict[str, Any]]] = None
@@ -109,7 +110,7 @@ def classify_types(json_paths: Optional[List[str]] = None, settings: Optional[Di
                 entities = data["items"]
         if entities is None:
             logger.warning(f"未识别的JSON结构，跳过 path={path}")
-            continue
+            return None
 
         changed = False
         for ent in entities:
@@ -132,10 +133,14 @@ def classify_types(json_paths: Optional[List[str]] = None, settings: Optional[Di
         if changed:
             try:
                 _atomic_write(path, data)
-                updated.append(path)
                 logger.info(f"实体类型已更新 path={path}")
+                return path
             except Exception as e:
                 logger.error(f"写回失败 path={path} err={e}")
         else:
             logger.info(f"无可更新实体类型 path={path}")
+        return None
+
+    results = RowScheduler.from_settings(settings, "l2").run(targets, _classify_file)
+    updated: List[str] = [p for p in results if p]
     return updated
\ No newline at end of file
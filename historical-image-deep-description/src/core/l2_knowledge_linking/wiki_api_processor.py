@@ -4,6 +4,8 @@ import re
 from typing import Any, Dict, List, Optional
 
 from ...utils.logger import get_logger
+from ...utils.concurrency import throttle
+from ...utils.lookup_cache import get_lookup_cache
 from .tools.registry import get_tool
 from .tools.common import sanitize_filename
 from .entity_matcher import judge_best_match
@@ -86,20 +88,34 @@ def process_wikipedia_entity(
         bool: 是否更新了实体数据
     """
     if not _should_skip("wikipedia", ent):
+        cache = get_lookup_cache(settings)
+
+        def _search(lang: str) -> List[Dict[str, Any]]:
+            # 缓存未命中时才按服务商限流（跨行共享）并发起请求；_page 对象不可序列化，不入缓存
+            def _load() -> Optional[List[Dict[str, Any]]]:
+                throttle("wikipedia", int(rate_limit.get("wikipedia_ms", 1000)))
+                found = wikipedia_search(label, lang=lang, type_hint=ent_type)
+                if found is None:
+                    # 检索失败：不缓存，下次重新请求
+                    return None
+                return [{k: v for k, v in c.items() if k != "_page"} for c in found]
+            return cache.fetch(
+                "wikipedia", label, _load, lang=lang, type_hint=ent_type, cache_if=lambda r: r is not None
+            ) or []
+
         try:
             # Wikipedia 语言选择：从配置读取，默认使用中文；若无候选则在 zh/en 间回退一次
             wp_lang_cfg = ((settings.get("tools") or {}).get("wikipedia") or {}).get("lang") or "zh"
-            wp_candidates = wikipedia_search(label, lang=wp_lang_cfg, type_hint=ent_type) or []
+            wp_candidates = _search(wp_lang_cfg)
             if not wp_candidates:
                 # 常见语言回退（提升命中率）：在 zh 与 en 之间切换
                 alt_lang = "en" if wp_lang_cfg == "zh" else "zh"
                 try:
-                    wp_candidates = wikipedia_search(label, lang=alt_lang, type_hint=ent_type) or []
+                    wp_candidates = _search(alt_lang)
                 except Exception:
                     # 回退失败则维持空候选
                     wp_candidates = wp_candidates or []
-            wp_candidates = wp_candidates[:top_k]
-            stripped = [{k: v for k, v in c.items() if k != "_page"} for c in wp_candidates]
+            stripped = wp_candidates[:top_k]
             judge = judge_best_match(
                 label=label,
                 ent_type=ent_type,
@@ -152,14 +168,6 @@ def process_wikipedia_entity(
                 "error": str(e),
             }
             return True
-        finally:
-            # 添加延迟（如果配置了）
-            delay = int(rate_limit.get("wikipedia_ms", 1000))
-            if delay > 0:
-                try:
-                    time.sleep(delay / 1000.0)
-                except Exception:
-                    pass
     return False
 
 
@@ -182,11 +190,18 @@ def process_wikidata_entity(
         bool: 是否更新了实体数据
     """
     if not _should_skip("wikidata", ent):
+        def _load() -> Optional[List[Dict[str, Any]]]:
+            # 缓存未命中时才按服务商限流（跨行共享）并发起请求；检索失败返回 None，不缓存
+            throttle("wikidata", int(rate_limit.get("wikidata_ms", 1000)))
+            return wikidata_search(label, lang="en", type_hint=ent_type)
+
         try:
             from .parsers.wikidata_llm_parser import format_candidates as wd_format_candidates
             from .parsers.wikidata_llm_parser import fallback_zero_candidates as wd_fallback
 
-            raw_candidates = wikidata_search(label, lang="en", type_hint=ent_type) or []
+            raw_candidates = get_lookup_cache(settings).fetch(
+                "wikidata", label, _load, lang="en", type_hint=ent_type, cache_if=lambda r: r is not None
+            ) or []
             raw_candidates = raw_candidates[:top_k]
             logger.info(f"wikidata_search_done label={label} type={ent_type} raw_count={len(raw_candidates)}")
             # 先进行候选格式化（JSON安全、限长）
@@ -298,12 +313,4 @@ def process_wikidata_entity(
                 "error": str(e),
             }
             return True
-        finally:
-            # 添加延迟（如果配置了）
-            delay = int(rate_limit.get("wikidata_ms", 1000))
-            if delay > 0:
-                try:
-                    time.sleep(delay / 1000.0)
-                except Exception:
-                    pass
     return False
\ No newline at end of file
@@ -1,12 +1,12 @@
 import requests
 import json
-import time
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from ...utils.logger import get_logger
 from ...utils.llm_api import _resolve_env
+from ...utils.concurrency import throttle
 
 logger = get_logger(__name__)
 
@@ -41,7 +41,6 @@ class DifyClient:
         self.base_url = base_url.rstrip("/")
         self.rate_limit_ms = rate_limit_ms
         self.timeout_seconds = timeout_seconds
-        self._last_request_time = 0
         
         logger.info(f"Dify客户端初始化 base_url={self.base_url} rate_limit_ms={rate_limit_ms} timeout_seconds={timeout_seconds}")
     
@@ -242,15 +241,5 @@ class DifyClient:
             )
     
     def _apply_rate_limit(self) -> None:
-        """应用速率限制"""
-        if self.rate_limit_ms <= 0:
-            return
-            
-        current_time = time.time() * 1000  # 转换为毫秒
-        elapsed = current_time - self._last_request_time
-        
-        if elapsed < self.rate_limit_ms:
-            sleep_time = (self.rate_limit_ms - elapsed) / 1000.0
-            time.sleep(sleep_time)
-        
-        self._last_request_time = time.time() * 1000
\ No newline at end of file
+        """应用速率限制（同一 Dify 服务的请求在各行/各线程间共享间隔）"""
+        throttle(f"dify:{self.base_url}", self.rate_limit_ms)
\ No newline at end of file
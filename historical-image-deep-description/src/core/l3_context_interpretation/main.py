@@ -9,6 +9,7 @@ from .web_search_processor import WebSearchProcessor
 from ...utils.logger import get_logger
 from ...utils.llm_api import load_settings
 from ...utils.excel_io import ExcelIO, ExcelConfig
+from ...utils.concurrency import RowScheduler
 from ..l2_knowledge_linking.task_builder import _safe_filename
 
 logger = get_logger(__name__)
@@ -352,8 +353,9 @@ def _process_by_excel_rows(settings: Dict[str, Any],
         )
     )
     
-    # 逐行处理
+    # 收集待处理行（编号、JSON 存在性与条数上限在主线程判定）
     processed = 0
+    pending: List[Tuple[int, Any, str, str]] = []
     for row_data in xio.iter_rows():
         # 确保row_data是正确的格式
         if isinstance(row_data, tuple) and len(row_data) == 2:
@@ -394,6 +396,12 @@ def _process_by_excel_rows(settings: Dict[str, Any],
             logger.warning(f"L3跳过处理（JSON文件不存在） id={raw_id} file={json_filename} row={row_idx}")
             continue
             
+        pending.append((row_idx, row_cells, raw_id, json_file_path))
+        processed += 1
+
+    def _process_row(item) -> None:
+        row_idx, row_cells, raw_id, json_file_path = item
+        json_filename = os.path.basename(json_file_path)
         logger.info(f"L3开始处理 id={raw_id} row={row_idx} file={json_filename}")
         
         # 从Excel行构建元数据上下文
@@ -403,8 +411,10 @@ def _process_by_excel_rows(settings: Dict[str, Any],
         _process_single_json_file(json_file_path, task_list, processor, enhanced_rag_processor, 
                                  enhanced_web_processor, web_search_processor, settings, metadata)
         
-        processed += 1
         logger.info(f"L3行处理完成 id={raw_id} row={row_idx}")
+
+    # 行级并发：各行对应独立的 JSON 文件
+    RowScheduler.from_settings(settings, "l3").run(pending, _process_row, describe=lambda item: item[2])
     
     logger.info(f"L3按行处理完成 total_processed={processed}")
 
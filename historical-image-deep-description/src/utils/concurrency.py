@@ -0,0 +1,151 @@
+"""
+行级并发调度与按服务商限流
+
+L0–L3 及深度分析均按 Excel 行（或编号）逐条处理，单行内的视觉/文本模型、Wikipedia/Wikidata、
+内部 API 调用都是阻塞 I/O。本模块提供各层共用的两件工具：
+- RowScheduler：线程池并发处理多行，workers=1 时退化为原有的顺序执行
+- RateLimiter：按服务商键控制相邻两次请求的最小间隔，跨线程共享，替代各处的固定 sleep
+
+配置（settings.yaml）::
+
+    concurrency:
+      workers: 4            # 全局默认并发行数
+      layers:               # 可选：按层覆盖
+        l2: 2
+      rate_limits_ms:       # 可选：覆盖各服务商的请求间隔
+        wikipedia: 1000
+      prefetch_workers: 8   # 后台 I/O 线程池大小（分页预取、别名检索）
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """按键（服务商）控制请求最小间隔，线程安全"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._overrides: Dict[str, int] = {}
+
+    def configure(self, intervals_ms: Optional[Dict[str, Any]]) -> None:
+        """设置各键的间隔覆盖值（毫秒）"""
+        with self._lock:
+            for key, ms in (intervals_ms or {}).items():
+                try:
+                    self._overrides[str(key)] = int(ms)
+                except (TypeError, ValueError):
+                    logger.warning(f"rate_limit_config_invalid key={key} value={ms}")
+
+    def acquire(self, key: str, interval_ms: int) -> None:
+        """
+        预约下一次请求时间并等待到该时刻。
+        同一键的请求起始时间至少相隔 interval_ms，多个线程按到达顺序依次排队。
+        """
+        with self._lock:
+            interval = self._overrides.get(key, interval_ms) or 0
+            if interval <= 0:
+                return
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(key, 0.0))
+            self._next_slot[key] = slot + interval / 1000.0
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _rate_limiter
+
+
+def throttle(key: str, interval_ms: int) -> None:
+    """在请求前调用：按服务商键限流（进程内共享）"""
+    _rate_limiter.acquire(key, interval_ms)
+
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str, settings: Optional[Dict[str, Any]] = None) -> ThreadPoolExecutor:
+    """
+    按用途共享的后台 I/O 线程池（如分页预取、别名检索），同一用途进程内只创建一个。
+    不同用途使用独立线程池：上层任务等待下层任务时不会占满同一个池而互相阻塞。
+    """
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            cfg = (settings or {}).get("concurrency", {}) or {}
+            workers = max(1, int(cfg.get("prefetch_workers", 8) or 1))
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            _executors[name] = executor
+            logger.info(f"io_executor_created name={name} workers={workers}")
+        return executor
+
+
+class RowScheduler:
+    """行级并发执行器"""
+
+    def __init__(self, workers: int = 1, name: str = "rows") -> None:
+        self.workers = max(1, int(workers or 1))
+        self.name = name
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], layer: str) -> "RowScheduler":
+        """
+        读取 settings['concurrency']：layers.<layer> 优先，其次 workers，缺省为 1（顺序执行）。
+        同时加载 rate_limits_ms 覆盖配置。
+        """
+        cfg = settings.get("concurrency", {}) or {}
+        _rate_limiter.configure(cfg.get("rate_limits_ms"))
+        workers = (cfg.get("layers", {}) or {}).get(layer, cfg.get("workers", 1))
+        return cls(workers=workers, name=layer)
+
+    def run(
+        self,
+        items: Iterable[T],
+        fn: Callable[[T], R],
+        *,
+        raise_errors: bool = False,
+        describe: Optional[Callable[[T], str]] = None,
+    ) -> List[Optional[R]]:
+        """
+        对每个条目执行 fn，结果按输入顺序返回。
+        单条失败默认记录错误并返回 None，不影响其他行；raise_errors=True 时抛出第一个异常。
+        """
+        items = list(items)
+        if not items:
+            return []
+        describe = describe or (lambda item: str(item))
+
+        def _call(item: T) -> Optional[R]:
+            try:
+                return fn(item)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.error(f"row_task_failed scheduler={self.name} item={describe(item)} err={e}")
+                return None
+
+        t0 = time.time()
+        if self.workers == 1 or len(items) == 1:
+            results = [_call(item) for item in items]
+        else:
+            logger.info(f"row_scheduler_start scheduler={self.name} workers={self.workers} items={len(items)}")
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{self.name}-row") as pool:
+                results = list(pool.map(_call, items))
+        elapsed_ms = int((time.time() - t0) * 1000)
+        logger.info(f"row_scheduler_done scheduler={self.name} workers={self.workers} items={len(items)} elapsed_ms={elapsed_ms}")
+        return results
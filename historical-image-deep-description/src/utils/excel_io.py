@@ -1,5 +1,6 @@
 import os
 import shutil
+import threading
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 
@@ -23,6 +24,8 @@ class ExcelIO:
             raise FileNotFoundError(f"Excel 文件不存在: {excel_path}，请先创建后再运行。")
         self.excel_path = excel_path
         self.config = config
+        # openpyxl 非线程安全（读取单元格也会创建 Cell），行级并发时所有读写经此锁串行
+        self._lock = threading.Lock()
         if self.config.create_backup:
             self._backup()
         self.wb = load_workbook(excel_path)
@@ -63,6 +66,10 @@ class ExcelIO:
         """
         确保指定的显示列名存在于首行表头中；若不存在则追加并返回列索引（1-based）。
         """
+        with self._lock:
+            return self._ensure_column(col_display_name)
+
+    def _ensure_column(self, col_display_name: str) -> int:
         col_idx = self.header_map.get(col_display_name)
         if col_idx:
             return col_idx
@@ -90,7 +97,8 @@ class ExcelIO:
             return None
         # 通过行号定位
         row_num = row_cells[0].row if row_cells else 1
-        v = self.ws.cell(row=row_num, column=col_idx).value
+        with self._lock:
+            v = self.ws.cell(row=row_num, column=col_idx).value
         if v is None:
             return None
         return str(v).strip()
@@ -100,11 +108,13 @@ class ExcelIO:
         写入指定列的值；若列不存在则自动新增到表头末尾后再写入。
         通过工作表坐标写入，避免 row_cells 不包含新增列的情况。
         """
-        col_idx = self.header_map.get(col_display_name)
-        if not col_idx:
-            col_idx = self.ensure_column(col_display_name)
-        row_num = row_cells[0].row if row_cells else self.ws.max_row
-        self.ws.cell(row=row_num, column=col_idx, value=value)
+        with self._lock:
+            col_idx = self.header_map.get(col_display_name)
+            if not col_idx:
+                col_idx = self._ensure_column(col_display_name)
+            row_num = row_cells[0].row if row_cells else self.ws.max_row
+            self.ws.cell(row=row_num, column=col_idx, value=value)
 
     def save(self) -> None:
-        self.wb.save(self.excel_path)
\ No newline at end of file
+        with self._lock:
+            self.wb.save(self.excel_path)
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+视觉调用前的图像预处理与载荷缓存
+
+档案扫描件多为数十 MB 的 TIFF/PNG，直接 base64 上传既慢又浪费带宽。
+本模块在调用视觉模型前统一处理图像：
+- 按最长边等比缩放到配置上限
+- 转码为 JPEG / WebP（去除 EXIF 等元数据）；16 位灰度先缩放到 8 位，带透明通道的图像先铺白底
+- 编码结果按 (文件内容哈希, 预设) 缓存到磁盘，长描述、替代文本及重复运行共用同一份字节
+
+未安装 Pillow、关闭预处理或图像无法正常转换时，退化为原始文件直传。
+"""
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+logger = get_logger(__name__)
+
+_FORMAT_MIME = {"jpeg": "image/jpeg", "webp": "image/webp"}
+_PIL_FORMAT = {"jpeg": "JPEG", "webp": "WEBP"}
+_HASH_CHUNK = 1024 * 1024
+# 高位深灰度模式：直接 convert 会把超过 255 的值截断，整幅图几乎全白
+_HIGH_BIT_MODES = ("I;16", "I;16L", "I;16B", "I;16N", "I", "F")
+_ALPHA_MODES = ("RGBA", "LA", "PA", "RGBa", "La")
+
+
+@dataclass
+class PreparedImage:
+    """预处理后的图像载荷"""
+    data: bytes
+    mime: str
+    original_bytes: int
+    cache_hit: bool = False
+
+    @cached_property
+    def base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _guess_mime(path: str) -> str:
+    mime, _ = mimetypes.guess_type(path)
+    return mime or "image/jpeg"
+
+
+def _to_8bit(img: "Image.Image") -> "Image.Image":
+    """16 位 / 32 位灰度缩放到 8 位：I;16 按 1/256 等比缩放，I/F 按实际取值范围拉伸"""
+    if img.mode.startswith("I;16"):
+        return img.convert("I").point(lambda v: v / 256).convert("L")
+    lo, hi = img.getextrema()
+    if hi <= lo:
+        return Image.new("L", img.size, 0 if hi <= 0 else 255)
+    scale = 255.0 / (hi - lo)
+    return img.point(lambda v: (v - lo) * scale).convert("L")
+
+
+def _to_encodable(img: "Image.Image") -> "Image.Image":
+    """转换为 JPEG / WebP 可直接保存的 RGB 或 L 模式"""
+    if img.mode in ("RGB", "L"):
+        return img
+    if img.mode in _HIGH_BIT_MODES:
+        return _to_8bit(img)
+    if img.mode in _ALPHA_MODES or (img.mode == "P" and "transparency" in img.info):
+        # 透明区域铺白底，避免转 RGB 后变成黑色
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+class ImagePreparer:
+    """图像预处理器（带磁盘缓存与字节统计）"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config or {}
+        self.enabled = bool(cfg.get("enabled", True))
+        self.max_edge = int(cfg.get("max_edge", 2048) or 0)
+        self.format = str(cfg.get("format", "jpeg")).lower()
+        if self.format not in _FORMAT_MIME:
+            logger.warning(f"不支持的图像输出格式 format={self.format}，改用 jpeg")
+            self.format = "jpeg"
+        self.quality = int(cfg.get("quality", 85))
+        self.cache_dir = cfg.get("cache_dir", "runtime/cache/image_payloads")
+
+        if self.enabled and Image is None:
+            logger.warning("未安装 Pillow，图像预处理已禁用，将直接上传原图")
+            self.enabled = False
+
+        self.stats = {"images": 0, "cache_hits": 0, "original_bytes": 0, "payload_bytes": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def preset(self) -> str:
+        """预设标识：参与缓存键，参数变化后自动失效"""
+        return f"{self.format}-e{self.max_edge}-q{self.quality}"
+
+    def prepare(self, path: str) -> PreparedImage:
+        """返回可直接发送给视觉模型的图像载荷"""
+        original_bytes = os.path.getsize(path)
+        if not self.enabled:
+            with open(path, "rb") as f:
+                prepared = PreparedImage(f.read(), _guess_mime(path), original_bytes)
+        else:
+            prepared = self._prepare_cached(path, original_bytes)
+
+        with self._stats_lock:
+            self.stats["images"] += 1
+            self.stats["cache_hits"] += int(prepared.cache_hit)
+            self.stats["original_bytes"] += original_bytes
+            self.stats["payload_bytes"] += len(prepared.data)
+        return prepared
+
+    def _prepare_cached(self, path: str, original_bytes: int) -> PreparedImage:
+        key = f"{_file_sha256(path)}.{self.preset}"
+        cache_path = os.path.join(self.cache_dir, f"{key}.{self.format}")
+        mime = _FORMAT_MIME[self.format]
+
+        if os.path.isfile(cache_path):
+            with open(cache_path, "rb") as f:
+                return PreparedImage(f.read(), mime, original_bytes, cache_hit=True)
+
+        try:
+            data = self._encode(path)
+        except Exception as e:
+            # 无法正常转换时按原逻辑直传原图（不写入缓存）
+            logger.warning(f"图像预处理失败，改为直传原图 path={path} err={e}")
+            with open(path, "rb") as f:
+                return PreparedImage(f.read(), _guess_mime(path), original_bytes)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 临时文件名区分线程，并发处理同一图片时互不覆盖
+        tmp_path = f"{cache_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+        logger.info(
+            f"图像预处理完成 path={path} preset={self.preset} "
+            f"bytes={original_bytes}->{len(data)}"
+        )
+        return PreparedImage(data, mime, original_bytes)
+
+    def _encode(self, path: str) -> bytes:
+        with Image.open(path) as img:
+            # 按 EXIF 方向校正后再丢弃元数据
+            img = ImageOps.exif_transpose(img)
+            # 先转换模式再缩放：高位深与调色板模式不支持 LANCZOS 重采样
+            img = _to_encodable(img)
+            if self.max_edge > 0 and max(img.size) > self.max_edge:
+                img.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+            buf = io.BytesIO()
+            # 不传 exif/icc_profile 参数，输出不携带元数据
+            img.save(buf, format=_PIL_FORMAT[self.format], quality=self.quality, optimize=True)
+            return buf.getvalue()
+
+    def log_summary(self) -> None:
+        """输出本次运行的字节节省统计"""
+        s = self.stats
+        if not s["images"]:
+            return
+        saved = s["original_bytes"] - s["payload_bytes"]
+        ratio = saved / s["original_bytes"] if s["original_bytes"] else 0.0
+        logger.info(
+            f"图像预处理统计 images={s['images']} cache_hits={s['cache_hits']} "
+            f"original_bytes={s['original_bytes']} payload_bytes={s['payload_bytes']} "
+            f"saved_bytes={saved} saved_ratio={ratio:.1%}"
+        )
@@ -5,9 +5,10 @@ import time
 from typing import Any, Dict, Optional, Tuple, List
 
 import yaml
-from openai import OpenAI
 
 from .logger import get_logger
+from .concurrency import throttle
+from .llm_client_pool import get_client_pool
 
 logger = get_logger(__name__)
 
@@ -53,11 +54,6 @@ def _sleep_delay(seconds: int) -> None:
         pass
 
 
-def _apply_rate_limit(ms: int) -> None:
-    if ms and ms > 0:
-        time.sleep(ms / 1000.0)
-
-
 def _truncate(s: str, max_len: int = 800) -> str:
     if s is None:
         return ""
@@ -146,19 +142,123 @@ def _as_chat_payload(model: str, messages: List[Dict[str, Any]], temperature: fl
     }
 
 
-def _build_openai_client(base_url: str, api_key: str, timeout: int = 90, max_retries: int = 0) -> OpenAI:
-    """
-    创建 OpenAI SDK 客户端。
-    说明：
-      - base_url 需以 / 结尾（上游已处理）
-      - 出于与外层自定义重试/主备切换配合，client 层 max_retries 默认为 0
-      - timeout: 请求超时时间（秒）
-    """
-    return OpenAI(
-        api_key=api_key,
-        base_url=base_url,
-        timeout=timeout,
-        max_retries=max_retries,
+def _resolve_task_params(
+    task_name: str,
+    settings: Dict[str, Any],
+    provider_type: Optional[str],
+    temperature: Optional[float],
+    top_p: Optional[float],
+) -> Tuple[str, float, float]:
+    """解析任务的 provider_type / temperature / top_p（调用层传入优先）"""
+    task_cfg = settings["tasks"][task_name]
+    # 确保provider_type不为None
+    provider_type = provider_type or task_cfg["provider_type"]
+    if not provider_type:
+        raise ValueError(f"task={task_name} missing provider_type")
+    
+    # 注意：模型名现在从 provider 配置中获取，不再从 task 配置中获取
+
+    # 使用配置参数（不强行改默认值，尊重 settings.yaml）
+    temperature = task_cfg.get("temperature", 0.7) if temperature is None else temperature
+    top_p = task_cfg.get("top_p", 1.0) if top_p is None else top_p
+    # 确保temperature和top_p不为None
+    if temperature is None:
+        temperature = 0.7
+    if top_p is None:
+        top_p = 1.0
+    return provider_type, temperature, top_p
+
+
+def _provider_attempt(
+    settings: Dict[str, Any],
+    provider_type: str,
+    use_secondary: bool,
+    request_timeout_seconds: Optional[int],
+) -> Tuple[str, str, str, int, str]:
+    """返回 (base_url, api_key, model, timeout_seconds, headers_hint)"""
+    base_url, api_key, actual_model = _choose_provider(settings, provider_type, use_secondary)
+
+    # 读取 provider 级的 timeout_seconds（支持 primary/secondary 独立配置）；调用层传入则优先
+    provider_cfg = settings.get("api_providers", {}).get(provider_type, {}).get("secondary" if use_secondary else "primary", {}) or {}
+    provider_timeout = int(provider_cfg.get("timeout_seconds", 60) or 60)
+    timeout_seconds = int(request_timeout_seconds) if request_timeout_seconds is not None else provider_timeout
+
+    headers_hint = (
+        f"base_url={base_url} provider_type={provider_type} use_secondary={use_secondary} "
+        f"model={actual_model} timeout={timeout_seconds}s"
+    )
+    return base_url, api_key, actual_model, timeout_seconds, headers_hint
+
+
+def _log_call_start(task_name: str, messages: list, settings: Dict[str, Any], headers_hint: str) -> None:
+    # 读取日志截断配置（提供默认值，避免配置缺失）
+    log_cfg = settings.get("logging", {}) or {}
+    sys_max = int(log_cfg.get("system_preview_max_len", 1000))
+    usr_max = int(log_cfg.get("user_preview_max_len", 300))
+
+    # 提取 system/user 文本与预览
+    system_full = _extract_system_text(messages)
+    user_full = _extract_user_text(messages)
+    system_preview = _truncate(system_full, sys_max)
+    user_preview = _truncate(user_full, usr_max)
+
+    logger.info(
+        f"llm_call_start task={task_name} {headers_hint} "
+        f"system_prompt_len={len(system_full)} system_prompt_preview={system_preview} "
+        f"user_prompt_len={len(user_full)} user_prompt_preview={user_preview}"
+    )
+
+
+def _completion_text(completion: Any) -> str:
+    """解析标准 OpenAI 返回，聚合各 choice 的 content"""
+    choices = getattr(completion, "choices", []) or []
+    contents: List[str] = []
+    for c in choices:
+        msg = getattr(c, "message", None) or {}
+        content = getattr(msg, "content", "") if hasattr(msg, "content") else msg.get("content", "")
+        if isinstance(content, list):
+            # 兜底：某些实现可能返回分片列表
+            joined = "".join([x.get("text", "") if isinstance(x, dict) else str(x) for x in content])
+            contents.append(joined)
+        else:
+            contents.append(content or "")
+    return "\n".join([x for x in contents if x])
+
+
+def _log_call_success(
+    task_name: str,
+    provider_type: str,
+    messages: list,
+    settings: Dict[str, Any],
+    headers_hint: str,
+    payload_str: str,
+    attempt: int,
+    max_retries: int,
+    call: Dict[str, Any],
+    result: str,
+) -> None:
+    duration_ms = call["duration_ms"]
+    pool_hint = get_client_pool().stats_hint(provider_type, task_name, call)
+
+    # 审计日志（截断）
+    user_preview_max_len = int(settings.get("logging", {}).get("user_preview_max_len", 300))
+    user_prompt_preview = _truncate(_extract_user_preview(messages), user_preview_max_len)
+    logger.info(
+        f"audit request task={task_name} {headers_hint} attempt={attempt}/{max_retries} "
+        f"duration_ms={duration_ms} {pool_hint} payload={payload_str} user_prompt_preview={user_prompt_preview}"
+    )
+
+    # 响应日志（含预览与长度），避免过长
+    rsp_max = int((settings.get("logging", {}) or {}).get("response_preview_max_len", 2000))
+    resp_preview = _truncate(result, rsp_max)
+    logger.info(
+        f"llm_call_success task={task_name} {headers_hint} "
+        f"duration_ms={duration_ms} {pool_hint} response_len={len(result)} response_preview={resp_preview}"
+    )
+
+    # 保留原有精简审计（兼容老日志检索）
+    logger.info(
+        f"audit response task={task_name} {headers_hint} ok=true len={len(result)}"
     )
 
 
@@ -176,117 +276,48 @@ def invoke_model(
 ) -> str:
     """
     调用 OpenAI 兼容 chat/completions（通过 OpenAI SDK），带主备切换与重试，并输出审计日志（无敏感内容）。
+    客户端按服务商从连接池复用，日志附带连接复用与耗时分位数。
     返回：字符串形式的模型输出（content 聚合）。
     """
     t0 = time.time()
-    task_cfg = settings["tasks"][task_name]
-    # 确保provider_type不为None
-    provider_type = provider_type or task_cfg["provider_type"]
-    if not provider_type:
-        raise ValueError(f"task={task_name} missing provider_type")
-    
-    # 注意：模型名现在从 provider 配置中获取，不再从 task 配置中获取
-    # endpoint 在 SDK 模式下不使用，保留读取以兼容现有配置结构
-    _ = endpoint or task_cfg.get("endpoint", "/chat/completions")
-
-    # 使用配置参数（不强行改默认值，尊重 settings.yaml）
-    temperature = task_cfg.get("temperature", 0.7) if temperature is None else temperature
-    top_p = task_cfg.get("top_p", 1.0) if top_p is None else top_p
-    # 确保temperature和top_p不为None
-    if temperature is None:
-        temperature = 0.7
-    if top_p is None:
-        top_p = 1.0
+    provider_type, temperature, top_p = _resolve_task_params(task_name, settings, provider_type, temperature, top_p)
 
     rate_limit_ms = settings.get("rate_limit_ms", 0)
     retry_policy = settings.get("retry_policy", {"max_retries": 3, "delay_seconds": 5})
     max_retries = int(retry_policy.get("max_retries", 3))
     delay_seconds = int(retry_policy.get("delay_seconds", 5))
+    pool = get_client_pool(settings)
 
     last_err: Optional[str] = None
 
     for use_secondary in (False, True):
-        base_url, api_key, actual_model = _choose_provider(settings, provider_type, use_secondary)
-
-        # 读取 provider 级的 timeout_seconds（支持 primary/secondary 独立配置）；调用层传入则优先
-        provider_cfg = settings.get("api_providers", {}).get(provider_type, {}).get("secondary" if use_secondary else "primary", {}) or {}
-        provider_timeout = int(provider_cfg.get("timeout_seconds", 60) or 60)
-        timeout_seconds = int(request_timeout_seconds) if request_timeout_seconds is not None else provider_timeout
-
-        headers_hint = (
-            f"base_url={base_url} provider_type={provider_type} use_secondary={use_secondary} "
-            f"model={actual_model} timeout={timeout_seconds}s"
+        base_url, api_key, actual_model, timeout_seconds, headers_hint = _provider_attempt(
+            settings, provider_type, use_secondary, request_timeout_seconds
         )
 
         # 使用实际模型名构建请求载荷
         payload = _as_chat_payload(actual_model, messages, float(temperature), float(top_p))
         payload_str = _truncate(json.dumps(payload, ensure_ascii=False))
 
-        # 构建 SDK 客户端（内部 max_retries=0，外层负责重试与切换）
-        client = _build_openai_client(base_url=base_url, api_key=api_key, timeout=timeout_seconds, max_retries=0)
-
-        # 读取日志截断配置（提供默认值，避免配置缺失）
-        log_cfg = settings.get("logging", {}) or {}
-        sys_max = int(log_cfg.get("system_preview_max_len", 1000))
-        usr_max = int(log_cfg.get("user_preview_max_len", 300))
-        rsp_max = int(log_cfg.get("response_preview_max_len", 2000))
-
-        # 提取 system/user 文本与预览
-        system_full = _extract_system_text(messages)
-        user_full = _extract_user_text(messages)
-        system_preview = _truncate(system_full, sys_max)
-        user_preview = _truncate(user_full, usr_max)
-
-        logger.info(
-            f"llm_call_start task={task_name} {headers_hint} "
-            f"system_prompt_len={len(system_full)} system_prompt_preview={system_preview} "
-            f"user_prompt_len={len(user_full)} user_prompt_preview={user_preview}"
-        )
+        # 复用连接池中的 SDK 客户端（内部 max_retries=0，外层负责重试与切换）
+        client = pool.get(base_url, api_key, timeout_seconds, max_retries=0)
+        _log_call_start(task_name, messages, settings, headers_hint)
 
         for attempt in range(1, max_retries + 1):
-            _apply_rate_limit(rate_limit_ms)
+            # 同一服务商的请求在各行/各线程间共享间隔
+            throttle(f"llm:{provider_type}", rate_limit_ms)
             try:
-                r0 = time.time()
-                completion = client.chat.completions.create(
-                    model=actual_model,
-                    messages=messages,
-                    temperature=temperature,
-                    top_p=top_p,
-                )
-                duration_ms = int((time.time() - r0) * 1000)
-
-                # 审计日志（截断）
-                user_preview_max_len = int(settings.get("logging", {}).get("user_preview_max_len", 300))
-                user_prompt_preview = _truncate(_extract_user_preview(messages), user_preview_max_len)
-                logger.info(
-                    f"audit request task={task_name} {headers_hint} attempt={attempt}/{max_retries} "
-                    f"duration_ms={duration_ms} payload={payload_str} user_prompt_preview={user_prompt_preview}"
-                )
-
-                # 解析标准 OpenAI 返回
-                choices = getattr(completion, "choices", []) or []
-                contents: List[str] = []
-                for c in choices:
-                    msg = getattr(c, "message", None) or {}
-                    content = getattr(msg, "content", "") if hasattr(msg, "content") else msg.get("content", "")
-                    if isinstance(content, list):
-                        # 兜底：某些实现可能返回分片列表
-                        joined = "".join([x.get("text", "") if isinstance(x, dict) else str(x) for x in content])
-                        contents.append(joined)
-                    else:
-                        contents.append(content or "")
-                result = "\n".join([x for x in contents if x])
-
-                # 响应日志（含预览与长度），避免过长
-                resp_preview = _truncate(result, rsp_max)
-                logger.info(
-                    f"llm_call_success task={task_name} {headers_hint} "
-                    f"duration_ms={duration_ms} response_len={len(result)} response_preview={resp_preview}"
-                )
-
-                # 保留原有精简审计（兼容老日志检索）
-                logger.info(
-                    f"audit response task={task_name} {headers_hint} ok=true len={len(result)}"
+                with pool.track(provider_type, task_name) as call:
+                    completion = client.chat.completions.create(
+                        model=actual_model,
+                        messages=messages,
+                        temperature=temperature,
+                        top_p=top_p,
+                    )
+                result = _completion_text(completion)
+                _log_call_success(
+                    task_name, provider_type, messages, settings, headers_hint,
+                    payload_str, attempt, max_retries, call, result,
                 )
                 return result
             except Exception as e:
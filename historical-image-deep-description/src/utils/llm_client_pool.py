@@ -0,0 +1,197 @@
+"""
+OpenAI 兼容客户端复用池
+
+invoke_model 每次调用都新建 OpenAI 客户端，意味着每次都新建 httpx 连接池并重新握手 TLS。
+本模块按 (base_url, api_key, timeout) 缓存客户端：
+- 客户端进程内共享
+- 启用 HTTP keep-alive；安装了 h2 时启用 HTTP/2
+- 通过 httpcore 的 trace 扩展判断每次请求是否新建了 TCP 连接，
+  按 (provider_type, task) 统计连接复用率与耗时分位数，附加到调用日志中
+
+配置（settings.yaml，可选）::
+
+    http_client:
+      http2: true
+      max_connections: 20
+      max_keepalive_connections: 10
+      keepalive_expiry: 60
+"""
+import importlib.util
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import httpx
+from openai import OpenAI
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_LATENCY_WINDOW = 1000
+
+# 当前调用的连接状态（由 httpcore trace 回调写入）
+_current_call: ContextVar[Optional[Dict[str, Any]]] = ContextVar("llm_current_call", default=None)
+
+
+def _mark_trace_event(event_name: str) -> None:
+    state = _current_call.get()
+    if state is not None and event_name.startswith("connection.connect_tcp."):
+        state["new_connection"] = True
+
+
+def _sync_trace(event_name: str, info: Dict[str, Any]) -> None:
+    _mark_trace_event(event_name)
+
+
+def _on_request(request: httpx.Request) -> None:
+    request.extensions["trace"] = _sync_trace
+
+
+def _percentile(sorted_values, pct: float) -> int:
+    if not sorted_values:
+        return 0
+    # 最近秩法
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return int(sorted_values[index])
+
+
+class _CallStats:
+    """单个 (provider_type, task) 的调用统计"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.new_connections = 0
+        self.latencies_ms: Deque[int] = deque(maxlen=_LATENCY_WINDOW)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+        reused = self.calls - self.new_connections
+        return {
+            "calls": self.calls,
+            "conn_reuse_rate": round(reused / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": _percentile(ordered, 50),
+            "p90_ms": _percentile(ordered, 90),
+            "p99_ms": _percentile(ordered, 99),
+        }
+
+
+class LLMClientPool:
+    """客户端注册表与调用统计"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str, float], OpenAI] = {}
+        self._stats: Dict[Tuple[str, str], _CallStats] = {}
+        self.http2 = _HTTP2_AVAILABLE
+        self.max_connections = 20
+        self.max_keepalive_connections = 10
+        self.keepalive_expiry = 60.0
+
+    def configure(self, cfg: Optional[Dict[str, Any]]) -> None:
+        """读取 settings['http_client']；只影响此后新建的客户端"""
+        cfg = cfg or {}
+        want_http2 = bool(cfg.get("http2", True))
+        if want_http2 and not _HTTP2_AVAILABLE:
+            logger.info("llm_client_pool_http2_unavailable reason=h2_not_installed fallback=http1.1")
+        self.http2 = want_http2 and _HTTP2_AVAILABLE
+        self.max_connections = int(cfg.get("max_connections", self.max_connections))
+        self.max_keepalive_connections = int(cfg.get("max_keepalive_connections", self.max_keepalive_connections))
+        self.keepalive_expiry = float(cfg.get("keepalive_expiry", self.keepalive_expiry))
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def get(self, base_url: str, api_key: str, timeout: float, max_retries: int = 0) -> OpenAI:
+        """获取（或创建）同步客户端；外层负责重试，SDK 层 max_retries 默认为 0"""
+        key = (base_url, api_key, float(timeout))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                http_client = httpx.Client(
+                    timeout=timeout,
+                    limits=self._limits(),
+                    http2=self.http2,
+                    event_hooks={"request": [_on_request]},
+                )
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    http_client=http_client,
+                )
+                self._clients[key] = client
+                logger.info(f"llm_client_created base_url={base_url} timeout={timeout}s http2={self.http2} mode=sync")
+            return client
+
+    def _record(self, provider_type: str, task_name: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            stats = self._stats.setdefault((provider_type, task_name), _CallStats())
+            stats.calls += 1
+            stats.new_connections += int(state["new_connection"])
+            stats.latencies_ms.append(state["duration_ms"])
+
+    @contextmanager
+    def track(self, provider_type: str, task_name: str):
+        """
+        包裹一次请求：yield 的字典在退出时包含 duration_ms 与 new_connection。
+        只统计成功的请求（异常时不计入分位数）。
+        """
+        state: Dict[str, Any] = {"new_connection": False, "duration_ms": 0}
+        token = _current_call.set(state)
+        r0 = time.time()
+        try:
+            yield state
+            state["duration_ms"] = int((time.time() - r0) * 1000)
+            self._record(provider_type, task_name, state)
+        finally:
+            _current_call.reset(token)
+
+    def stats_hint(self, provider_type: str, task_name: str, state: Dict[str, Any]) -> str:
+        """追加到调用日志的键值片段"""
+        with self._lock:
+            stats = self._stats.get((provider_type, task_name))
+            summary = stats.summary() if stats else _CallStats().summary()
+        return (
+            f"conn_reused={str(not state['new_connection']).lower()} "
+            f"conn_reuse_rate={summary['conn_reuse_rate']} calls={summary['calls']} "
+            f"p50_ms={summary['p50_ms']} p90_ms={summary['p90_ms']} p99_ms={summary['p99_ms']}"
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """按 "provider_type/task" 返回统计快照"""
+        with self._lock:
+            return {f"{p}/{t}": s.summary() for (p, t), s in self._stats.items()}
+
+    def log_summary(self) -> None:
+        for key, summary in self.stats().items():
+            logger.info(
+                f"llm_client_pool_stats key={key} calls={summary['calls']} conn_reuse_rate={summary['conn_reuse_rate']} "
+                f"p50_ms={summary['p50_ms']} p90_ms={summary['p90_ms']} p99_ms={summary['p99_ms']}"
+            )
+
+
+_pool = LLMClientPool()
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def get_client_pool(settings: Optional[Dict[str, Any]] = None) -> LLMClientPool:
+    """获取进程内共享的客户端池；首次传入 settings 时读取 http_client 配置"""
+    global _configured
+    if settings is not None and not _configured:
+        with _configure_lock:
+            if not _configured:
+                _pool.configure(settings.get("http_client"))
+                _configured = True
+    return _pool
@@ -0,0 +1,248 @@
+"""
+L2 实体检索结果的本地持久缓存
+
+同一批人物、地点、机构会出现在数百张照片中，L2 每遇到一次就重新请求 Wikipedia、Wikidata、
+内部 API，并对同样的候选再做一次 LLM 判定。本模块将这些结果存入本地 SQLite：
+- 键为 (source, label, lang, type_hint, page, variant)；variant 用于区分分页大小、判定上下文等
+- 候选列表与 LLM 判定共用同一张表，source 区分，如 wikipedia、person_api、judge:wikidata
+- 按来源设置 TTL；接口确认的空结果使用更短的 negative TTL；请求失败时 loader 返回 None，不写入缓存
+- 支持按来源/标签失效、清理过期条目，命令行见本文件末尾
+
+配置（settings.yaml）::
+
+    lookup_cache:
+      enabled: true
+      path: runtime/cache/l2_lookup.sqlite3
+      ttl_hours: 720
+      negative_ttl_hours: 24
+      source_ttl_hours: {}
+      refresh: false
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_MISS = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lookups (
+    source     TEXT NOT NULL,
+    label      TEXT NOT NULL,
+    lang       TEXT NOT NULL,
+    type_hint  TEXT NOT NULL,
+    page       INTEGER NOT NULL,
+    variant    TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (source, label, lang, type_hint, page, variant)
+)
+"""
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == [] or value == {}
+
+
+class LookupCache:
+    """检索结果缓存（SQLite，线程安全）"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        cfg = config or {}
+        self.enabled = bool(cfg.get("enabled", True))
+        self.path = cfg.get("path", "runtime/cache/l2_lookup.sqlite3")
+        self.ttl_hours = float(cfg.get("ttl_hours", 720))
+        self.negative_ttl_hours = float(cfg.get("negative_ttl_hours", 24))
+        self.source_ttl_hours: Dict[str, float] = {
+            str(k): float(v) for k, v in (cfg.get("source_ttl_hours") or {}).items()
+        }
+        # refresh=true：不读取已有条目，但仍写入新结果（用于强制刷新）
+        self.refresh = bool(cfg.get("refresh", False))
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+        if self.enabled:
+            try:
+                self._connect()
+            except Exception as e:
+                logger.warning(f"lookup_cache_open_failed path={self.path} err={e}")
+                self.enabled = False
+
+    def _connect(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+        self._conn = conn
+
+    @staticmethod
+    def _key(source: str, label: str, lang: Optional[str], type_hint: Optional[str],
+             page: int, variant: str) -> Tuple[str, str, str, str, int, str]:
+        return (source, (label or "").strip(), lang or "", type_hint or "", int(page or 0), variant or "")
+
+    def _ttl_seconds(self, source: str, value: Any) -> float:
+        if _is_empty(value):
+            hours = self.negative_ttl_hours
+        else:
+            hours = self.source_ttl_hours.get(source, self.ttl_hours)
+        return hours * 3600.0
+
+    def get(self, source: str, label: str, *, lang: Optional[str] = None, type_hint: Optional[str] = None,
+            page: int = 0, variant: str = "") -> Any:
+        """命中返回缓存值，未命中（或已过期、refresh 模式）返回 _MISS"""
+        if not self.enabled or self.refresh:
+            return _MISS
+        key = self._key(source, label, lang, type_hint, page, variant)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM lookups WHERE source=? AND label=? AND lang=? "
+                "AND type_hint=? AND page=? AND variant=?",
+                key,
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return _MISS
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return _MISS
+
+    def set(self, source: str, label: str, value: Any, *, lang: Optional[str] = None,
+            type_hint: Optional[str] = None, page: int = 0, variant: str = "") -> None:
+        if not self.enabled:
+            return
+        key = self._key(source, label, lang, type_hint, page, variant)
+        try:
+            payload = json.dumps(value, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"lookup_cache_unserializable source={source} label={label} err={e}")
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (payload, now, now + self._ttl_seconds(source, value)),
+            )
+            self._conn.commit()
+
+    def fetch(
+        self,
+        source: str,
+        label: str,
+        loader: Callable[[], Any],
+        *,
+        lang: Optional[str] = None,
+        type_hint: Optional[str] = None,
+        page: int = 0,
+        variant: str = "",
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        读取缓存，未命中时调用 loader 并写入。
+        loader 内负责限流与网络请求，命中时不会被调用；cache_if 返回 False 的结果不写入（如异常兜底值）。
+        """
+        cached = self.get(source, label, lang=lang, type_hint=type_hint, page=page, variant=variant)
+        if cached is not _MISS:
+            self.hits[source] += 1
+            logger.debug(f"lookup_cache_hit source={source} label={label} lang={lang} type={type_hint} page={page}")
+            return cached
+        self.misses[source] += 1
+        value = loader()
+        if cache_if is None or cache_if(value):
+            self.set(source, label, value, lang=lang, type_hint=type_hint, page=page, variant=variant)
+        return value
+
+    def invalidate(self, source: Optional[str] = None, label: Optional[str] = None) -> int:
+        """按来源和/或标签删除条目；均不指定时清空。返回删除条数"""
+        if not self.enabled:
+            return 0
+        clauses, params = [], []
+        if source:
+            clauses.append("source=?")
+            params.append(source)
+        if label:
+            clauses.append("label=?")
+            params.append(label.strip())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            deleted = self._conn.execute(f"DELETE FROM lookups{where}", params).rowcount
+            self._conn.commit()
+        logger.info(f"lookup_cache_invalidated source={source} label={label} deleted={deleted}")
+        return deleted
+
+    def purge_expired(self) -> int:
+        if not self.enabled:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM lookups WHERE expires_at < ?", (time.time(),)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def entry_counts(self) -> Dict[str, int]:
+        if not self.enabled:
+            return {}
+        with self._lock:
+            rows = self._conn.execute("SELECT source, COUNT(*) FROM lookups GROUP BY source").fetchall()
+        return {source: count for source, count in rows}
+
+    def log_summary(self) -> None:
+        """输出本次运行各来源的命中情况"""
+        for source in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits[source], self.misses[source]
+            logger.info(
+                f"lookup_cache_stats source={source} hits={hits} misses={misses} "
+                f"hit_rate={hits / (hits + misses):.1%}"
+            )
+
+
+_cache: Optional[LookupCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_lookup_cache(settings: Optional[Dict[str, Any]] = None) -> LookupCache:
+    """获取进程内共享的缓存实例；首次调用时读取 settings['lookup_cache']"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LookupCache((settings or {}).get("lookup_cache"))
+    return _cache
+
+
+if __name__ == "__main__":
+    # 缓存维护入口：python -m src.utils.lookup_cache --stats / --purge-expired / --invalidate SOURCE [--label X]
+    import argparse
+
+    from .llm_api import load_settings
+
+    parser = argparse.ArgumentParser(description="L2 检索缓存维护")
+    parser.add_argument("--settings", default="config/settings.yaml", help="配置文件路径")
+    parser.add_argument("--stats", action="store_true", help="按来源统计条目数")
+    parser.add_argument("--purge-expired", action="store_true", help="删除已过期条目")
+    parser.add_argument("--invalidate", metavar="SOURCE", help="删除指定来源的条目（ALL 表示全部）")
+    parser.add_argument("--label", help="配合 --invalidate，仅删除指定标签")
+    args = parser.parse_args()
+
+    cache = get_lookup_cache(load_settings(args.settings))
+    if args.purge_expired:
+        print(f"已删除过期条目：{cache.purge_expired()}")
+    if args.invalidate:
+        source = None if args.invalidate.upper() == "ALL" else args.invalidate
+        print(f"已删除条目：{cache.invalidate(source, args.label)}")
+    if args.stats or not (args.purge_expired or args.invalidate):
+        for source, count in sorted(cache.entry_counts().items()):
+            print(f"{source}: {count}")
@@ -3,26 +3,79 @@
 """
 FastAPI 图书检索接口。
 uvicorn scripts.api.book_retrieval_api:app --reload
+python -m scripts.api.book_retrieval_api --workers 4 --port 8000
+
+检索为同步阻塞调用，统一放到有界线程池中执行，事件循环只负责调度；
+多进程部署时每个进程各自加载检索器，共享只读的 ChromaDB 目录。
 """
 
+import argparse
+import asyncio
+import threading
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field, model_validator
 
-from scripts.api.services import RetrieverService
+from scripts.api.services import BlockingRequestExecutor, RequestTimeoutError, RetrieverService
+from scripts.api.services.retriever_service import DEFAULT_CONFIG_PATH
+from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 服务与执行器在首次请求时创建（每个 worker 进程各一份）
+service: Optional[RetrieverService] = None
+executor: Optional[BlockingRequestExecutor] = None
+_init_lock = threading.Lock()
+
+
+def _load_api_config() -> Dict[str, Any]:
+    return ConfigManager(DEFAULT_CONFIG_PATH).get("api", {}) or {}
+
+
+def get_service() -> RetrieverService:
+    """获取（必要时创建）检索服务。"""
+    global service
+    if service is None:
+        with _init_lock:
+            if service is None:
+                service = RetrieverService()
+    return service
+
+
+def get_executor() -> BlockingRequestExecutor:
+    """获取（必要时创建）请求执行器。"""
+    global executor
+    if executor is None:
+        with _init_lock:
+            if executor is None:
+                api_config = _load_api_config()
+                executor = BlockingRequestExecutor(
+                    max_workers=api_config.get("max_workers", 8),
+                    request_timeout=api_config.get("request_timeout", 60),
+                    coalesce=api_config.get("coalesce_requests", True),
+                )
+    return executor
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """启动时在线程中预热检索服务，退出时关闭线程池。"""
+    await asyncio.to_thread(get_service)
+    yield
+    if executor is not None:
+        executor.shutdown()
+
+
 app = FastAPI(
     title="图书检索 API",
     version="1.0.0",
     description="封装文本相似度与多子查询检索能力，供本地应用调用。",
+    lifespan=lifespan,
 )
 
-service = RetrieverService()
-
 
 class BaseSearchRequest(BaseModel):
     """通用请求字段。"""
@@ -72,7 +125,15 @@ async def text_search(request: TextSearchRequest) -> Dict[str, Any]:
     """文本相似度检索端点。"""
     try:
         logger.info("收到文本检索请求: top_k=%s", request.top_k)
-        return service.text_search(**request.model_dump())
+        payload = request.model_dump()
+        return await get_executor().run(
+            "text_search",
+            get_service().text_search,
+            payload,
+            coalesce=not request.save_to_file,
+        )
+    except RequestTimeoutError as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pylint: disable=broad-except
@@ -89,9 +150,40 @@ async def multi_query(request: MultiQueryRequest) -> Dict[str, Any]:
             request.per_query_top_k,
             request.final_top_k,
         )
-        return service.multi_query_search(**request.model_dump())
+        payload = request.model_dump()
+        return await get_executor().run(
+            "multi_query",
+            get_service().multi_query_search,
+            payload,
+            coalesce=not request.save_to_file,
+        )
+    except RequestTimeoutError as exc:
+        raise HTTPException(status_code=504, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pylint: disable=broad-except
         logger.error("多查询检索失败: %s", exc)
         raise HTTPException(status_code=500, detail="检索失败，请稍后再试") from exc
+
+
+def main() -> None:
+    """以多进程方式启动服务。"""
+    import uvicorn
+
+    api_config = _load_api_config()
+    parser = argparse.ArgumentParser(description="图书检索 API 服务")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=api_config.get("workers", 1))
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "scripts.api.book_retrieval_api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
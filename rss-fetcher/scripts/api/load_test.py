@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+图书检索 API 压测脚本，输出 p50/p90/p99 延迟与吞吐。
+
+使用前请先启动 API 服务：
+    python -m scripts.api.book_retrieval_api --workers 4 --port 8000
+
+示例：
+    python -m scripts.api.load_test --requests 200 --concurrency 20
+    python -m scripts.api.load_test --endpoint multi-query --markdown-file runtime/outputs/report.md
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_QUERY_FILE = "scripts/query-samples.txt"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩法计算百分位数。"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def load_payloads(args: argparse.Namespace) -> List[Dict]:
+    """根据端点构建请求体列表（循环使用）。"""
+    if args.endpoint == "multi-query":
+        if not args.markdown_file:
+            raise SystemExit("multi-query 压测需要 --markdown-file")
+        text = Path(args.markdown_file).read_text(encoding="utf-8")
+        return [{"markdown_text": text, "final_top_k": args.top_k}]
+
+    lines = [
+        line.strip()
+        for line in Path(args.query_file).read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    if not lines:
+        raise SystemExit(f"查询文件为空: {args.query_file}")
+    return [{"query": line, "top_k": args.top_k} for line in lines]
+
+
+async def run_load_test(
+    base_url: str,
+    endpoint: str,
+    payloads: List[Dict],
+    total: int,
+    concurrency: int,
+    timeout: float,
+) -> Dict:
+    """并发发送请求并统计延迟。"""
+    url = f"{base_url.rstrip('/')}/api/books/{endpoint}"
+    latencies: List[float] = []
+    status_counts: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for index in counter:
+            payload = payloads[index % len(payloads)]
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+                status = str(response.status_code)
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            latencies.append(time.perf_counter() - start)
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+        "status_counts": status_counts,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="图书检索 API 压测")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", choices=["text-search", "multi-query"], default="text-search")
+    parser.add_argument("--requests", type=int, default=100, help="请求总数")
+    parser.add_argument("--concurrency", type=int, default=10, help="并发连接数")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0, help="客户端超时(秒)")
+    parser.add_argument("--query-file", default=DEFAULT_QUERY_FILE, help="text-search 查询文本文件，每行一条")
+    parser.add_argument("--markdown-file", default=None, help="multi-query 使用的 Markdown 文件")
+    args = parser.parse_args(argv)
+
+    payloads = load_payloads(args)
+    report = asyncio.run(
+        run_load_test(
+            base_url=args.base_url,
+            endpoint=args.endpoint,
+            payloads=payloads,
+            total=args.requests,
+            concurrency=max(1, args.concurrency),
+            timeout=args.timeout,
+        )
+    )
+
+    print("=" * 60)
+    print(f"端点: {args.endpoint} | 请求数: {report['requests']} | 并发: {report['concurrency']}")
+    print(f"耗时: {report['elapsed_s']}s | 吞吐: {report['throughput_rps']} req/s")
+    print(f"延迟: p50={report['p50_ms']}ms p90={report['p90_ms']}ms p99={report['p99_ms']}ms max={report['max_ms']}ms")
+    print(f"状态码: {report['status_counts']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
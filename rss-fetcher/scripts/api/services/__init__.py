@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 """检索服务模块导出。"""
 
+from .request_executor import BlockingRequestExecutor, RequestTimeoutError
 from .retriever_service import RetrieverService
 
-__all__ = ["RetrieverService"]
-
+__all__ = ["BlockingRequestExecutor", "RequestTimeoutError", "RetrieverService"]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""将阻塞的检索调用移出事件循环：有界线程池 + 超时 + 相同请求合并。"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestTimeoutError(Exception):
+    """请求在限定时间内未完成。"""
+
+
+class BlockingRequestExecutor:
+    """在有界线程池中执行同步检索，并合并相同的在途请求。"""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        request_timeout: Optional[float] = 60.0,
+        coalesce: bool = True,
+    ) -> None:
+        """
+        初始化执行器。
+
+        Args:
+            max_workers: 线程池大小（同时执行的检索数上限）。
+            request_timeout: 单请求超时秒数，None 或 <=0 表示不限。
+            coalesce: 是否合并参数完全相同的在途请求。
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.request_timeout = request_timeout if request_timeout and request_timeout > 0 else None
+        self.coalesce = coalesce
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="book-retrieval"
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced_count = 0
+
+    async def run(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        coalesce: bool = True,
+    ) -> Any:
+        """
+        在线程池中执行 fn(**kwargs)。
+
+        Args:
+            name: 请求类型，用于构造合并键与日志。
+            fn: 同步函数。
+            kwargs: 调用参数（需可 JSON 序列化才会参与合并）。
+            coalesce: 本次请求是否允许合并（有副作用的请求应关闭）。
+
+        Raises:
+            RequestTimeoutError: 超时。
+        """
+        loop = asyncio.get_running_loop()
+        key = self._make_key(name, kwargs) if (self.coalesce and coalesce) else None
+
+        future = self._in_flight.get(key) if key else None
+        if future is not None:
+            self.coalesced_count += 1
+            logger.info("合并相同的在途请求: type=%s", name)
+        else:
+            future = loop.run_in_executor(self._executor, partial(fn, **kwargs))
+            if key:
+                self._in_flight[key] = future
+                future.add_done_callback(lambda _f, k=key: self._in_flight.pop(k, None))
+
+        try:
+            # shield：单个调用方超时不取消其他合并方共享的结果
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.request_timeout)
+        except asyncio.TimeoutError as exc:
+            # 线程无法强制中止，后台任务会继续执行到结束
+            logger.warning("请求超时: type=%s, timeout=%ss", name, self.request_timeout)
+            raise RequestTimeoutError(f"请求超过 {self.request_timeout}s 未完成") from exc
+
+    @staticmethod
+    def _make_key(name: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        try:
+            return name + ":" + json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+
+    def shutdown(self) -> None:
+        """关闭线程池（不等待在途任务）。"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+StorageManager 去重性能基准
+
+对比逐条扫描（改造前）与哈希索引（ArticleDedupIndex）在不同存量规模下的查重耗时。
+逐条扫描在大规模下只抽样少量新文章计时，再按单篇耗时外推到整批。
+
+用法:
+    python scripts/benchmark_storage_dedup.py
+    python scripts/benchmark_storage_dedup.py --sizes 10000 100000 1000000 --new 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.storage import ArticleDedupIndex  # noqa: E402
+
+
+def make_articles(count: int, prefix: str) -> List[Dict]:
+    """生成测试文章（约 1/3 无 URL，走 title+published_date 判重）"""
+    articles = []
+    for i in range(count):
+        articles.append({
+            "id": f"{prefix}{i}",
+            "link": f"https://example.com/{prefix}/{i}" if i % 3 else "",
+            "title": f"{prefix} 文章标题 {i}",
+            "published_date": f"2025-01-{i % 28 + 1:02d}",
+        })
+    return articles
+
+
+def linear_is_duplicate(new_article: Dict, existing_articles: List[Dict]) -> bool:
+    """改造前的逐条扫描判重"""
+    new_id = str(new_article.get("id", "") or "").strip()
+    if new_id:
+        for existing in existing_articles:
+            if str(existing.get("id", "") or "").strip() == new_id:
+                return True
+    new_link = str(new_article.get("link", "") or "").strip()
+    if new_link:
+        for existing in existing_articles:
+            if str(existing.get("link", "") or "").strip() == new_link:
+                return True
+        return False
+    new_key = f"{str(new_article.get('title', '') or '').strip()}_{str(new_article.get('published_date', '') or '')}"
+    for existing in existing_articles:
+        if f"{str(existing.get('title', '') or '').strip()}_{str(existing.get('published_date', '') or '')}" == new_key:
+            return True
+    return False
+
+
+def bench(size: int, new_count: int, linear_sample: int) -> Dict:
+    existing = make_articles(size, "old")
+    # 一半新文章与存量重复
+    incoming = make_articles(new_count // 2, "old") + make_articles(new_count - new_count // 2, "new")
+
+    start = time.perf_counter()
+    index = ArticleDedupIndex(existing)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_result = []
+    for article in incoming:
+        duplicate = index.contains(article)
+        indexed_result.append(duplicate)
+        if not duplicate:
+            index.add(article)
+    lookup_s = time.perf_counter() - start
+
+    sample = incoming[:: max(1, len(incoming) // linear_sample)][:linear_sample]
+    start = time.perf_counter()
+    for article in sample:
+        linear_is_duplicate(article, existing)
+    linear_per_article = (time.perf_counter() - start) / max(1, len(sample))
+
+    return {
+        "existing": size,
+        "new": new_count,
+        "index_build_ms": build_s * 1000,
+        "index_lookup_ms": lookup_s * 1000,
+        "linear_est_ms": linear_per_article * new_count * 1000,
+        "duplicates": sum(indexed_result),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StorageManager 去重基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--new", type=int, default=500, help="每次保存的新文章数")
+    parser.add_argument("--linear-sample", type=int, default=20, help="逐条扫描抽样篇数")
+    args = parser.parse_args()
+
+    print(f"{'存量':>10} {'新增':>6} {'索引构建(ms)':>14} {'索引查重(ms)':>14} {'逐条扫描估算(ms)':>18} {'加速比':>10}")
+    for size in args.sizes:
+        r = bench(size, args.new, args.linear_sample)
+        indexed_total = r["index_build_ms"] + r["index_lookup_ms"]
+        speedup = r["linear_est_ms"] / indexed_total if indexed_total else float("inf")
+        print(
+            f"{r['existing']:>10} {r['new']:>6} {r['index_build_ms']:>14.1f} {r['index_lookup_ms']:>14.2f} "
+            f"{r['linear_est_ms']:>18.1f} {speedup:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
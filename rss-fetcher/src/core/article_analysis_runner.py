@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 
 from src.core.analysis.analyst import ArticleAnalyst
 from src.core.storage import StorageManager
+from src.utils.llm.executor import map_ordered
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +26,7 @@ class ArticleAnalysisRunner:
         storage: StorageManager,
         analyst: Optional[ArticleAnalyst] = None,
         max_attempts: int = 2,
+        concurrency: int = 1,
     ):
         """初始化 Runner
 
@@ -32,10 +34,12 @@ class ArticleAnalysisRunner:
             storage: 存储管理器
             analyst: 可注入的深度分析 Agent
             max_attempts: 最大尝试次数（包含首轮）
+            concurrency: 同时进行的 LLM 调用数
         """
         self.storage = storage
         self.analyst = analyst or ArticleAnalyst()
         self.max_attempts = max(1, max_attempts)
+        self.concurrency = max(1, concurrency)
 
     def run(self, input_file: Optional[str] = None) -> Optional[str]:
         """执行深度分析流程"""
@@ -106,17 +110,18 @@ class ArticleAnalysisRunner:
         filepath: str,
         attempt: int,
     ) -> List[Dict[str, Any]]:
-        """处理一批文章并即时保存"""
+        """并发处理一批文章，按原顺序即时保存"""
         failed_articles: List[Dict[str, Any]] = []
 
-        for article in articles:
-            title = article.get("title", "无标题")
-            logger.info(f"深度分析文章: {title}")
-
+        def analyze(article: Dict[str, Any]) -> Dict[str, Any]:
+            logger.info(f"深度分析文章: {article.get('title', '无标题')}")
             # 从 llm_summary 获取输入内容
             summary_content = str(article.get("llm_summary", "") or "").strip()
+            return self.analyst.analyze(summary_content)
 
-            result = self.analyst.analyze(summary_content)
+        for article, result, error in map_ordered(analyze, articles, self.concurrency, "llm-analysis"):
+            if error is not None:
+                result = {"status": "失败", "error": str(error)}
             self._apply_result(article, result)
             article["llm_analysis_last_try"] = self._current_timestamp()
 
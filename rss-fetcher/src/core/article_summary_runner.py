@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 
 from src.core.analysis.summary_agent import ArticleSummaryAgent
 from src.core.storage import StorageManager
+from src.utils.llm.executor import map_ordered
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,6 +21,7 @@ class ArticleSummaryRunner:
         storage: StorageManager,
         summary_agent: Optional[ArticleSummaryAgent] = None,
         max_attempts: int = 2,
+        concurrency: int = 1,
     ):
         """初始化 Runner
 
@@ -27,10 +29,12 @@ class ArticleSummaryRunner:
             storage: 存储管理器
             summary_agent: 可注入的总结 Agent
             max_attempts: 最大尝试次数（包含首轮）
+            concurrency: 同时进行的 LLM 调用数
         """
         self.storage = storage
         self.summary_agent = summary_agent or ArticleSummaryAgent()
         self.max_attempts = max(1, max_attempts)
+        self.concurrency = max(1, concurrency)
 
     def run(self, input_file: Optional[str] = None) -> Optional[str]:
         """执行总结流程"""
@@ -106,24 +110,29 @@ class ArticleSummaryRunner:
         filepath: str,
         attempt: int,
     ) -> List[Dict[str, Any]]:
-        """处理一批文章并即时保存"""
+        """并发处理一批文章，按原顺序即时保存"""
         failed_articles: List[Dict[str, Any]] = []
+        to_summarize: List[Dict[str, Any]] = []
 
         for article in articles:
-            title = article.get("title", "无标题")
-            
             # 防御性检查：确保 full_text 不为空
             full_text = article.get("full_text", "")
             if not full_text or str(full_text).strip() == '':
-                logger.info(f"跳过总结（full_text为空）: {title}")
+                logger.info(f"跳过总结（full_text为空）: {article.get('title', '无标题')}")
                 article["llm_summary_status"] = "跳过"
                 article["llm_summary"] = ""
                 article["llm_summary_error"] = "full_text为空，正文提取失败"
                 self.storage.save_analyze_results([article], filepath, skip_processed=False)
                 continue
-            
-            logger.info(f"总结文章: {title}")
-            result = self.summary_agent.summarize(article)
+            to_summarize.append(article)
+
+        def summarize(article: Dict[str, Any]) -> Dict[str, Any]:
+            logger.info(f"总结文章: {article.get('title', '无标题')}")
+            return self.summary_agent.summarize(article)
+
+        for article, result, error in map_ordered(summarize, to_summarize, self.concurrency, "llm-summary"):
+            if error is not None:
+                result = {"llm_summary": "", "llm_summary_status": "失败", "llm_summary_error": str(error)}
             self._apply_result(article, result)
             article["llm_summary_last_try"] = self._current_timestamp()
 
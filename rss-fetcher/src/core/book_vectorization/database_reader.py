@@ -7,6 +7,7 @@ SQLite 数据库读取器
 """
 
 import sqlite3
+import threading
 from typing import Dict, List, Optional
 from datetime import datetime
 from src.utils.logger import get_logger
@@ -27,6 +28,8 @@ class DatabaseReader:
         self.db_path = db_config['path']
         self.table = db_config['table']
         self._conn = None
+        # 连接跨线程共享（检索时并发读取），读操作串行化
+        self._lock = threading.RLock()
     
     def _get_connection(self) -> sqlite3.Connection:
         """
@@ -35,10 +38,11 @@ class DatabaseReader:
         Returns:
             数据库连接对象
         """
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
-        return self._conn
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._conn.row_factory = sqlite3.Row
+            return self._conn
     
     def close(self):
         """关闭数据库连接"""
@@ -78,8 +82,9 @@ class DatabaseReader:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(f"SELECT * FROM {self.table} WHERE id = ?", (book_id,))
-        row = cursor.fetchone()
+        with self._lock:
+            cursor.execute(f"SELECT * FROM {self.table} WHERE id = ?", (book_id,))
+            row = cursor.fetchone()
         
         return dict(row) if row else None
     
@@ -104,8 +109,57 @@ class DatabaseReader:
             clear_error: 是否清除错误信息（成功时使用）
         """
         conn = self._get_connection()
-        cursor = conn.cursor()
+        sql, params = self._build_status_update(
+            book_id, status, embedding_id, retry_count, error, clear_error
+        )
+        with self._lock:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
         
+        logger.debug(f"更新书籍状态: book_id={book_id}, status={status}")
+
+    def update_embedding_status_batch(self, updates: List[Dict]):
+        """
+        批量更新向量化状态（单事务提交）
+
+        Args:
+            updates: 更新列表，每项字段同 update_embedding_status 参数
+                     (book_id, status, embedding_id, retry_count, error, clear_error)
+        """
+        if not updates:
+            return
+
+        statements = [
+            self._build_status_update(
+                item['book_id'],
+                item['status'],
+                item.get('embedding_id'),
+                item.get('retry_count'),
+                item.get('error'),
+                item.get('clear_error', False)
+            )
+            for item in updates
+        ]
+
+        conn = self._get_connection()
+        # 共享连接：整批事务持锁执行，避免其他线程的语句插入到本批提交之间
+        with self._lock, conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
+
+        logger.debug(f"批量更新书籍状态: 数量={len(updates)}")
+
+    def _build_status_update(
+        self,
+        book_id: int,
+        status: str,
+        embedding_id: Optional[str],
+        retry_count: Optional[int],
+        error: Optional[str],
+        clear_error: bool
+    ):
+        """构建状态更新 SQL 与参数"""
         # 构建更新语句
         update_fields = ["embedding_status = ?"]
         params = [status]
@@ -138,11 +192,7 @@ class DatabaseReader:
             SET {', '.join(update_fields)}
             WHERE id = ?
         """
-        
-        cursor.execute(sql, params)
-        conn.commit()
-        
-        logger.debug(f"更新书籍状态: book_id={book_id}, status={status}")
+        return sql, params
     
     def reset_embedding_status(self):
         """重置所有书籍的向量化状态（用于 rebuild 模式）"""
@@ -240,8 +290,9 @@ class DatabaseReader:
             LIMIT ?
         """
 
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
+        with self._lock:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
         result: List[Dict] = []
 
         for row in rows:
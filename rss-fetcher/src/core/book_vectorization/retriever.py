@@ -7,6 +7,7 @@
 """
 
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Sequence, Tuple
 from src.utils.logger import get_logger
 from .embedding_client import EmbeddingClient
@@ -77,6 +78,16 @@ class BookRetriever:
         # 1. 将查询文本向量化
         query_embedding = self.embedding_client.get_embedding(query_text)
         
+        return self._search_by_embedding(query_text, query_embedding, top_k, min_rating)
+
+    def _search_by_embedding(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        top_k: int,
+        min_rating: Optional[float]
+    ) -> List[Dict]:
+        """使用已生成的查询向量检索并补充书籍信息（可在工作线程中执行）"""
         # 2. 构建过滤条件
         filter_metadata = {}
         if min_rating:
@@ -153,8 +164,7 @@ class BookRetriever:
         max_queries = self.multi_query_options.get('max_queries_per_type', {})
         top_k_each = per_query_top_k or self.multi_query_options.get('top_k_per_query', 20)
         top_k_each = max(top_k_each, 1)
-        query_results = []
-
+        sub_queries: List[Tuple[str, str]] = []
         for bucket in priorities:
             queries = package_dict.get(bucket, [])
             if not queries:
@@ -169,14 +179,37 @@ class BookRetriever:
                     top_k_each,
                     self._shorten_text(query_text),
                 )
-                results = self.search_by_text(
-                    query_text=query_text,
-                    top_k=top_k_each,
-                    min_rating=min_rating,
+                sub_queries.append((bucket, query_text))
+
+        exact_enabled = self.exact_match_config.get('enabled', False) and not getattr(query_package, 'disable_exact_match', False)
+        concurrency = max(1, self.multi_query_options.get('concurrency', 4))
+
+        with ThreadPoolExecutor(max_workers=concurrency + 1) as executor:
+            # 并行精确匹配（若启用且未显式禁用），与向量分支同时执行
+            exact_future = None
+            if exact_enabled:
+                exact_future = executor.submit(
+                    self._search_exact_matches,
+                    query_package,
+                    min_rating,
+                    self.exact_match_config.get('top_k', 20),
                 )
-                for item in results:
-                    item['source_query_type'] = bucket
-                query_results.append((bucket, results))
+
+            query_results = []
+            if sub_queries:
+                embeddings = self._embed_queries([text for _, text in sub_queries])
+                # 结果按子查询原顺序收集，保证融合结果与串行执行一致
+                futures = [
+                    executor.submit(self._search_by_embedding, text, embedding, top_k_each, min_rating)
+                    for (_, text), embedding in zip(sub_queries, embeddings)
+                ]
+                for (bucket, _), future in zip(sub_queries, futures):
+                    results = future.result()
+                    for item in results:
+                        item['source_query_type'] = bucket
+                    query_results.append((bucket, results))
+
+            exact_results = exact_future.result() if exact_future else []
 
         if not query_results:
             logger.warning("多子查询未获取任何候选，返回空列表")
@@ -190,12 +223,6 @@ class BookRetriever:
             )
 
         fused_results = fuse_query_results(query_results, active_fusion_config)
-        # 并行精确匹配（若启用且未显式禁用）
-        exact_enabled = self.exact_match_config.get('enabled', False) and not getattr(query_package, 'disable_exact_match', False)
-        if exact_enabled:
-            exact_results = self._search_exact_matches(query_package, min_rating, self.exact_match_config.get('top_k', 20))
-        else:
-            exact_results = []
 
         if rerank:
             if not self.reranker.enabled:
@@ -214,6 +241,19 @@ class BookRetriever:
 
         return final_results
     
+    def _embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """批量生成子查询向量（重复文本只请求一次），批量接口失败时逐条请求"""
+        unique_texts = list(dict.fromkeys(texts))
+        try:
+            embeddings = self.embedding_client.get_embeddings_batch(unique_texts)
+            if len(embeddings) != len(unique_texts):
+                raise ValueError(f"返回向量数量不匹配: {len(embeddings)} != {len(unique_texts)}")
+        except Exception as e:
+            logger.warning(f"子查询批量向量化失败，改为逐条请求: {str(e)}")
+            embeddings = [self.embedding_client.get_embedding(text) for text in unique_texts]
+        embedding_map = dict(zip(unique_texts, embeddings))
+        return [embedding_map[text] for text in texts]
+
     def close(self):
         """关闭资源"""
         self.db_reader.close()
@@ -8,8 +8,10 @@
 
 import os
 import json
+import time
 import yaml
-from typing import Dict, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from src.utils.logger import get_logger
 from .database_reader import DatabaseReader
@@ -177,76 +179,172 @@ class BookVectorizer:
     def _vectorize_batch(self, books: List[Dict]) -> List[Dict]:
         """
         批量向量化
+
+        每批一次 Embedding 批量调用（多批并发），主线程按批写入 ChromaDB 并单事务更新状态，
+        每批完成即落库，中断后以 incremental 模式重跑即可续做
         
         Args:
             books: 待处理书籍列表
             
         Returns:
-            处理结果列表
+            处理结果列表（与 books 顺序一致）
         """
-        results = []
         total = len(books)
         batch_size = self.config['embedding']['batch_size']
+        concurrency = max(1, self.config['embedding'].get('concurrency', 4))
+        progress_interval = self.config['logging']['progress_interval']
+        batches = [books[i:i + batch_size] for i in range(0, total, batch_size)]
+        
+        logger.info(f"开始批量向量化: 总数={total}, 批大小={batch_size}, 并发={concurrency}")
         
-        logger.info(f"开始批量向量化: 总数={total}, 批大小={batch_size}")
+        results_by_id: Dict[int, Dict] = {}
+        processed = 0
+        start_time = time.time()
         
-        for i in range(0, total, batch_size):
-            batch = books[i:i + batch_size]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            batch_iter = iter(enumerate(batches))
+            in_flight = {}
             
-            for book in batch:
-                try:
-                    # 1. 构建文本
-                    text = self._build_text(book)
-                    
-                    # 2. 调用 Embedding API
-                    embedding = self.embedding_client.get_embedding(text)
-                    
-                    # 3. 存储到 ChromaDB
-                    metadata = self._build_metadata(book)
-                    embedding_id = self.vector_store.add(
-                        embedding=embedding,
-                        metadata=metadata,
-                        document=text
-                    )
-                    
-                    # 4. 更新数据库状态为成功
-                    self.db_reader.update_embedding_status(
-                        book_id=book['id'],
-                        status='completed',
-                        embedding_id=embedding_id,
-                        clear_error=True  # 清除之前的错误信息
-                    )
-                    
-                    results.append({'book_id': book['id'], 'status': 'completed'})
-                    
-                except Exception as e:
-                    logger.error(f"向量化失败: book_id={book['id']}, title={book.get('douban_title')}, error={str(e)}")
-                    
-                    # 增加重试计数
-                    current_retry = book.get('retry_count', 0) + 1
-                    
-                    # 根据重试次数决定状态
-                    if current_retry >= 3:
-                        new_status = 'failed_final'
-                    else:
-                        new_status = 'failed'
-                    
-                    # 更新失败状态
-                    self.db_reader.update_embedding_status(
-                        book_id=book['id'],
-                        status=new_status,
-                        retry_count=current_retry,
-                        error=str(e)
-                    )
+            def submit_next():
+                item = next(batch_iter, None)
+                if item is not None:
+                    batch_no, batch = item
+                    in_flight[executor.submit(self._embed_batch, batch)] = (batch_no, batch)
+            
+            # 在途批次上限为 concurrency * 2，避免一次性为全部书籍构建文本
+            for _ in range(concurrency * 2):
+                submit_next()
+            
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch_no, batch = in_flight.pop(future)
+                    texts, embeddings, errors = future.result()
+                    for result in self._commit_batch(batch, texts, embeddings, errors):
+                        results_by_id[result['book_id']] = result
                     
-                    results.append({'book_id': book['id'], 'status': 'failed', 'error': str(e)})
+                    processed += len(batch)
+                    if batch_no % progress_interval == 0:
+                        elapsed = max(time.time() - start_time, 1e-6)
+                        logger.info(
+                            f"进度: {processed}/{total} ({processed/total*100:.1f}%), "
+                            f"速度={processed / elapsed * 60:.0f} 本/分钟"
+                        )
+                    submit_next()
+        
+        logger.info(f"批量向量化完成: 总数={total}, 耗时={time.time() - start_time:.1f}s")
+        return [results_by_id[book['id']] for book in books]
+    
+    def _embed_batch(self, batch: List[Dict]) -> Tuple[List[str], List[Optional[List[float]]], List[Optional[str]]]:
+        """
+        为一批书籍生成向量（工作线程执行，不写库）
+
+        优先整批调用一次 Embedding API，整批失败时逐条重试，单条失败不影响同批其他书籍
+        
+        Args:
+            batch: 书籍列表
             
-            # 定期输出进度
-            processed = min(i + batch_size, total)
-            if (i // batch_size) % self.config['logging']['progress_interval'] == 0:
-                logger.info(f"进度: {processed}/{total} ({processed/total*100:.1f}%)")
+        Returns:
+            (文本列表, 向量列表, 错误信息列表)，失败项向量为 None
+        """
+        texts: List[str] = []
+        errors: List[Optional[str]] = []
+        for book in batch:
+            try:
+                texts.append(self._build_text(book))
+                errors.append(None)
+            except Exception as e:
+                texts.append('')
+                errors.append(f"文本构建失败: {e}")
+        embeddings: List[Optional[List[float]]] = [None] * len(batch)
+        
+        valid = [i for i, err in enumerate(errors) if err is None]
+        if not valid:
+            return texts, embeddings, errors
+        
+        try:
+            batch_embeddings = self.embedding_client.get_embeddings_batch([texts[i] for i in valid])
+            if len(batch_embeddings) != len(valid):
+                raise ValueError(f"返回向量数量不匹配: {len(batch_embeddings)} != {len(valid)}")
+            for i, embedding in zip(valid, batch_embeddings):
+                embeddings[i] = embedding
+        except Exception as e:
+            logger.warning(f"批量 Embedding 失败，转为逐条重试: 数量={len(valid)}, error={str(e)}")
+            for i in valid:
+                try:
+                    embeddings[i] = self.embedding_client.get_embedding(texts[i])
+                except Exception as item_error:
+                    errors[i] = str(item_error)
         
-        logger.info(f"批量向量化完成: 总数={total}")
+        return texts, embeddings, errors
+    
+    def _commit_batch(
+        self,
+        batch: List[Dict],
+        texts: List[str],
+        embeddings: List[Optional[List[float]]],
+        errors: List[Optional[str]]
+    ) -> List[Dict]:
+        """
+        写入一批向量并单事务更新状态（主线程执行）
+
+        整批写入 ChromaDB 失败时逐条写入，定位具体失败的书籍
+        
+        Returns:
+            该批处理结果列表
+        """
+        ok = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        embedding_ids: Dict[int, str] = {}
+        
+        if ok:
+            metadatas = [self._build_metadata(batch[i]) for i in ok]
+            try:
+                ids = self.vector_store.add_batch(
+                    embeddings=[embeddings[i] for i in ok],
+                    metadatas=metadatas,
+                    documents=[texts[i] for i in ok]
+                )
+                embedding_ids.update(zip(ok, ids))
+            except Exception as e:
+                logger.warning(f"批量写入向量库失败，转为逐条写入: 数量={len(ok)}, error={str(e)}")
+                for i, metadata in zip(ok, metadatas):
+                    try:
+                        embedding_ids[i] = self.vector_store.add(
+                            embedding=embeddings[i],
+                            metadata=metadata,
+                            document=texts[i]
+                        )
+                    except Exception as item_error:
+                        errors[i] = str(item_error)
+        
+        results = []
+        updates = []
+        for i, book in enumerate(batch):
+            if i in embedding_ids:
+                updates.append({
+                    'book_id': book['id'],
+                    'status': 'completed',
+                    'embedding_id': embedding_ids[i],
+                    'clear_error': True  # 清除之前的错误信息
+                })
+                results.append({'book_id': book['id'], 'status': 'completed'})
+                continue
+            
+            error = errors[i] or "未知错误"
+            logger.error(f"向量化失败: book_id={book['id']}, title={book.get('douban_title')}, error={error}")
+            
+            # 增加重试计数，根据重试次数决定状态
+            current_retry = (book.get('retry_count') or 0) + 1
+            new_status = 'failed_final' if current_retry >= 3 else 'failed'
+            updates.append({
+                'book_id': book['id'],
+                'status': new_status,
+                'retry_count': current_retry,
+                'error': error
+            })
+            results.append({'book_id': book['id'], 'status': 'failed', 'error': error})
+        
+        self.db_reader.update_embedding_status_batch(updates)
         return results
     
     def _final_retry(self, failed_books: List[Dict]) -> List[Dict]:
@@ -2,6 +2,7 @@
 
 from .base import BaseContentExtractor
 from .factory import ExtractorFactory
+from .scheduler import ExtractionScheduler
 from .pengpai import PengpaiExtractor
 from .pengpai_playwright import PengpaiPlaywrightExtractor
 from .bigthink import BigThinkExtractor
@@ -20,6 +21,7 @@ ExtractorFactory.register(PengpaiExtractor)  # 作为备用方案最后注册
 __all__ = [
     "BaseContentExtractor",
     "ExtractorFactory",
+    "ExtractionScheduler",
     "PengpaiExtractor",
     "PengpaiPlaywrightExtractor",
     "BigThinkExtractor",
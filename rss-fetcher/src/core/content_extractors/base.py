@@ -7,6 +7,21 @@ from typing import Dict, Any
 class BaseContentExtractor(ABC):
     """全文提取器抽象基类"""
     
+    # 是否依赖浏览器：调度器据此选择默认并发数，并让每个工作线程复用一个浏览器
+    uses_browser = False
+    
+    def open_worker(self) -> None:
+        """提取工作线程启动时调用（在该线程内）"""
+        if self.uses_browser:
+            from .browser_pool import shared_browser
+            shared_browser.start(headless=getattr(self, "headless", True))
+    
+    def close_worker(self) -> None:
+        """提取工作线程结束时调用（在该线程内）"""
+        if self.uses_browser:
+            from .browser_pool import shared_browser
+            shared_browser.stop()
+    
     @abstractmethod
     def extract(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """
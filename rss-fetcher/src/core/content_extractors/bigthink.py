@@ -1,9 +1,10 @@
 """Big Think全文提取器"""
 
 from typing import Dict, Any
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
 from bs4 import BeautifulSoup
 from .base import BaseContentExtractor
+from .browser_pool import shared_browser
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,6 +16,8 @@ class BigThinkExtractor(BaseContentExtractor):
     策略: 使用无头浏览器从link爬取全文
     """
     
+    uses_browser = True
+    
     def __init__(self):
         self.timeout = 30000  # 30秒超时
         self.headless = True
@@ -49,10 +52,9 @@ class BigThinkExtractor(BaseContentExtractor):
             return result
         
         try:
-            with sync_playwright() as p:
-                # 启动浏览器
-                browser = p.chromium.launch(headless=self.headless)
-                page = browser.new_page()
+            # 复用工作线程的浏览器（未启动时临时启动）
+            with shared_browser.context(headless=self.headless) as context:
+                page = context.new_page()
                 
                 # 访问页面
                 logger.info(f"正在访问: {link}")
@@ -63,7 +65,6 @@ class BigThinkExtractor(BaseContentExtractor):
                 
                 # 获取页面HTML
                 html = page.content()
-                browser.close()
                 
                 # 解析HTML
                 soup = BeautifulSoup(html, "html.parser")
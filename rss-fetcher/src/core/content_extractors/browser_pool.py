@@ -0,0 +1,86 @@
+"""Playwright 浏览器复用
+
+Playwright 同步 API 的对象只能在创建它的线程中使用，因此按工作线程各自持有一个浏览器：
+提取调度器在工作线程启动时调用 start()，之后该线程内的每篇文章只新建一个 BrowserContext
+（相互隔离、开销远小于启动浏览器），线程结束时调用 stop() 关闭浏览器。
+
+未调用 start() 的线程（如单独使用某个提取器）仍按原方式为每次提取临时启动浏览器。
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ThreadLocalBrowser:
+    """按线程复用的 Chromium 浏览器"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def active(self) -> bool:
+        return getattr(self._local, "browser", None) is not None
+
+    def start(self, headless: bool = True) -> None:
+        """在当前线程启动浏览器（已启动则忽略）"""
+        if self.active:
+            return
+        from playwright.sync_api import sync_playwright
+
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.launch(headless=headless)
+        except Exception:
+            playwright.stop()
+            raise
+        self._local.playwright = playwright
+        self._local.browser = browser
+        logger.debug(f"工作线程 {threading.current_thread().name} 已启动浏览器")
+
+    def stop(self) -> None:
+        """关闭当前线程的浏览器"""
+        browser = getattr(self._local, "browser", None)
+        playwright = getattr(self._local, "playwright", None)
+        self._local.browser = None
+        self._local.playwright = None
+        try:
+            if browser is not None:
+                browser.close()
+        except Exception as e:
+            logger.warning(f"关闭浏览器失败: {e}")
+        finally:
+            if playwright is not None:
+                playwright.stop()
+
+    @contextmanager
+    def context(self, headless: bool = True, **context_options: Dict[str, Any]) -> Iterator[Any]:
+        """
+        获取一个 BrowserContext，用完即关闭
+
+        当前线程已 start() 时复用其浏览器，否则临时启动并在结束时关闭。
+        """
+        if self.active:
+            context = self._local.browser.new_context(**context_options)
+            try:
+                yield context
+            finally:
+                context.close()
+            return
+
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=headless)
+            try:
+                yield browser.new_context(**context_options)
+            finally:
+                browser.close()
+
+
+# 所有依赖浏览器的提取器共用
+shared_browser = ThreadLocalBrowser()
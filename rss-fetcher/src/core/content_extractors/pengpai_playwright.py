@@ -3,9 +3,10 @@
 import re
 from typing import Dict, Any, Optional
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from src.core.content_extractors.base import BaseContentExtractor
+from src.core.content_extractors.browser_pool import shared_browser
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +15,8 @@ logger = get_logger(__name__)
 class PengpaiPlaywrightExtractor(BaseContentExtractor):
     """澎湃网站Playwright抓取文章全文提取器"""
     
+    uses_browser = True
+    
     def can_handle(self, source_name: str) -> bool:
         """判断是否能处理指定的源"""
         # 支持通过名称匹配
@@ -65,12 +68,11 @@ class PengpaiPlaywrightExtractor(BaseContentExtractor):
     def _fetch_article_html(self, url: str) -> str:
         """使用Playwright获取文章HTML内容"""
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1",
-                    viewport={"width": 375, "height": 667}
-                )
+            # 复用工作线程的浏览器（未启动时临时启动）
+            with shared_browser.context(
+                user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1",
+                viewport={"width": 375, "height": 667}
+            ) as context:
                 page = context.new_page()
                 
                 try:
@@ -89,8 +91,6 @@ class PengpaiPlaywrightExtractor(BaseContentExtractor):
                 except Exception as e:
                     logger.error(f"访问文章页面失败: {url}, 错误: {e}")
                     return ""
-                finally:
-                    browser.close()
         
         except Exception as e:
             logger.error(f"初始化Playwright失败: {e}")
@@ -0,0 +1,151 @@
+"""全文提取调度器
+
+按 (提取器, 链接域名) 分组，每组启动若干工作线程并行提取：
+- 普通 HTTP / 解析类提取器使用 http_concurrency 个线程
+- 依赖浏览器的提取器使用 browser_concurrency 个线程，每个线程复用自己的浏览器
+- per_domain_concurrency 可按域名覆盖上述并发数
+- max_workers 限制全局同时运行的工作线程数（含其浏览器实例），超出的线程排队等待
+
+结果在调用方线程中按完成顺序产出，文章字典只在调用方线程中修改，便于增量保存。
+"""
+
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .base import BaseContentExtractor
+from .factory import ExtractorFactory
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (文章, 提取器, 提取结果, 异常)；未找到提取器时提取器与结果均为 None
+ExtractionOutcome = Tuple[Dict[str, Any], Optional[BaseContentExtractor], Optional[Dict[str, Any]], Optional[Exception]]
+
+
+class ExtractionScheduler:
+    """全文提取调度器"""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        http_concurrency: int = 4,
+        browser_concurrency: int = 2,
+        per_domain_concurrency: Optional[Dict[str, int]] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.http_concurrency = max(1, int(http_concurrency))
+        self.browser_concurrency = max(1, int(browser_concurrency))
+        self.per_domain_concurrency = {
+            domain.lower(): max(1, int(limit)) for domain, limit in (per_domain_concurrency or {}).items()
+        }
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict[str, Any]]) -> "ExtractionScheduler":
+        """根据 extraction_settings 配置创建"""
+        settings = settings or {}
+        return cls(
+            max_workers=settings.get("max_workers", 8),
+            http_concurrency=settings.get("http_concurrency", 4),
+            browser_concurrency=settings.get("browser_concurrency", 2),
+            per_domain_concurrency=settings.get("per_domain_concurrency"),
+        )
+
+    def _group_limit(self, extractor: BaseContentExtractor, domain: str) -> int:
+        if domain in self.per_domain_concurrency:
+            return self.per_domain_concurrency[domain]
+        return self.browser_concurrency if extractor.uses_browser else self.http_concurrency
+
+    def run(self, articles: List[Dict[str, Any]]) -> Iterator[ExtractionOutcome]:
+        """
+        并行提取全文
+
+        Args:
+            articles: 待提取文章列表（不会在工作线程中被修改）
+
+        Yields:
+            (文章, 提取器, 提取结果, 异常)，按完成顺序
+        """
+        groups: Dict[Tuple[int, str], Tuple[BaseContentExtractor, List[Dict[str, Any]]]] = {}
+        for article in articles:
+            extractor = ExtractorFactory.get_extractor(article.get("source", ""))
+            if extractor is None:
+                yield article, None, None, None
+                continue
+            domain = urlparse(str(article.get("link", "") or "")).netloc.lower()
+            groups.setdefault((id(extractor), domain), (extractor, []))[1].append(article)
+
+        if not groups:
+            return
+
+        results: "queue.Queue[ExtractionOutcome]" = queue.Queue()
+        slots = threading.BoundedSemaphore(self.max_workers)
+        threads = []
+        total = 0
+
+        for (_, domain), (extractor, group_articles) in groups.items():
+            pending: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+            for article in group_articles:
+                pending.put(article)
+            total += len(group_articles)
+
+            workers = min(self._group_limit(extractor, domain), len(group_articles))
+            logger.info(
+                f"提取分组: {extractor.__class__.__name__} @ {domain or '-'}, "
+                f"{len(group_articles)} 篇, 并发 {workers}"
+            )
+            for index in range(workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(extractor, pending, results, slots),
+                    name=f"extract-{extractor.__class__.__name__}-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        for _ in range(total):
+            yield results.get()
+
+        for thread in threads:
+            thread.join()
+
+    @staticmethod
+    def _worker(
+        extractor: BaseContentExtractor,
+        pending: "queue.Queue[Dict[str, Any]]",
+        results: "queue.Queue[ExtractionOutcome]",
+        slots: threading.BoundedSemaphore,
+    ) -> None:
+        """工作线程：复用线程级资源（如浏览器），依次处理分组内的文章
+
+        从初始化资源到清理完毕一直占用全局名额，保证同时存在的浏览器数不超过 max_workers。
+        """
+        with slots:
+            # 等待名额期间分组可能已被其他线程处理完，此时无需再启动浏览器
+            if pending.empty():
+                return
+
+            try:
+                extractor.open_worker()
+            except Exception as e:
+                # 启动失败时提取器会退回到每次临时创建资源
+                logger.warning(f"{extractor.__class__.__name__} 工作线程初始化失败: {e}")
+
+            try:
+                while True:
+                    try:
+                        article = pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        result = extractor.extract(dict(article))
+                        results.put((article, extractor, result, None))
+                    except Exception as e:
+                        results.put((article, extractor, None, e))
+            finally:
+                try:
+                    extractor.close_worker()
+                except Exception as e:
+                    logger.warning(f"{extractor.__class__.__name__} 工作线程清理失败: {e}")
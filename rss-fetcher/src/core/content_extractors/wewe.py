@@ -4,9 +4,10 @@
 import re
 import pandas as pd
 from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from src.utils.logger import get_logger
 from .base import BaseContentExtractor
+from .browser_pool import shared_browser
 
 logger = get_logger(__name__)
 
@@ -14,6 +15,8 @@ logger = get_logger(__name__)
 class WeweExtractor(BaseContentExtractor):
     """微信公众号全文提取器"""
 
+    uses_browser = True
+
     def __init__(self):
         self.timeout = 30000  # 30秒超时
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -85,12 +88,11 @@ class WeweExtractor(BaseContentExtractor):
             文章全文内容，提取失败返回None
         """
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    user_agent=self.user_agent,
-                    viewport={"width": 1200, "height": 800}
-                )
+            # 复用工作线程的浏览器（未启动时临时启动）
+            with shared_browser.context(
+                user_agent=self.user_agent,
+                viewport={"width": 1200, "height": 800}
+            ) as context:
                 page = context.new_page()
 
                 try:
@@ -150,8 +152,6 @@ class WeweExtractor(BaseContentExtractor):
                 except Exception as e:
                     logger.error(f"提取页面内容时出错: {e}")
                     return None
-                finally:
-                    browser.close()
 
         except Exception as e:
             logger.error(f"初始化Playwright时出错: {e}")
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import math
 from collections import defaultdict
 from typing import Dict, List, Optional, Sequence, Type
 
 from src.utils.logger import get_logger
 
+from .embeddings import ArticleEmbedder
+
+CLUSTER_METHODS = ("tfidf", "embedding", "auto")
+
 
 class Clusterer:
-    """基于 TF-IDF 与层次聚类的文章聚类器。
+    """文章聚类器，支持两种方式：
 
-    使用 AgglomerativeClustering 通过距离阈值自动确定分组数量，
-    无需预设簇数，更适合小数据集（10-50篇文章）。
+    - tfidf: TF-IDF + AgglomerativeClustering，通过距离阈值自动确定分组数量，
+      需要两两距离矩阵（O(n²) 内存），适合小数据集（10-50篇文章）。
+    - embedding: 文章向量（带本地缓存）+ Birch 增量聚类，按半径阈值确定分组，
+      内存随文章数线性增长，适合上千篇文章的时间窗口。
+    - auto: 文章数达到 auto_embedding_min_articles 时使用 embedding，否则使用 tfidf。
     """
 
     def __init__(
@@ -21,22 +29,38 @@ class Clusterer:
         batch_size: int = 6,  # 保留用于降级分组
         vectorizer_cls: Optional[Type] = None,
         clustering_cls: Optional[Type] = None,
+        method: str = "tfidf",
+        embedding_distance_threshold: float = 0.3,
+        auto_embedding_min_articles: int = 200,
+        embedder: Optional[ArticleEmbedder] = None,
+        birch_cls: Optional[Type] = None,
     ):
         """
         Args:
             distance_threshold: 距离阈值，控制分组粒度。
                                越小分组越细（0.5~1.2，推荐0.8）。
             batch_size: 降级时使用的批次大小。
+            method: 聚类方式，tfidf / embedding / auto。
+            embedding_distance_threshold: embedding 方式下簇半径（余弦距离），越小分组越细。
+            auto_embedding_min_articles: auto 方式切换到 embedding 的文章数。
+            embedder: 自定义文章向量生成器，缺省时按需创建。
         """
+        if method not in CLUSTER_METHODS:
+            raise ValueError(f"不支持的聚类方式: {method}，可选: {', '.join(CLUSTER_METHODS)}")
         self.distance_threshold = distance_threshold
         self.batch_size = max(1, batch_size)
+        self.method = method
+        self.embedding_distance_threshold = float(embedding_distance_threshold)
+        self.auto_embedding_min_articles = max(1, int(auto_embedding_min_articles))
+        self.embedder = embedder
         self.logger = get_logger(__name__)
         self._vectorizer_cls = vectorizer_cls
         self._clustering_cls = clustering_cls
+        self._birch_cls = birch_cls
 
     def cluster(self, articles: Sequence[Dict]) -> List[List[Dict]]:
         """
-        使用层次聚类（AgglomerativeClustering）自动分组。
+        按配置的聚类方式自动分组，向量聚类失败时退化为 TF-IDF 层次聚类。
 
         Args:
             articles: 预处理后的文章列表，需包含 summary_long 等字段。
@@ -53,6 +77,20 @@ class Clusterer:
             self.logger.info("仅1篇文章，直接归为同一组")
             return [list(articles)]
 
+        method = self.method
+        if method == "auto":
+            method = "embedding" if len(articles) >= self.auto_embedding_min_articles else "tfidf"
+
+        if method == "embedding":
+            groups = self._cluster_by_embedding(articles)
+            if groups is not None:
+                return groups
+            self.logger.warning("向量聚类不可用，改用 TF-IDF 层次聚类")
+
+        return self._cluster_by_tfidf(articles)
+
+    def _cluster_by_tfidf(self, articles: Sequence[Dict]) -> List[List[Dict]]:
+        """使用 TF-IDF 与层次聚类（AgglomerativeClustering）分组。"""
         vectorizer_cls = self._vectorizer_cls
         clustering_cls = self._clustering_cls
         if vectorizer_cls is None or clustering_cls is None:
@@ -95,6 +133,48 @@ class Clusterer:
             self.logger.error(f"层次聚类失败，退化为按批次分组: {exc}")
             return self._chunk_by_batch(articles)
 
+    def _cluster_by_embedding(self, articles: Sequence[Dict]) -> Optional[List[List[Dict]]]:
+        """使用文章向量与 Birch 分组，失败返回 None。"""
+        birch_cls = self._birch_cls
+        try:
+            if birch_cls is None:
+                from sklearn.cluster import Birch
+
+                birch_cls = Birch
+            if self.embedder is None:
+                self.embedder = ArticleEmbedder()
+
+            texts = [self._build_embedding_text(article, idx) for idx, article in enumerate(articles)]
+            vectors = self.embedder.embed(texts)
+
+            # 向量已归一化：欧氏距离 = sqrt(2 * 余弦距离)
+            radius = math.sqrt(2 * self.embedding_distance_threshold)
+            model = birch_cls(threshold=radius, n_clusters=None, branching_factor=50)
+            labels = model.fit_predict(vectors)
+        except Exception as exc:
+            self.logger.error(f"向量聚类失败: {exc}")
+            return None
+
+        grouped: Dict[int, List[Dict]] = defaultdict(list)
+        for article, label in zip(articles, labels):
+            grouped[int(label)].append(article)
+
+        groups = list(grouped.values())
+        self.logger.info(
+            f"向量聚类完成，{len(articles)} 篇文章生成 {len(groups)} 个分组 "
+            f"(embedding_distance_threshold={self.embedding_distance_threshold})"
+        )
+        return groups
+
+    def _build_embedding_text(self, article: Dict, index: int) -> str:
+        """拼接向量化输入：标题、主题聚焦点、标签与长摘要（无需像 TF-IDF 那样重复加权）。"""
+        title = str(article.get("title") or f"文章{index+1}")
+        topic_focus = str(article.get("llm_topic_focus") or "")
+        tags = article.get("llm_tags") or ""
+        tags_text = " ".join(str(tag) for tag in tags) if isinstance(tags, (list, tuple, set)) else str(tags)
+        summary = str(article.get("summary_long") or "") or str(article.get("full_text") or "")[:2000]
+        return "\n".join(filter(None, [title, topic_focus, tags_text, summary]))
+
     def _build_feature_text(self, article: Dict, index: int) -> str:
         """拼接特征字段，作为向量化的输入文本。
 
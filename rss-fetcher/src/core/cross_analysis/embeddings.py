@@ -0,0 +1,133 @@
+"""交叉分析文章向量。
+
+复用向量化流水线的 Embedding 配置（config/book_vectorization.yaml 的 embedding 节点）
+为文章生成向量，并按 (模型, 文本) 哈希缓存在本地 SQLite 中：
+同一篇文章在不同时间窗口、多次运行中只需向量化一次。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import yaml
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+class ArticleEmbeddingCache:
+    """文章向量缓存（SQLite，向量以 float32 二进制保存）。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock, self._connect() as conn:
+            # 分批查询，避免超过 SQLite 参数数量上限
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()],
+            )
+
+
+class ArticleEmbedder:
+    """批量获取文章向量（先查缓存，缺失部分按批调用 Embedding API）。"""
+
+    def __init__(
+        self,
+        embed_fn: Optional[EmbedFn] = None,
+        model_name: Optional[str] = None,
+        cache_path: Optional[str] = os.path.join("runtime", "cache", "article_embeddings.db"),
+        batch_size: Optional[int] = None,
+        config_path: str = "config/book_vectorization.yaml",
+    ):
+        """
+        Args:
+            embed_fn: 自定义批量向量化函数，便于测试注入；缺省时使用向量化流水线的 EmbeddingClient。
+            model_name: 参与缓存键的模型名，缺省取配置中的 embedding.model。
+            cache_path: 缓存文件路径，None 表示不缓存。
+            batch_size: 每批调用数量，缺省取配置中的 embedding.batch_size。
+            config_path: 向量化流水线配置文件。
+        """
+        self.config_path = config_path
+        self._embed_fn = embed_fn
+        self._embedding_config: Optional[Dict] = None
+        if embed_fn is None or model_name is None or batch_size is None:
+            self._embedding_config = self._load_embedding_config()
+        self.model_name = model_name or (self._embedding_config or {}).get("model", "")
+        self.batch_size = max(1, int(batch_size or (self._embedding_config or {}).get("batch_size", 32)))
+        self.cache = ArticleEmbeddingCache(cache_path) if cache_path else None
+
+    def _load_embedding_config(self) -> Dict:
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            return (yaml.safe_load(f) or {}).get("embedding", {}) or {}
+
+    def _get_embed_fn(self) -> EmbedFn:
+        if self._embed_fn is None:
+            from src.core.book_vectorization.embedding_client import EmbeddingClient
+
+            self._embed_fn = EmbeddingClient(self._embedding_config or self._load_embedding_config()).get_embeddings_batch
+        return self._embed_fn
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Returns:
+            (n, d) float32 矩阵，每行已 L2 归一化（欧氏距离与余弦距离单调对应）。
+        """
+        keys = [self._cache_key(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = self.cache.get_many(keys) if self.cache else {}
+
+        missing = [(key, text) for key, text in dict(zip(keys, texts)).items() if key not in vectors]
+        if missing:
+            logger.info(f"文章向量: 缓存命中 {len(set(keys)) - len(missing)} 条，需新生成 {len(missing)} 条")
+            embed_fn = self._get_embed_fn()
+            for start in range(0, len(missing), self.batch_size):
+                chunk = missing[start:start + self.batch_size]
+                embeddings = embed_fn([text for _, text in chunk])
+                fresh = {key: np.asarray(vec, dtype=np.float32) for (key, _), vec in zip(chunk, embeddings)}
+                vectors.update(fresh)
+                if self.cache:
+                    self.cache.put_many(fresh)
+        else:
+            logger.info(f"文章向量全部命中缓存: {len(keys)} 条")
+
+        matrix = np.vstack([vectors[key] for key in keys]).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from copy import deepcopy
@@ -36,10 +37,14 @@ class CrossAnalysisManager:
         self.distance_threshold = float(cross_conf.get("distance_threshold", 0.8))
         self.batch_size = max(1, int(cross_conf.get("batch_size", 6)))  # 保留用于降级
         self.output_dir = cross_conf.get("output_dir", os.path.join("runtime", "outputs", "cross_analysis"))
+        self.analysis_concurrency = max(1, int(cross_conf.get("analysis_concurrency", 4)))
 
         self.clusterer = clusterer or Clusterer(
             distance_threshold=self.distance_threshold,
             batch_size=self.batch_size,
+            method=cross_conf.get("cluster_method", "tfidf"),
+            embedding_distance_threshold=float(cross_conf.get("embedding_distance_threshold", 0.3)),
+            auto_embedding_min_articles=int(cross_conf.get("auto_embedding_min_articles", 200)),
         )
         self.analyzer = analyzer or Analyzer(task_name=cross_conf.get("task_name", "article_cross_analysis"))
         self.reporter = reporter or Reporter(base_output_dir=self.output_dir)
@@ -71,9 +76,21 @@ class CrossAnalysisManager:
         report_dir = output_dir or self.output_dir
         os.makedirs(report_dir, exist_ok=True)
 
+        # 各分组并发分析（受 analysis_concurrency 限制），报告仍按分组顺序生成
+        semaphore = asyncio.Semaphore(self.analysis_concurrency)
+
+        async def analyze(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.analyzer.analyze_group(group)
+                except Exception as exc:
+                    return {"success": False, "error": str(exc)}
+
+        self.logger.info(f"开始分析 {len(groups)} 个分组 (并发: {self.analysis_concurrency})")
+        results = await asyncio.gather(*(analyze(group) for group in groups))
+
         report_paths: List[str] = []
-        for idx, group in enumerate(groups, 1):
-            analysis_result = await self.analyzer.analyze_group(group)
+        for idx, (group, analysis_result) in enumerate(zip(groups, results), 1):
             if not analysis_result.get("success"):
                 self.logger.warning(f"第 {idx} 组分析失败，跳过: {analysis_result.get('error')}")
                 continue
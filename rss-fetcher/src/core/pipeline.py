@@ -9,13 +9,14 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from dateutil import parser as date_parser
 from src.utils.logger import get_logger
+from src.utils.llm.executor import map_ordered
 from .rss_fetcher import RSSFetcher
 from .rsshub_fetcher import RSSHubFetcher
 from .playwright_fetcher import PlaywrightSiteFetcher
 from .article_summary_runner import ArticleSummaryRunner
 from .article_analysis_runner import ArticleAnalysisRunner
 from .storage import StorageManager
-from .content_extractors import ExtractorFactory
+from .content_extractors import ExtractionScheduler
 from .score_statistics import ScoreStatistics
 from .cross_analysis import CrossAnalysisManager
 from .md_reader import MDReader
@@ -111,8 +112,16 @@ class SubjectBibliographyPipeline:
         # 初始化存储管理器 - 按月聚合版本
         output_conf = self.config.get("output", {})
         self.storage = StorageManager(
-            output_dir=output_conf.get("base_dir", "runtime/outputs")
+            output_dir=output_conf.get("base_dir", "runtime/outputs"),
+            backend=output_conf.get("storage_backend", "excel")
         )
+        self.export_excel = output_conf.get("export_excel", True)
+
+    def export_stage_excel(self, stage_file: Optional[str]) -> Optional[str]:
+        """sqlite 后端下将阶段数据导出为 Excel（流程结束时调用）"""
+        if self.storage.backend == "excel" or not self.export_excel or not stage_file:
+            return stage_file
+        return self.storage.export_excel(stage_file)
 
     def _load_config(self, path: str) -> Dict[str, Any]:
         """加载配置文件"""
@@ -171,16 +180,21 @@ class SubjectBibliographyPipeline:
         logger.info("开始执行阶段1: RSS获取")
         logger.info("=" * 60)
         
-        # 初始化抓取器
-        user_agent = self.config.get("fetch_settings", {}).get("user_agent")
-        fetcher = RSSFetcher(user_agent=user_agent)
-        rsshub_fetcher = RSSHubFetcher(user_agent=user_agent)
-        playwright_fetcher = PlaywrightSiteFetcher(user_agent=user_agent)
-        
         # 获取配置
         feeds = self.config.get("rss_feeds", [])
         playwright_sites = self.config.get("playwright_sites", [])
         fetch_conf = self.config.get("fetch_settings", {})
+        
+        # 初始化抓取器（RSSHub 源复用同一个 RSSFetcher 的连接池与并发控制）
+        user_agent = fetch_conf.get("user_agent")
+        fetcher = RSSFetcher(
+            user_agent=user_agent,
+            concurrency=fetch_conf.get("concurrency", 1),
+            per_host_concurrency=fetch_conf.get("per_host_concurrency", 4),
+            http_cache_file=fetch_conf.get("http_cache_file") if fetch_conf.get("conditional_get", False) else None,
+        )
+        rsshub_fetcher = RSSHubFetcher(user_agent=user_agent, fetcher=fetcher)
+        playwright_fetcher = PlaywrightSiteFetcher(user_agent=user_agent)
         hours_lookback = fetch_conf.get("hours_lookback", 24)
         start_time, end_time = self._extract_time_range(fetch_conf)
         
@@ -199,41 +213,24 @@ class SubjectBibliographyPipeline:
         
         articles = []
         
-        # 处理常规RSS源
-        if regular_feeds:
-            logger.info("开始抓取常规RSS源...")
-            regular_articles = fetcher.fetch_recent_articles(
-                regular_feeds,
+        # 常规RSS源与RSSHub源（转换为主实例+备用实例）一起并发抓取
+        rss_feeds = list(regular_feeds)
+        for rsshub_feed in rsshub_feeds:
+            rsshub_url = rsshub_feed.get("url")
+            try:
+                rss_feeds.append(rsshub_fetcher.build_feed_config(rsshub_url, rsshub_feed))
+            except Exception as e:
+                logger.error(f"解析RSSHub源 {rsshub_url} 时出错: {e}")
+        
+        if rss_feeds:
+            logger.info(f"开始抓取RSS源（并发度 {fetcher.concurrency}）...")
+            rss_articles = fetcher.fetch_recent_articles(
+                rss_feeds,
                 hours_lookback=hours_lookback,
                 start_time=start_time,
                 end_time=end_time,
             )
-            articles.extend(regular_articles)
-        
-        # 处理RSSHub源
-        if rsshub_feeds:
-            logger.info("开始抓取RSSHub源...")
-            for rsshub_feed in rsshub_feeds:
-                rsshub_url = rsshub_feed.get("url")
-                if rsshub_url:
-                    logger.info(f"抓取RSSHub源: {rsshub_feed.get('name', rsshub_url)}")
-                    try:
-                        result = rsshub_fetcher.fetch_rsshub_feed(
-                            rsshub_url=rsshub_url,
-                            feed_config=rsshub_feed,
-                            hours_lookback=hours_lookback,
-                            start_time=start_time,
-                            end_time=end_time,
-                        )
-                        
-                        if result and result.get('articles'):
-                            articles.extend(result['articles'])
-                            logger.info(f"RSSHub源 {rsshub_url} 成功获取 {len(result['articles'])} 篇文章")
-                        else:
-                            logger.warning(f"RSSHub源 {rsshub_url} 未获取到文章")
-                            
-                    except Exception as e:
-                        logger.error(f"抓取RSSHub源 {rsshub_url} 时出错: {e}")
+            articles.extend(rss_articles)
         
         # 处理Playwright网站
         if playwright_sites:
@@ -252,10 +249,15 @@ class SubjectBibliographyPipeline:
         
         if not articles:
             logger.info("未发现新文章，阶段1结束。")
+            fetcher.save_http_cache()
             return None
         
-        # 保存结果
+        # 保存结果；文章落盘后才持久化条件请求校验信息，保存失败时下次运行会重新抓取
         output_file = self.storage.save_fetch_results(articles)
+        if output_file:
+            fetcher.save_http_cache()
+        else:
+            logger.warning("阶段1结果保存失败，本次不更新条件请求缓存")
         
         logger.info("=" * 60)
         logger.info(f"阶段1完成，输出文件: {output_file}")
@@ -337,28 +339,33 @@ class SubjectBibliographyPipeline:
             logger.info("所有文章都已成功提取，跳过阶段2")
             return input_file
         
-        # 提取全文
+        # 提取全文（按提取器与域名分组并行，完成的结果定期落盘）
+        extract_conf = self.config.get("extraction_settings", {}) or {}
+        scheduler = ExtractionScheduler.from_config(extract_conf)
+        checkpoint_every = extract_conf.get("checkpoint_every", 20)
         logger.info(f"开始提取 {to_extract} 篇文章的全文...")
         
-        for i, article in enumerate(articles_to_extract):
+        outcomes = scheduler.run(articles_to_extract)
+        for i, (article, extractor, result, error) in enumerate(outcomes):
             source = article.get("source", "")
             title = article.get("title", "")
             
-            logger.info(f"正在处理 ({i+1}/{to_extract}): [{source}] {title}")
-            
-            # 获取对应的提取器
-            extractor = ExtractorFactory.get_extractor(source)
-            
             if extractor is None:
                 # 没有找到提取器，标记为跳过
                 article["full_text"] = ""
                 article["extract_status"] = "skipped"
                 article["extract_error"] = f"未找到适合源 '{source}' 的提取器"
                 logger.warning(f"未找到提取器: {source}")
+            elif error is not None:
+                article["full_text"] = ""
+                article["extract_status"] = "failed"
+                article["extract_error"] = f"提取异常: {str(error)}"
+                logger.error(f"提取异常: [{source}] {title} - {str(error)}")
             else:
-                # 执行提取
-                result = extractor.extract(article)
                 article.update(result)
+            
+            logger.info(f"已完成 ({i+1}/{to_extract}): [{source}] {title} -> {article.get('extract_status')}")
+            self._checkpoint_extract(articles, input_file, i + 1, to_extract, checkpoint_every)
         
         # 保存结果
         output_file = self.storage.save_extract_results(articles, input_file)
@@ -383,47 +390,43 @@ class SubjectBibliographyPipeline:
             retry_success_count = 0
             retry_failed_count = 0
             
-            for i, article in enumerate(failed_articles):
+            for article in failed_articles:
+                logger.debug(f"原始错误: [{article.get('source', '')}] {article.get('extract_error', '')}")
+            
+            outcomes = scheduler.run(failed_articles)
+            for i, (article, extractor, result, error) in enumerate(outcomes):
                 source = article.get("source", "")
                 title = article.get("title", "")
-                original_error = article.get("extract_error", "")
                 
                 logger.info(f"兜底重试 ({i+1}/{len(failed_articles)}): [{source}] {title}")
-                logger.debug(f"原始错误: {original_error}")
-                
-                # 获取对应的提取器
-                extractor = ExtractorFactory.get_extractor(source)
                 
                 if extractor is None:
                     # 没有找到提取器，保持失败状态
                     article["extract_error"] = f"兜底重试失败: 未找到适合源 '{source}' 的提取器"
                     retry_failed_count += 1
                     logger.warning(f"兜底重试失败，未找到提取器: {source}")
+                elif error is not None:
+                    retry_failed_count += 1
+                    article["extract_status"] = "failed"
+                    article["extract_error"] = f"兜底重试异常: {str(error)}"
+                    logger.error(f"✗ 兜底重试异常: {title} - {str(error)}")
                 else:
-                    # 清除之前的错误信息，重新执行提取
+                    # 清除之前的错误信息，写入重试结果
                     article["extract_error"] = ""
+                    article.update(result)
                     
-                    try:
-                        # 执行提取
-                        result = extractor.extract(article)
-                        article.update(result)
-                        
-                        # 检查重试结果
-                        if article.get("extract_status") == "success":
-                            retry_success_count += 1
-                            logger.info(f"✓ 兜底重试成功: {title}")
-                        else:
-                            retry_failed_count += 1
-                            # 在错误信息前添加"兜底重试失败"前缀
-                            current_error = article.get("extract_error", "")
-                            article["extract_error"] = f"兜底重试失败: {current_error}" if current_error else "兜底重试失败: 未知错误"
-                            logger.warning(f"✗ 兜底重试失败: {title} - {article.get('extract_error', 'N/A')}")
-                            
-                    except Exception as e:
+                    # 检查重试结果
+                    if article.get("extract_status") == "success":
+                        retry_success_count += 1
+                        logger.info(f"✓ 兜底重试成功: {title}")
+                    else:
                         retry_failed_count += 1
-                        article["extract_status"] = "failed"
-                        article["extract_error"] = f"兜底重试异常: {str(e)}"
-                        logger.error(f"✗ 兜底重试异常: {title} - {str(e)}")
+                        # 在错误信息前添加"兜底重试失败"前缀
+                        current_error = article.get("extract_error", "")
+                        article["extract_error"] = f"兜底重试失败: {current_error}" if current_error else "兜底重试失败: 未知错误"
+                        logger.warning(f"✗ 兜底重试失败: {title} - {article.get('extract_error', 'N/A')}")
+                
+                self._checkpoint_extract(articles, input_file, i + 1, len(failed_articles), checkpoint_every)
             
             # 重新保存包含重试结果的数据
             output_file = self.storage.save_extract_results(articles, input_file)
@@ -444,6 +447,24 @@ class SubjectBibliographyPipeline:
         
         return output_file
 
+    def _llm_concurrency(self, stage: str) -> int:
+        """读取 LLM 阶段并发数（llm_analysis.concurrency.<stage>，默认 1）"""
+        concurrency_conf = (self.config.get("llm_analysis", {}) or {}).get("concurrency", {}) or {}
+        return max(1, int(concurrency_conf.get(stage, 1)))
+
+    def _checkpoint_extract(
+        self,
+        articles: List[Dict],
+        input_file: str,
+        done: int,
+        total: int,
+        checkpoint_every: int,
+    ) -> None:
+        """每完成 checkpoint_every 篇保存一次提取结果（最后一篇由调用方保存），中断后重跑只需处理未完成的文章"""
+        if checkpoint_every and checkpoint_every > 0 and done % checkpoint_every == 0 and done < total:
+            self.storage.save_extract_results(articles, input_file)
+            logger.info(f"提取进度已保存: {done}/{total}")
+
     def run_stage_md_processing(self, md_directory: Optional[str] = None) -> Optional[str]:
         """
         MD文档处理阶段 - 读取本地MD文档并转换为标准格式
@@ -646,81 +667,22 @@ class SubjectBibliographyPipeline:
             saved_count = 0
             failed_count = 0
             
-            for i, article in enumerate(unprocessed_articles):
-                title = article.get("title", "无标题")
-                logger.info(f"正在过滤 ({i+1}/{to_filter}): {title}")
-                
-                # 获取文章内容,优先使用 full_text
-                full_text = article.get("full_text")
-                content = article.get("content")
-                
-                # 检查 full_text 是否为空（正文提取失败）
-                # 即使 content 有值，只要 full_text 为空就跳过，因为后续阶段依赖 full_text
-                if not full_text or str(full_text).strip() == '':
-                    logger.info(f"文章 '{title}' full_text 为空（正文提取失败），跳过过滤")
-                    processed_article = article.copy()
-                    processed_article["filter_status"] = "跳过"
-                    processed_article["filter_pass"] = False
-                    processed_article["filter_reason"] = "full_text为空，正文提取失败"
-                    processed_article["llm_skip_reason"] = "full_text为空，正文提取失败"
-                elif not content and not full_text:
-                    logger.info(f"文章 '{title}' 缺少 full_text 和 content 字段,跳过过滤")
-                    processed_article = article.copy()
-                    processed_article["filter_status"] = "跳过"
-                    processed_article["filter_pass"] = False
-                    processed_article["filter_reason"] = "缺少 full_text 和 content 字段"
-                    processed_article["llm_skip_reason"] = "缺少 full_text 和 content 字段"
-                else:
-                    # 优先使用 full_text,如果没有则使用 content
-                    text_content = full_text or content or ""
-                    
-                    # 执行过滤
-                    filter_result = filter_agent.filter(title, text_content)
-                    
-                    # 创建处理后的文章副本
+            filter_concurrency = self._llm_concurrency("filter")
+            if filter_concurrency > 1:
+                logger.info(f"并发过滤: {filter_concurrency} 路，结果按原顺序保存")
+            
+            outcomes = map_ordered(
+                lambda item: self._filter_article(filter_agent, item),
+                unprocessed_articles,
+                filter_concurrency,
+                "llm-filter",
+            )
+            for i, (article, processed_article, error) in enumerate(outcomes):
+                if error is not None:
+                    logger.warning(f"文章 '{article.get('title', '无标题')}' 过滤异常: {error}")
                     processed_article = article.copy()
-                    
-                    # 保存过滤结果
-                    processed_article["filter_pass"] = filter_result.get("pass", False)
-                    processed_article["filter_reason"] = filter_result.get("reason", "")
-                    filter_status_value = filter_result.get("status", "")
-                    processed_article["filter_status"] = filter_status_value
-                    
-                    # 添加调试日志：记录状态字段设置
-                    logger.debug(f"设置过滤状态 - 标题: {title}")
-                    logger.debug(f"  filter_status: '{filter_status_value}'")
-                    
-                    # 如果过滤失败,标记状态
-                    if filter_result.get("status") == "失败":
-                        logger.warning(f"文章 '{title}' 过滤失败: {filter_result.get('error')}")
-                        processed_article["filter_status"] = "失败"
-                        processed_article["llm_error"] = filter_result.get("error", "")
-                        logger.debug(f"  设置 filter_status: '失败'")
-                    # 如果未通过过滤,标记为拒绝
-                    elif not filter_result.get("pass", False):
-                        logger.info(f"文章 '{title}' 未通过过滤,理由: {filter_result.get('reason')}")
-                        processed_article["filter_status"] = "已拒绝"
-                        # 设置默认值
-                        processed_article["llm_score"] = 0
-                        processed_article["llm_primary_dimension"] = ""
-                        processed_article["llm_reason"] = filter_result.get("reason", "")
-                        processed_article["llm_tags"] = "[]"
-                        processed_article["llm_mentioned_books"] = "[]"
-                        processed_article["llm_topic_focus"] = ""
-                        processed_article["llm_thematic_essence"] = ""
-                        logger.debug(f"  设置 filter_status: '已拒绝'")
-                    else:
-                        # 通过过滤，但暂不进行深度分析
-                        logger.info(f"文章 '{title}' 通过过滤")
-                        processed_article["filter_status"] = "成功"
-                        processed_article["llm_score"] = 0  # 暂时设为0，等待后续分析
-                        processed_article["llm_primary_dimension"] = ""
-                        processed_article["llm_reason"] = ""
-                        processed_article["llm_tags"] = "[]"
-                        processed_article["llm_mentioned_books"] = "[]"
-                        processed_article["llm_topic_focus"] = ""
-                        processed_article["llm_thematic_essence"] = ""
-                        logger.debug(f"  设置 filter_status: '成功'")
+                    processed_article["filter_status"] = "失败"
+                    processed_article["llm_error"] = str(error)
                 
                 # 立即保存当前文章的过滤结果
                 try:
@@ -741,6 +703,84 @@ class SubjectBibliographyPipeline:
         
         return output_file
 
+    def _filter_article(self, filter_agent, article: Dict) -> Dict:
+        """对单篇文章执行初筛，返回带过滤结果的文章副本（可在工作线程中调用）"""
+        title = article.get("title", "无标题")
+        
+        # 获取文章内容,优先使用 full_text
+        full_text = article.get("full_text")
+        content = article.get("content")
+        
+        # 检查 full_text 是否为空（正文提取失败）
+        # 即使 content 有值，只要 full_text 为空就跳过，因为后续阶段依赖 full_text
+        if not full_text or str(full_text).strip() == '':
+            logger.info(f"文章 '{title}' full_text 为空（正文提取失败），跳过过滤")
+            processed_article = article.copy()
+            processed_article["filter_status"] = "跳过"
+            processed_article["filter_pass"] = False
+            processed_article["filter_reason"] = "full_text为空，正文提取失败"
+            processed_article["llm_skip_reason"] = "full_text为空，正文提取失败"
+        elif not content and not full_text:
+            logger.info(f"文章 '{title}' 缺少 full_text 和 content 字段,跳过过滤")
+            processed_article = article.copy()
+            processed_article["filter_status"] = "跳过"
+            processed_article["filter_pass"] = False
+            processed_article["filter_reason"] = "缺少 full_text 和 content 字段"
+            processed_article["llm_skip_reason"] = "缺少 full_text 和 content 字段"
+        else:
+            # 优先使用 full_text,如果没有则使用 content
+            text_content = full_text or content or ""
+            
+            # 执行过滤
+            filter_result = filter_agent.filter(title, text_content)
+            
+            # 创建处理后的文章副本
+            processed_article = article.copy()
+            
+            # 保存过滤结果
+            processed_article["filter_pass"] = filter_result.get("pass", False)
+            processed_article["filter_reason"] = filter_result.get("reason", "")
+            filter_status_value = filter_result.get("status", "")
+            processed_article["filter_status"] = filter_status_value
+            
+            # 添加调试日志：记录状态字段设置
+            logger.debug(f"设置过滤状态 - 标题: {title}")
+            logger.debug(f"  filter_status: '{filter_status_value}'")
+            
+            # 如果过滤失败,标记状态
+            if filter_result.get("status") == "失败":
+                logger.warning(f"文章 '{title}' 过滤失败: {filter_result.get('error')}")
+                processed_article["filter_status"] = "失败"
+                processed_article["llm_error"] = filter_result.get("error", "")
+                logger.debug(f"  设置 filter_status: '失败'")
+            # 如果未通过过滤,标记为拒绝
+            elif not filter_result.get("pass", False):
+                logger.info(f"文章 '{title}' 未通过过滤,理由: {filter_result.get('reason')}")
+                processed_article["filter_status"] = "已拒绝"
+                # 设置默认值
+                processed_article["llm_score"] = 0
+                processed_article["llm_primary_dimension"] = ""
+                processed_article["llm_reason"] = filter_result.get("reason", "")
+                processed_article["llm_tags"] = "[]"
+                processed_article["llm_mentioned_books"] = "[]"
+                processed_article["llm_topic_focus"] = ""
+                processed_article["llm_thematic_essence"] = ""
+                logger.debug(f"  设置 filter_status: '已拒绝'")
+            else:
+                # 通过过滤，但暂不进行深度分析
+                logger.info(f"文章 '{title}' 通过过滤")
+                processed_article["filter_status"] = "成功"
+                processed_article["llm_score"] = 0  # 暂时设为0，等待后续分析
+                processed_article["llm_primary_dimension"] = ""
+                processed_article["llm_reason"] = ""
+                processed_article["llm_tags"] = "[]"
+                processed_article["llm_mentioned_books"] = "[]"
+                processed_article["llm_topic_focus"] = ""
+                processed_article["llm_thematic_essence"] = ""
+                logger.debug(f"  设置 filter_status: '成功'")
+        
+        return processed_article
+
     def run_stage_summary(self, input_file: Optional[str] = None) -> Optional[str]:
         """
         阶段4: LLM总结
@@ -768,7 +808,7 @@ class SubjectBibliographyPipeline:
                 return None
             logger.info(f"使用指定文件: {input_file}")
 
-        runner = ArticleSummaryRunner(self.storage)
+        runner = ArticleSummaryRunner(self.storage, concurrency=self._llm_concurrency("summary"))
         output_file = runner.run(input_file)
 
         if output_file:
@@ -808,7 +848,7 @@ class SubjectBibliographyPipeline:
                 return None
             logger.info(f"使用指定文件: {input_file}")
 
-        runner = ArticleAnalysisRunner(self.storage)
+        runner = ArticleAnalysisRunner(self.storage, concurrency=self._llm_concurrency("analysis"))
         output_file = runner.run(input_file)
 
         if output_file:
@@ -872,6 +912,8 @@ class SubjectBibliographyPipeline:
             logger.error("阶段5失败，流程终止")
             return
         
+        analysis_output = self.export_stage_excel(analysis_output) or analysis_output
+
         logger.info("=" * 60)
         logger.info("完整流程执行完毕！")
         logger.info(f"最终结果文件: {analysis_output}")
@@ -984,15 +1026,15 @@ def run_pipeline(stage: str = "all", input_file: Optional[str] = None, min_score
     pipeline = SubjectBibliographyPipeline()
 
     if stage == "fetch":
-        pipeline.run_stage_fetch()
+        pipeline.export_stage_excel(pipeline.run_stage_fetch())
     elif stage == "extract":
-        pipeline.run_stage_extract(input_file)
+        pipeline.export_stage_excel(pipeline.run_stage_extract(input_file))
     elif stage == "filter":
-        pipeline.run_stage_filter(input_file)
+        pipeline.export_stage_excel(pipeline.run_stage_filter(input_file))
     elif stage == "summary":
-        pipeline.run_stage_summary(input_file)
+        pipeline.export_stage_excel(pipeline.run_stage_summary(input_file))
     elif stage == "analysis":
-        pipeline.run_stage_analysis(input_file)
+        pipeline.export_stage_excel(pipeline.run_stage_analysis(input_file))
     elif stage == "cross":
         # cross 是异步函数，需要特殊处理
         import asyncio
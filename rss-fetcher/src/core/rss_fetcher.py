@@ -1,23 +1,115 @@
 """RSS 抓取模块"""
 
+import json
+import os
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 import feedparser
 from dateutil import parser as date_parser
+from requests.adapters import HTTPAdapter
 
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# _fetch_with_retry 在服务器返回 304 时使用的错误信息
+NOT_MODIFIED = "not_modified"
+
+
+class FeedHTTPCache:
+    """持久化各 URL 的 ETag / Last-Modified，用于条件请求"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except Exception as e:
+                logger.warning(f"读取RSS缓存文件失败，忽略: {path} ({e})")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url: str, response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            if etag or last_modified:
+                self._entries[url] = {"etag": etag or "", "last_modified": last_modified or ""}
+            else:
+                self._entries.pop(url, None)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = dict(self._entries)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.warning(f"保存RSS缓存文件失败: {self.path} ({e})")
+
 
 class RSSFetcher:
-    """负责从 RSS 源抓取并解析文章，支持重试和备用URL机制。"""
+    """负责从 RSS 源抓取并解析文章，支持重试、备用URL、并发抓取与条件请求。"""
 
-    def __init__(self, user_agent: Optional[str] = None):
+    def __init__(
+        self,
+        user_agent: Optional[str] = None,
+        concurrency: int = 1,
+        per_host_concurrency: int = 4,
+        http_cache_file: Optional[str] = None,
+    ):
+        """
+        Args:
+            user_agent: 请求使用的 User-Agent
+            concurrency: 同时抓取的源数量上限
+            per_host_concurrency: 同一主机同时进行的请求数上限
+            http_cache_file: ETag/Last-Modified 持久化文件，None 表示不使用条件请求
+        """
         self.user_agent = user_agent or "Mozilla/5.0 (compatible; LibraryAI/1.0)"
         self.article_counter = 0  # 用于生成顺序号
+        self.concurrency = max(1, int(concurrency))
+        self.per_host_concurrency = max(1, int(per_host_concurrency))
+        self.http_cache = FeedHTTPCache(http_cache_file) if http_cache_file else None
+        self.feed_stats: List[Dict] = []  # 最近一次 fetch_recent_articles 的逐源统计
+
+        # 复用连接：连接池大小与并发度匹配
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._counter_lock = threading.Lock()
+        self._host_lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> threading.Semaphore:
+        """获取 URL 所属主机的并发信号量"""
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.per_host_concurrency)
+                self._host_semaphores[host] = semaphore
+            return semaphore
         
     def _generate_article_id(self) -> str:
         """
@@ -30,11 +122,13 @@ class RSSFetcher:
         import random
         
         timestamp = int(time.time())
-        self.article_counter += 1
+        with self._counter_lock:
+            self.article_counter += 1
+            counter = self.article_counter
         
         # 添加随机数来确保跨实例的唯一性
         random_suffix = random.randint(0, 99)
-        return f"{timestamp}{self.article_counter:02d}{random_suffix:02d}"
+        return f"{timestamp}{counter:02d}{random_suffix:02d}"
 
     def _get_retry_config(self, feed_conf: Dict) -> Dict:
         """获取重试配置，默认值"""
@@ -48,12 +142,18 @@ class RSSFetcher:
         default_config.update(retry_config)
         return default_config
     
-    def _fetch_with_retry(self, url: str, name: str, retry_config: Dict) -> Tuple[bool, Optional[feedparser.FeedParserDict], str]:
+    def _fetch_with_retry(
+        self, url: str, name: str, retry_config: Dict, conditional: bool = True
+    ) -> Tuple[bool, Optional[feedparser.FeedParserDict], str]:
         """
         带重试机制的RSS获取
+
+        Args:
+            conditional: 是否使用并更新 ETag/Last-Modified；指定时间范围回补时为 False，
+                避免 304 跳过窗口内文章，也避免窗口外被过滤的文章在下次常规抓取时被 304 跳过
         
         Returns:
-            Tuple[是否成功, feed对象, 错误信息]
+            Tuple[是否成功, feed对象, 错误信息]；服务器返回 304 时为 (True, None, NOT_MODIFIED)
         """
         max_retries = retry_config.get("max_retries", 3)
         retry_delay = retry_config.get("retry_delay", 2)
@@ -65,12 +165,16 @@ class RSSFetcher:
             try:
                 logger.debug(f"尝试获取 RSS {name} (尝试 {attempt + 1}/{max_retries + 1}): {url}")
                 
-                # 使用 requests 获取内容，手动控制超时
-                response = requests.get(
-                    url, 
-                    headers={"User-Agent": self.user_agent}, 
-                    timeout=timeout
-                )
+                headers = {"User-Agent": self.user_agent}
+                if self.http_cache and conditional:
+                    headers.update(self.http_cache.conditional_headers(url))
+
+                # 使用共享 session 获取内容（连接复用），手动控制超时
+                with self._host_semaphore(url):
+                    response = self.session.get(url, headers=headers, timeout=timeout)
+                if response.status_code == 304:
+                    logger.info(f"RSS {name} 未更新 (304)，跳过")
+                    return True, None, NOT_MODIFIED
                 response.raise_for_status()
                 
                 # 使用 feedparser 解析内容
@@ -81,6 +185,8 @@ class RSSFetcher:
                     # 如果只是格式警告但有entries，可能是可用的
                     if hasattr(feed, 'entries') and len(feed.entries) > 0:
                         logger.warning(f"RSS {name} 解析时有警告但有内容: {feed.bozo_exception}")
+                        if self.http_cache and conditional:
+                            self.http_cache.update(url, response)
                         return True, feed, ""
                     else:
                         last_error = f"解析失败: {feed.bozo_exception}"
@@ -97,6 +203,8 @@ class RSSFetcher:
                         return False, None, last_error
                 
                 logger.info(f"成功获取 RSS {name}: {len(feed.entries)} 篇文章")
+                if self.http_cache and conditional:
+                    self.http_cache.update(url, response)
                 return True, feed, ""
                 
             except requests.exceptions.Timeout:
@@ -129,6 +237,9 @@ class RSSFetcher:
         """
         获取指定时间范围内的文章。
 
+        各源在线程池中并发抓取（同一主机受 per_host_concurrency 限制），
+        结果按 feeds 的原始顺序合并；逐源耗时记录在 self.feed_stats。
+
         Args:
             feeds: RSS源列表，每个元素包含 'name' 和 'url'。
             hours_lookback: 回溯时间（小时）。
@@ -137,97 +248,42 @@ class RSSFetcher:
 
         Returns:
             文章列表，每篇文章是一个字典。
+
+        条件请求的校验信息只在内存中更新，调用方保存文章成功后再调用 save_http_cache() 落盘，
+        否则保存失败时下次运行会收到 304 而丢失这些文章。
         """
-        articles = []
         cutoff_time = None
         if not start_time and not end_time:
             cutoff_time = datetime.now() - timedelta(hours=hours_lookback)
         # 转换为 UTC 时间戳以便比较 (feedparser 解析的时间通常是 struct_time)
         # 这里简化处理，统一转换为 datetime 对象比较
 
-        for feed_conf in feeds:
-            if not feed_conf.get("enabled", True):
-                continue
+        active_feeds = [feed_conf for feed_conf in feeds if feed_conf.get("enabled", True)]
 
-            name = feed_conf.get("name", "Unknown")
-            url = feed_conf.get("url")
-            
-            if not url:
-                logger.warning(f"RSS源 {name} 未配置 URL，跳过。")
-                continue
+        started = time.perf_counter()
+        if self.concurrency > 1 and len(active_feeds) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(active_feeds)),
+                thread_name_prefix="rss-fetch",
+            ) as executor:
+                results = list(executor.map(
+                    lambda feed_conf: self._fetch_single_feed(feed_conf, cutoff_time, start_time, end_time),
+                    active_feeds,
+                ))
+        else:
+            results = [
+                self._fetch_single_feed(feed_conf, cutoff_time, start_time, end_time)
+                for feed_conf in active_feeds
+            ]
+        wall_time = time.perf_counter() - started
 
-            logger.info(f"正在抓取 RSS: {name}")
-            
-            # 获取重试配置
-            retry_config = self._get_retry_config(feed_conf)
-            
-            # 构建URL列表：主URL + 备用URL
-            urls_to_try = [url]
-            backup_urls = feed_conf.get("backup_urls", [])
-            if backup_urls:
-                urls_to_try.extend(backup_urls)
-            
-            feed = None
-            used_url = None
-            success = False
-            error_messages = []
-            
-            # 尝试所有URL
-            for try_url in urls_to_try:
-                logger.info(f"  -> 尝试 URL: {try_url}")
-                
-                success, parsed_feed, error_msg = self._fetch_with_retry(try_url, name, retry_config)
-                
-                if success and parsed_feed:
-                    feed = parsed_feed
-                    used_url = try_url
-                    break
-                else:
-                    error_messages.append(f"{try_url}: {error_msg}")
-                    if try_url != urls_to_try[-1]:  # 不是最后一个URL
-                        logger.info(f"  -> 尝试下一个备用URL...")
-            
-            if not success:
-                logger.error(f"RSS {name} 所有URL都失败: {'; '.join(error_messages)}")
-                continue
-            
-            # 处理成功获取的feed
-            if used_url != url:
-                logger.info(f"RSS {name} 使用备用URL成功: {used_url}")
-            
-            try:
-                # 处理解析警告
-                if feed.bozo:
-                    logger.warning(f"解析 RSS {name} 时遇到潜在问题: {feed.bozo_exception}")
-
-                for entry in feed.entries:
-                    published_dt = self._parse_date(entry)
-
-                    if not published_dt:
-                        # 如果无法解析时间，默认保留（或者可以选择丢弃）
-                        # 这里选择保留，但记录日志
-                        logger.debug(f"无法解析文章时间: {entry.get('title', 'No Title')}, 默认保留。")
-                        published_dt = datetime.now() # 作为一个 fallback，或者设为 None
-
-                    # 如果时间有效且在范围内
-                    if published_dt and self._is_within_range(
-                        published_dt, cutoff_time, start_time, end_time
-                    ):
-                        article = {
-                            "id": self._generate_article_id(),
-                            "source": name,
-                            "title": entry.get("title", ""),
-                            "link": entry.get("link", ""),
-                            "published_date": published_dt.strftime("%Y-%m-%d %H:%M:%S"),
-                            "fetch_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "summary": self._clean_summary(entry),
-                            "content": self._get_content(entry)
-                        }
-                        articles.append(article)
-                        
-            except Exception as e:
-                logger.error(f"处理 RSS {name} 数据时失败: {e}")
-                continue
+        articles = []
+        self.feed_stats = []
+        for feed_articles, stat in results:
+            articles.extend(feed_articles)
+            self.feed_stats.append(stat)
+
+        self._log_feed_stats(wall_time)
 
         if start_time or end_time:
             logger.info(
@@ -238,6 +294,143 @@ class RSSFetcher:
             logger.info(f"共抓取到 {len(articles)} 篇 {hours_lookback} 小时内的文章。")
         return articles
 
+    def save_http_cache(self) -> None:
+        """持久化本次抓取得到的 ETag/Last-Modified（应在文章保存成功之后调用）"""
+        if self.http_cache:
+            self.http_cache.save()
+
+    def _fetch_single_feed(
+        self,
+        feed_conf: Dict,
+        cutoff_time: Optional[datetime],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        抓取单个源（含备用URL）并筛选时间范围内的文章
+
+        Returns:
+            Tuple[文章列表, 统计信息]
+        """
+        name = feed_conf.get("name", "Unknown")
+        url = feed_conf.get("url")
+        started = time.perf_counter()
+        stat = {"name": name, "url": url, "used_url": None, "status": "failed",
+                "articles": 0, "elapsed": 0.0, "error": ""}
+        articles = []
+
+        def finish():
+            stat["elapsed"] = round(time.perf_counter() - started, 3)
+            stat["articles"] = len(articles)
+            return articles, stat
+
+        if not url:
+            logger.warning(f"RSS源 {name} 未配置 URL，跳过。")
+            stat["status"] = "skipped"
+            return finish()
+
+        logger.info(f"正在抓取 RSS: {name}")
+        
+        # 获取重试配置
+        retry_config = self._get_retry_config(feed_conf)
+        
+        # 构建URL列表：主URL + 备用URL
+        urls_to_try = [url]
+        backup_urls = feed_conf.get("backup_urls", [])
+        if backup_urls:
+            urls_to_try.extend(backup_urls)
+        
+        feed = None
+        used_url = None
+        success = False
+        error_messages = []
+        
+        # 尝试所有URL
+        for try_url in urls_to_try:
+            logger.info(f"  -> 尝试 URL: {try_url}")
+            
+            success, parsed_feed, error_msg = self._fetch_with_retry(
+                try_url, name, retry_config, conditional=not (start_time or end_time)
+            )
+            
+            if success and error_msg == NOT_MODIFIED:
+                stat.update(status=NOT_MODIFIED, used_url=try_url)
+                return finish()
+            if success and parsed_feed:
+                feed = parsed_feed
+                used_url = try_url
+                break
+            else:
+                error_messages.append(f"{try_url}: {error_msg}")
+                if try_url != urls_to_try[-1]:  # 不是最后一个URL
+                    logger.info(f"  -> 尝试下一个备用URL...")
+        
+        if not success:
+            logger.error(f"RSS {name} 所有URL都失败: {'; '.join(error_messages)}")
+            stat["error"] = "; ".join(error_messages)
+            return finish()
+        
+        # 处理成功获取的feed
+        if used_url != url:
+            logger.info(f"RSS {name} 使用备用URL成功: {used_url}")
+        stat["used_url"] = used_url
+        
+        try:
+            # 处理解析警告
+            if feed.bozo:
+                logger.warning(f"解析 RSS {name} 时遇到潜在问题: {feed.bozo_exception}")
+
+            for entry in feed.entries:
+                published_dt = self._parse_date(entry)
+
+                if not published_dt:
+                    # 如果无法解析时间，默认保留（或者可以选择丢弃）
+                    # 这里选择保留，但记录日志
+                    logger.debug(f"无法解析文章时间: {entry.get('title', 'No Title')}, 默认保留。")
+                    published_dt = datetime.now() # 作为一个 fallback，或者设为 None
+
+                # 如果时间有效且在范围内
+                if published_dt and self._is_within_range(
+                    published_dt, cutoff_time, start_time, end_time
+                ):
+                    article = {
+                        "id": self._generate_article_id(),
+                        "source": name,
+                        "title": entry.get("title", ""),
+                        "link": entry.get("link", ""),
+                        "published_date": published_dt.strftime("%Y-%m-%d %H:%M:%S"),
+                        "fetch_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "summary": self._clean_summary(entry),
+                        "content": self._get_content(entry)
+                    }
+                    articles.append(article)
+            stat["status"] = "ok"
+                    
+        except Exception as e:
+            logger.error(f"处理 RSS {name} 数据时失败: {e}")
+            stat.update(status="failed", error=str(e))
+
+        return finish()
+
+    def _log_feed_stats(self, wall_time: float) -> None:
+        """输出本轮抓取的逐源统计"""
+        if not self.feed_stats:
+            return
+        counts: Dict[str, int] = {}
+        for stat in self.feed_stats:
+            counts[stat["status"]] = counts.get(stat["status"], 0) + 1
+        total_latency = sum(stat["elapsed"] for stat in self.feed_stats)
+        slowest = max(self.feed_stats, key=lambda stat: stat["elapsed"])
+        logger.info(
+            f"RSS抓取统计: {len(self.feed_stats)} 个源, 状态 {counts}, "
+            f"总耗时 {wall_time:.2f}s (逐源耗时合计 {total_latency:.2f}s, "
+            f"最慢 {slowest['name']} {slowest['elapsed']:.2f}s)"
+        )
+        for stat in sorted(self.feed_stats, key=lambda stat: stat["elapsed"], reverse=True):
+            logger.debug(
+                f"  {stat['name']}: {stat['status']}, {stat['articles']} 篇, {stat['elapsed']:.2f}s"
+            )
+
     def _parse_date(self, entry) -> Optional[datetime]:
         """尝试解析发布时间，统一转换为本地时间。"""
         import pytz
@@ -24,14 +24,15 @@ class RSSHubFetcher:
         "https://rsshub.iowen.cn",  # 备用镜像2
     ]
     
-    def __init__(self, user_agent: Optional[str] = None):
+    def __init__(self, user_agent: Optional[str] = None, fetcher: Optional[RSSFetcher] = None):
         """初始化 RSSHub fetcher
         
         Args:
             user_agent: 可选的用户代理字符串
+            fetcher: 可选的 RSSFetcher，传入时复用其连接池、并发与条件请求设置
         """
         self.user_agent = user_agent
-        self.fallback_fetcher = RSSFetcher(user_agent)
+        self.fallback_fetcher = fetcher or RSSFetcher(user_agent)
     
     def is_rsshub_url(self, url: str) -> bool:
         """检查 URL 是否是 rsshub:// 协议
@@ -96,6 +97,31 @@ class RSSHubFetcher:
         logger.debug(f"转换 rsshub:// URL: {rsshub_url} -> {http_url}")
         return http_url
     
+    def build_feed_config(self, rsshub_url: str, feed_config: Optional[Dict] = None) -> Dict:
+        """将 rsshub:// 源转换为 RSSFetcher 可用的源配置
+        
+        第一个 RSSHub 实例作为主 URL，其余实例作为备用 URL，
+        这样 RSSHub 源可以与常规源一起交给 RSSFetcher 并发抓取
+        
+        Args:
+            rsshub_url: rsshub:// 协议的 URL
+            feed_config: RSS 源配置（可选）
+            
+        Returns:
+            dict: 包含 name/url/backup_urls 的源配置
+        """
+        parsed = self.parse_rsshub_url(rsshub_url)
+        feed_config = feed_config or {}
+        instance_urls = [self.convert_to_http_url(rsshub_url, instance) for instance in self.RSSHUB_INSTANCES]
+        
+        converted = dict(feed_config)
+        converted.update({
+            "name": feed_config.get("name", f"RSSHub-{parsed['service']}"),
+            "url": instance_urls[0],
+            "backup_urls": instance_urls[1:],
+        })
+        return converted
+    
     def fetch_rsshub_feed(
         self,
         rsshub_url: str,
@@ -127,22 +153,13 @@ class RSSHubFetcher:
             logger.error(f"解析 rsshub:// URL 失败: {e}")
             return None
         
-        # 准备 RSS 源配置
-        name = feed_config.get("name", f"RSSHub-{parsed['service']}") if feed_config else f"RSSHub-{parsed['service']}"
-        
-        # 构建 URL 列表：主 RSSHub 实例 + 备用实例
-        urls_to_try = []
-        for instance in self.RSSHUB_INSTANCES:
-            http_url = self.convert_to_http_url(rsshub_url, instance)
-            urls_to_try.append({
-                "name": f"{name} ({instance.replace('https://', '').replace('http://', '')})",
-                "url": http_url,
-                "backup_urls": []  # 在这里清空，因为我们已经准备了多个实例
-            })
+        # 主 RSSHub 实例 + 备用实例，依次尝试直到成功
+        converted = self.build_feed_config(rsshub_url, feed_config)
+        name = converted["name"]
         
         # 使用现有的 RSS fetcher
         articles = self.fallback_fetcher.fetch_recent_articles(
-            feeds=urls_to_try,
+            feeds=[converted],
             hours_lookback=hours_lookback,
             start_time=start_time,
             end_time=end_time
@@ -0,0 +1,146 @@
+"""阶段数据 SQLite 存储后端
+
+替代整文件读写的 Excel：每个按月阶段文件对应一个 .db，行以 JSON 保存（各阶段列不固定），
+写入时与库中现有行比对，只对新增/变化/删除的行执行 INSERT/UPDATE/DELETE。
+Excel 仅作为流程结束后的导出格式。
+"""
+
+import json
+import math
+import os
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 行号字段：读取时附加到记录上，写回时用于定位行，不作为数据列保存
+ROW_ID = "_row_id"
+
+
+def _to_jsonable(value):
+    """
+    将 pandas/numpy 值转换为可 JSON 序列化的 Python 值
+
+    空值（含空字符串）统一为 None，与 Excel 写入再读取后得到 NaN 的行为一致
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or value is pd.NaT or value == "":
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class SQLiteStageStore:
+    """SQLite 阶段数据存储"""
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                data TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        return conn
+
+    def load(self, path: str) -> Tuple[List[str], List[Dict]]:
+        """
+        读取全部行
+
+        Returns:
+            (列顺序, 记录列表)。空值还原为 NaN，与 pd.read_excel 的结果保持一致；
+            每条记录带 ROW_ID 字段
+        """
+        conn = self._connect(path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'columns'").fetchone()
+            columns = json.loads(row[0]) if row else []
+            records = []
+            for row_id, data in conn.execute("SELECT row_id, data FROM rows ORDER BY row_id"):
+                record = {col: np.nan for col in columns}
+                for key, value in json.loads(data).items():
+                    record[key] = np.nan if value is None else value
+                record[ROW_ID] = row_id
+                records.append(record)
+            return columns, records
+        finally:
+            conn.close()
+
+    def save(self, path: str, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        写入 DataFrame（行级增量）
+
+        带 ROW_ID 的行与库中内容比对，变化才 UPDATE；无 ROW_ID 的行 INSERT；
+        库中存在但本次未出现的行 DELETE，使结果与整表覆盖写入一致
+
+        Returns:
+            {'inserted': n, 'updated': n, 'deleted': n}
+        """
+        columns = [col for col in df.columns if col != ROW_ID]
+        conn = self._connect(path)
+        try:
+            existing = dict(conn.execute("SELECT row_id, data FROM rows"))
+            inserts, updates, seen = [], [], set()
+
+            for record in df.to_dict("records"):
+                row_id = _to_jsonable(record.get(ROW_ID))
+                data = json.dumps(
+                    {col: _to_jsonable(record.get(col)) for col in columns},
+                    ensure_ascii=False,
+                )
+                if row_id is not None and int(row_id) in existing and int(row_id) not in seen:
+                    row_id = int(row_id)
+                    seen.add(row_id)
+                    if existing[row_id] != data:
+                        updates.append((data, row_id))
+                else:
+                    inserts.append((data,))
+
+            deletes = [(row_id,) for row_id in existing if row_id not in seen]
+
+            with conn:
+                if deletes:
+                    conn.executemany("DELETE FROM rows WHERE row_id = ?", deletes)
+                if updates:
+                    conn.executemany("UPDATE rows SET data = ? WHERE row_id = ?", updates)
+                if inserts:
+                    conn.executemany("INSERT INTO rows (data) VALUES (?)", inserts)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('columns', ?)",
+                    (json.dumps(columns, ensure_ascii=False),),
+                )
+            return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
+        finally:
+            conn.close()
+
+    def export_excel(self, path: str, excel_path: Optional[str] = None) -> str:
+        """导出为 Excel（默认与 .db 同名同目录）"""
+        columns, records = self.load(path)
+        excel_path = excel_path or os.path.splitext(path)[0] + ".xlsx"
+        df = pd.DataFrame(records, columns=columns)
+        df.to_excel(excel_path, index=False)
+        logger.info(f"阶段数据已导出为Excel: {excel_path} (共 {len(records)} 条记录)")
+        return excel_path
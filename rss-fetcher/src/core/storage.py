@@ -3,14 +3,69 @@
 import os
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 from src.utils.logger import get_logger
+from .stage_store import ROW_ID, SQLiteStageStore
 
 logger = get_logger(__name__)
 
 
+def _norm(value) -> str:
+    """字段归一化：空值视为空串，去除首尾空白"""
+    return str(value or "").strip()
+
+
+class ArticleDedupIndex:
+    """
+    文章去重索引
+
+    用 id / link / title+published_date 三个哈希集合实现 O(1) 查重。
+    判定规则：id 相同即重复；否则有 URL 时按 URL 判断，没有 URL 时按 title + published_date 判断
+    """
+
+    def __init__(self, articles: Iterable[Dict] = ()):
+        self.ids = set()
+        self.links = set()
+        self.title_date_keys = set()
+        for article in articles:
+            self.add(article)
+
+    @staticmethod
+    def _title_date_key(article: Dict) -> str:
+        return f"{_norm(article.get('title', ''))}_{str(article.get('published_date', '') or '')}"
+
+    def add(self, article: Dict) -> None:
+        """将文章加入索引"""
+        article_id = _norm(article.get("id", ""))
+        if article_id:
+            self.ids.add(article_id)
+        link = _norm(article.get("link", ""))
+        if link:
+            self.links.add(link)
+        self.title_date_keys.add(self._title_date_key(article))
+
+    def contains(self, article: Dict) -> bool:
+        """判断文章是否已存在"""
+        article_id = _norm(article.get("id", ""))
+        if article_id and article_id in self.ids:
+            return True
+
+        link = _norm(article.get("link", ""))
+        if link:
+            # 有URL时只按URL判断
+            return link in self.links
+        # 没有URL时使用 title + published_date 作为唯一标识
+        return self._title_date_key(article) in self.title_date_keys
+
+    def __len__(self) -> int:
+        return len(self.title_date_keys)
+
+
 class StorageManager:
-    """负责将各阶段结果保存到 Excel 文件"""
+    """负责保存各阶段结果（Excel 或 SQLite 后端）"""
+
+    # 存储后端 -> 阶段文件扩展名
+    BACKEND_EXTENSIONS = {"excel": ".xlsx", "sqlite": ".db"}
 
     # 定义标准字段顺序常量，确保各阶段字段顺序一致
     STANDARD_COLUMNS = {
@@ -48,8 +103,19 @@ class StorageManager:
 
     BOOLEAN_COLUMNS = ["filter_pass"]
 
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, backend: str = "excel"):
+        """
+        Args:
+            output_dir: 输出目录
+            backend: 存储后端，excel（整文件读写）或 sqlite（行级增量写入，Excel 仅用于导出）
+        """
         self.output_dir = output_dir
+        if backend not in self.BACKEND_EXTENSIONS:
+            logger.warning(f"未知的存储后端: {backend}，使用 excel")
+            backend = "excel"
+        self.backend = backend
+        self.file_ext = self.BACKEND_EXTENSIONS[backend]
+        self.stage_store = SQLiteStageStore() if backend == "sqlite" else None
         
         if not os.path.exists(self.output_dir):
             try:
@@ -67,7 +133,7 @@ class StorageManager:
             articles: 文章列表，用于确定月份范围
             
         Returns:
-            文件完整路径 (格式: YYYY-MM.xlsx)
+            文件完整路径 (格式: YYYY-MM.xlsx，sqlite 后端为 YYYY-MM.db)
         """
         if articles and len(articles) > 0:
             # 根据文章发布时间确定月份
@@ -95,7 +161,7 @@ class StorageManager:
             # 默认使用当前月份
             month_str = datetime.now().strftime("%Y-%m")
         
-        filename = f"{month_str}.xlsx"
+        filename = f"{month_str}{self.file_ext}"
         return os.path.join(self.output_dir, filename)
 
     def _get_existing_data(self, filepath: str) -> List[Dict]:
@@ -108,12 +174,11 @@ class StorageManager:
         Returns:
             现有文章列表，读取失败返回空列表
         """
-        if not os.path.exists(filepath):
+        if not self._exists(filepath):
             return []
         
         try:
-            df = pd.read_excel(filepath)
-            existing_articles = df.to_dict("records")
+            existing_articles = self._read_records(filepath)
             logger.info(f"读取现有数据: {filepath} (共 {len(existing_articles)} 条记录)")
             return existing_articles
         except Exception as e:
@@ -169,6 +234,67 @@ class StorageManager:
                 continue
         return df
 
+    def _resolve_path(self, filepath: str) -> str:
+        """
+        将阶段文件路径映射到当前后端的物理文件
+
+        sqlite 后端下 .xlsx 路径（如命令行 --input）映射为同名 .db，
+        .db 不存在而 Excel 存在时先导入一次
+        """
+        if self.backend != "sqlite" or not filepath.endswith(".xlsx"):
+            return filepath
+
+        db_path = filepath[:-len(".xlsx")] + self.file_ext
+        if not os.path.exists(db_path) and os.path.exists(filepath):
+            df = pd.read_excel(filepath)
+            self.stage_store.save(db_path, df)
+            logger.info(f"已将Excel导入SQLite阶段存储: {filepath} -> {db_path} (共 {len(df)} 条记录)")
+        return db_path
+
+    def _exists(self, filepath: str) -> bool:
+        return os.path.exists(self._resolve_path(filepath))
+
+    def _read_records(self, filepath: str) -> List[Dict]:
+        """读取阶段文件的全部记录（sqlite 后端的记录带 ROW_ID，用于写回时定位行）"""
+        path = self._resolve_path(filepath)
+        if self.backend == "sqlite":
+            _, records = self.stage_store.load(path)
+            return records
+        return pd.read_excel(path).to_dict("records")
+
+    def _write_frame(self, df: pd.DataFrame, filepath: str) -> None:
+        """写入阶段文件：excel 整文件覆盖，sqlite 只写变化的行"""
+        path = self._resolve_path(filepath)
+        if self.backend == "sqlite":
+            stats = self.stage_store.save(path, df)
+            logger.debug(f"阶段存储写入: {path} {stats}")
+        else:
+            df.to_excel(path, index=False)
+
+    def export_excel(self, filepath: Optional[str]) -> Optional[str]:
+        """
+        导出阶段文件为 Excel（sqlite 后端在流程结束时调用；excel 后端直接返回原路径）
+
+        Args:
+            filepath: 阶段文件路径
+
+        Returns:
+            Excel 文件路径，失败返回 None
+        """
+        if not filepath:
+            return None
+        if self.backend != "sqlite":
+            return filepath
+        path = self._resolve_path(filepath)
+        if not os.path.exists(path):
+            logger.warning(f"导出Excel失败，文件不存在: {path}")
+            return None
+        try:
+            return self.stage_store.export_excel(path)
+        except Exception as e:
+            logger.error(f"导出Excel失败: {path}, {e}")
+            return None
+
     def _is_duplicate(self, new_article: Dict, existing_articles: List[Dict]) -> bool:
         """
         判断新文章是否为重复数据
@@ -180,45 +306,31 @@ class StorageManager:
         Returns:
             True表示重复，False表示不重复
         """
-        # 优先使用ID判断（如果存在）
-        new_id = str(new_article.get("id", "") or "").strip()
-        if new_id:
-            for existing in existing_articles:
-                existing_id = str(existing.get("id", "") or "").strip()
-                if new_id and existing_id and new_id == existing_id:
-                    return True
-        
-        # 如果没有ID，回退到原有的判断逻辑
-        new_link = str(new_article.get("link", "") or "").strip()
-        new_title = str(new_article.get("title", "") or "").strip()
-        
-        if not new_link:
-            # 如果没有URL，使用title + published_date作为唯一标识
-            new_published_date = str(new_article.get("published_date", "") or "")
-            new_key = f"{new_title}_{new_published_date}"
-            
-            for existing in existing_articles:
-                existing_key = f"{str(existing.get('title', '') or '').strip()}_{str(existing.get('published_date', '') or '')}"
-                if new_key == existing_key:
-                    return True
-        else:
-            # 优先使用URL判断
-            for existing in existing_articles:
-                existing_link = str(existing.get("link", "") or "").strip()
-                if new_link and existing_link and new_link == existing_link:
-                    return True
-            
-            # 如果URL为空或不同，使用title + published_date
-            if not new_link:
-                new_published_date = str(new_article.get("published_date", "") or "")
-                new_key = f"{new_title}_{new_published_date}"
-                
-                for existing in existing_articles:
-                    existing_key = f"{str(existing.get('title', '') or '').strip()}_{str(existing.get('published_date', '') or '')}"
-                    if new_key == existing_key:
-                        return True
-        
-        return False
+        # 单次判断直接构建索引；批量保存请使用 _filter_new_articles，只构建一次索引
+        return ArticleDedupIndex(existing_articles).contains(new_article)
+
+    def _filter_new_articles(self, articles: List[Dict], existing_articles: List[Dict]) -> List[Dict]:
+        """
+        过滤掉与现有数据（及本批次先出现的文章）重复的文章
+
+        每次保存只构建一次去重索引，单篇查重 O(1)
+
+        Args:
+            articles: 待保存的新文章
+            existing_articles: 现有文章列表
+
+        Returns:
+            不重复的新文章列表（保持原顺序）
+        """
+        index = ArticleDedupIndex(existing_articles)
+        filtered_articles = []
+        for article in articles:
+            if index.contains(article):
+                logger.debug(f"跳过重复文章: {article.get('title', 'N/A')[:50]}...")
+                continue
+            filtered_articles.append(article)
+            index.add(article)
+        return filtered_articles
 
     def save_fetch_results(self, articles: List[Dict]) -> Optional[str]:
         """
@@ -255,15 +367,8 @@ class StorageManager:
         
         # 读取现有数据，进行去重
         existing_articles = self._get_existing_data(filepath)
-        filtered_articles = []
-        duplicate_count = 0
-        
-        for article in articles:
-            if not self._is_duplicate(article, existing_articles + filtered_articles):
-                filtered_articles.append(article)
-            else:
-                duplicate_count += 1
-                logger.debug(f"跳过重复文章: {article.get('title', 'N/A')[:50]}...")
+        filtered_articles = self._filter_new_articles(articles, existing_articles)
+        duplicate_count = len(articles) - len(filtered_articles)
         
         if duplicate_count > 0:
             logger.info(f"检测到并跳过 {duplicate_count} 条重复数据")
@@ -291,7 +396,7 @@ class StorageManager:
         df = self._normalize_boolean_columns(df)
         
         try:
-            df.to_excel(filepath, index=False)
+            self._write_frame(df, filepath)
             logger.info(f"阶段1结果已保存: {filepath} (总记录: {len(all_articles)}, 新增: {len(filtered_articles)})")
             return filepath
         except Exception as e:
@@ -402,7 +507,7 @@ class StorageManager:
         df = self._normalize_boolean_columns(df)
         
         try:
-            df.to_excel(filepath, index=False)
+            self._write_frame(df, filepath)
             logger.info(f"阶段2结果已保存: {filepath} (总记录: {len(all_articles)}, 更新: {updated_count})")
             return filepath
         except Exception as e:
@@ -423,7 +528,7 @@ class StorageManager:
             保存的文件路径，失败返回 None
         """
         # 确定输出文件路径 - 优先使用input_file，备选使用articles
-        if input_file and os.path.exists(input_file):
+        if input_file and self._exists(input_file):
             # 使用输入文件路径生成输出文件路径
             dirname = os.path.dirname(input_file)
             basename = os.path.basename(input_file)
@@ -442,7 +547,7 @@ class StorageManager:
         if not articles:
             # 没有新数据，但仍然需要确保现有文件存在且格式正确
             logger.info("没有新数据需要保存，检查现有文件...")
-            if os.path.exists(filepath):
+            if self._exists(filepath):
                 logger.info(f"文件已存在: {filepath}")
                 return filepath
             else:
@@ -451,7 +556,7 @@ class StorageManager:
                 columns = self.STANDARD_COLUMNS["analyze"]
                 df = pd.DataFrame(columns=columns)
                 try:
-                    df.to_excel(filepath, index=False)
+                    self._write_frame(df, filepath)
                     logger.info(f"空文件已创建: {filepath}")
                     return filepath
                 except Exception as e:
@@ -613,7 +718,7 @@ class StorageManager:
         df = self._normalize_boolean_columns(df)
         
         try:
-            df.to_excel(filepath, index=False)
+            self._write_frame(df, filepath)
             logger.info(f"阶段3结果已保存: {filepath} (总记录: {len(all_articles)}, 更新: {updated_count})")
             return filepath
         except Exception as e:
@@ -634,13 +739,14 @@ class StorageManager:
         if filepath is None:
             filepath = self._get_filepath(stage)
         
-        if not os.path.exists(filepath):
+        if not self._exists(filepath):
             logger.error(f"文件不存在: {filepath}")
             return []
         
         try:
-            df = pd.read_excel(filepath)
-            articles = df.to_dict("records")
+            articles = self._read_records(filepath)
+            for article in articles:
+                article.pop(ROW_ID, None)
             
             # 标准化ID字段为字符串类型，确保类型一致性
             for article in articles:
@@ -666,13 +772,13 @@ class StorageManager:
         if not os.path.exists(self.output_dir):
             return None
         
-        # 按月聚合版本的文件格式: YYYY-MM.xlsx
+        # 按月聚合版本的文件格式: YYYY-MM.xlsx（sqlite 后端为 YYYY-MM.db）
         files = []
         
         for filename in os.listdir(self.output_dir):
-            if filename.endswith(".xlsx"):
-                # 验证文件名格式是否为YYYY-MM.xlsx
-                if len(filename) == 12 and filename[:7].count("-") == 1:
+            if filename.endswith(self.file_ext):
+                # 验证文件名格式是否为YYYY-MM{ext}
+                if len(filename) == 7 + len(self.file_ext) and filename[:7].count("-") == 1:
                     try:
                         year_month = filename[:7]
                         year, month = map(int, year_month.split("-"))
@@ -684,7 +790,7 @@ class StorageManager:
                         continue
         
         if not files:
-            logger.warning(f"未找到按月聚合格式的Excel文件")
+            logger.warning(f"未找到按月聚合格式的阶段文件")
             return None
         
         # 按修改时间排序，返回最新的
@@ -711,13 +817,15 @@ class StorageManager:
         # 生成输出文件路径
         if output_filename:
             # 如果用户指定了文件名，确保它有正确的扩展名
-            if not output_filename.endswith('.xlsx'):
-                output_filename += '.xlsx'
+            if output_filename.endswith('.xlsx'):
+                output_filename = output_filename[:-len('.xlsx')]
+            if not output_filename.endswith(self.file_ext):
+                output_filename += self.file_ext
             filepath = os.path.join(self.output_dir, output_filename)
         else:
             # 使用当前时间生成文件名
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(self.output_dir, f"文章汇总分析_{timestamp}.xlsx")
+            filepath = os.path.join(self.output_dir, f"文章汇总分析_{timestamp}{self.file_ext}")
 
         logger.info(f"准备保存MD文档结果到: {filepath}")
 
@@ -757,7 +865,7 @@ class StorageManager:
             df = df[column_order]
 
             # 保存到Excel
-            df.to_excel(filepath, index=False)
+            self._write_frame(df, filepath)
 
             logger.info(f"MD文档结果已保存: {filepath} (共 {len(articles)} 篇文档)")
             return filepath
@@ -781,14 +889,13 @@ class StorageManager:
             logger.info("没有分析结果需要追加。")
             return None
 
-        if not os.path.exists(input_file):
+        if not self._exists(input_file):
             logger.error(f"输入文件不存在: {input_file}")
             return None
 
         try:
             # 读取现有数据
-            existing_df = pd.read_excel(input_file)
-            existing_articles = existing_df.to_dict('records')
+            existing_articles = self._read_records(input_file)
 
             # 创建文章映射，使用filename作为唯一标识
             existing_map = {}
@@ -834,7 +941,7 @@ class StorageManager:
                 cols = ['filename'] + [col for col in updated_df.columns if col != 'filename']
                 updated_df = updated_df[cols]
 
-            updated_df.to_excel(input_file, index=False)
+            self._write_frame(updated_df, input_file)
 
             logger.info(f"MD文档分析结果已追加: {input_file} (更新了 {len(articles)} 篇文档)")
             return input_file
@@ -865,15 +972,8 @@ class StorageManager:
         existing_articles = self._get_existing_data(filepath)
         
         # 对新数据进行去重
-        filtered_articles = []
-        duplicate_count = 0
-        
-        for article in new_articles:
-            if not self._is_duplicate(article, existing_articles + filtered_articles):
-                filtered_articles.append(article)
-            else:
-                duplicate_count += 1
-                logger.debug(f"跳过重复文章: {article.get('title', 'N/A')[:50]}...")
+        filtered_articles = self._filter_new_articles(new_articles, existing_articles)
+        duplicate_count = len(new_articles) - len(filtered_articles)
         
         if duplicate_count > 0:
             logger.info(f"检测到并跳过 {duplicate_count} 条重复数据")
@@ -916,7 +1016,7 @@ class StorageManager:
         df = self._normalize_boolean_columns(df)
         
         try:
-            df.to_excel(filepath, index=False)
+            self._write_frame(df, filepath)
             logger.info(f"{stage}阶段数据已追加保存: {filepath} (总记录: {len(all_articles)}, 新增: {len(filtered_articles)})")
             return filepath
         except Exception as e:
@@ -0,0 +1,58 @@
+"""LLM 批量任务并发执行。"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_ordered(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = 4,
+    thread_name_prefix: str = "llm-stage",
+) -> Iterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    在线程池中执行 fn(item)，按输入顺序逐个产出 (item, 结果, 异常)。
+
+    某项完成后只要它之前的项都已完成就立即产出，调用方可在主线程中按顺序即时保存，
+    中断后已保存的前缀不需要重跑。已提交但未产出的任务数限制为 4 * concurrency，
+    避免一次性提交全部任务，也限制了等待前序结果时的缓冲量。
+    concurrency <= 1 时在当前线程中顺序执行。
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        for item in items:
+            try:
+                yield item, fn(item), None
+            except Exception as exc:
+                yield item, None, exc
+        return
+
+    window = concurrency * 4
+    completed: Dict[int, Tuple[Optional[Any], Optional[Exception]]] = {}
+    futures: Dict[Future, int] = {}
+    next_submit = 0
+    next_yield = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=thread_name_prefix) as executor:
+        while next_yield < len(items):
+            while next_submit < len(items) and next_submit - next_yield < window:
+                futures[executor.submit(fn, items[next_submit])] = next_submit
+                next_submit += 1
+
+            done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures.pop(future)
+                try:
+                    completed[index] = (future.result(), None)
+                except Exception as exc:
+                    completed[index] = (None, exc)
+
+            while next_yield in completed:
+                result, error = completed.pop(next_yield)
+                yield items[next_yield], result, error
+                next_yield += 1
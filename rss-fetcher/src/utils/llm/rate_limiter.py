@@ -0,0 +1,98 @@
+"""令牌桶限流。
+
+按 provider / 任务维度限制每分钟请求数 (RPM) 与 token 数 (TPM)。
+限流器在进程内按 key 共享，多个 UnifiedLLMClient 实例、多个线程调用同一 provider 时共用额度。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """粗略估算消息 token 数（中文约 1 字/token，英文约 4 字符/token，取保守值）。"""
+    chars = 0
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = "".join(str(chunk.get("text", "")) if isinstance(chunk, dict) else str(chunk) for chunk in content)
+        chars += len(str(content or ""))
+    return max(1, chars)
+
+
+class TokenBucket:
+    """线程安全的令牌桶，容量为一分钟额度，按秒匀速补充。"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """预占额度，返回需要等待的秒数（额度可暂时为负，后续调用方顺延等待）。"""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """组合 RPM / TPM 两个令牌桶。"""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.request_bucket = TokenBucket(rpm) if rpm else None
+        self.token_bucket = TokenBucket(tpm) if tpm else None
+
+    def acquire(self, tokens: int = 1) -> float:
+        """阻塞直到获得一次请求额度，返回实际等待秒数。"""
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_registry: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, limits: Optional[Dict[str, Any]]) -> Optional[RateLimiter]:
+    """
+    获取（或创建）共享限流器。
+
+    Args:
+        key: 共享维度，如 "provider:oneapi-gemini"、"task:article_filter"。
+        limits: {"rpm": 60, "tpm": 100000}，均未配置时返回 None。
+    """
+    if not limits:
+        return None
+    rpm = limits.get("rpm")
+    tpm = limits.get("tpm")
+    if not rpm and not tpm:
+        return None
+    with _registry_lock:
+        limiter = _registry.get(key)
+        if limiter is None:
+            limiter = RateLimiter(rpm=rpm, tpm=tpm)
+            _registry[key] = limiter
+            logger.info("创建限流器 | key=%s | rpm=%s | tpm=%s", key, rpm, tpm)
+        return limiter
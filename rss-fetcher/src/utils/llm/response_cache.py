@@ -0,0 +1,205 @@
+"""LLM 响应缓存与在途请求合并。
+
+以 (任务, 模型, 消息, 采样参数) 的规范化哈希为键，将成功的响应文本持久化到 SQLite：
+- TTL 过期的条目视为未命中；
+- 条目数超过上限时按最近访问时间淘汰；
+- 多个线程同时发起相同请求时，只有一个真正调用 Provider，其余等待并共享结果。
+
+缓存实例按文件路径在进程内共享，多个 UnifiedLLMClient 共用同一份缓存与统计。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """对请求内容做规范化 JSON 序列化后取 SHA-256。"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """持久化响应缓存。"""
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            path: SQLite 文件路径。
+            ttl_seconds: 条目有效期，None 或 <=0 表示永不过期。
+            max_entries: 最大条目数，None 或 <=0 表示不限。
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.max_entries = max_entries if max_entries and max_entries > 0 else None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                task TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def _count(self, task: str, field: str) -> None:
+        stats = self._stats.setdefault(task, {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0})
+        stats[field] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return response
+
+    def set(self, key: str, task: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, task, response, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, task, response, now, now),
+            )
+            # 写入频率等同于实际 LLM 调用频率，每次写入后检查容量的开销可以忽略
+            if self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """删除过期条目，并按最近访问时间淘汰超出上限的条目（调用方持锁）。"""
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = total - (self.max_entries or total)
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            logger.info("LLM 响应缓存淘汰 %s 条 (上限 %s)", overflow, self.max_entries)
+
+    def get_or_compute(self, key: str, task: str, compute: Callable[[], Tuple[Any, Optional[str]]]) -> Tuple[Any, bool]:
+        """
+        命中缓存直接返回；否则合并相同的在途请求，只由第一个调用方执行 compute。
+
+        Args:
+            compute: 返回 (调用结果, 需缓存的响应文本)，文本为 None 时不写缓存。
+
+        Returns:
+            (缓存文本或 compute 的调用结果, 是否来自缓存/合并)。来自缓存或合并时返回的是响应文本。
+        """
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self._count(task, "hits")
+            logger.debug("LLM 响应缓存命中 | 任务=%s", task)
+            return cached, True
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self._count(task, "misses")
+            else:
+                self._count(task, "coalesced")
+
+        if not owner:
+            logger.debug("合并相同的在途 LLM 请求 | 任务=%s", task)
+            return future.result(), True
+
+        try:
+            result, text = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+        future.set_result(text)
+        if text is not None:
+            try:
+                self.set(key, task, text)
+            except sqlite3.Error as exc:
+                logger.warning("写入 LLM 响应缓存失败: %s", exc)
+            else:
+                with self._lock:
+                    self._count(task, "stores")
+        return result, False
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """按任务返回命中统计：hits / misses / coalesced / stores / hit_rate。"""
+        with self._lock:
+            snapshot = {task: dict(values) for task, values in self._stats.items()}
+        for values in snapshot.values():
+            lookups = values["hits"] + values["misses"] + values["coalesced"]
+            values["hit_rate"] = round((values["hits"] + values["coalesced"]) / lookups, 4) if lookups else 0.0
+        return snapshot
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(settings: Optional[Dict[str, Any]]) -> Optional[ResponseCache]:
+    """
+    根据 llm.yaml 的 response_cache 配置获取共享缓存实例，未启用时返回 None。
+
+    配置示例::
+
+        response_cache:
+          enabled: true
+          path: "runtime/cache/llm_responses.db"
+          ttl_hours: 168
+          max_entries: 50000
+    """
+    settings = settings or {}
+    if not settings.get("enabled"):
+        return None
+    path = os.path.abspath(settings.get("path") or os.path.join("runtime", "cache", "llm_responses.db"))
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            ttl_hours = settings.get("ttl_hours")
+            cache = ResponseCache(
+                path,
+                ttl_seconds=float(ttl_hours) * 3600 if ttl_hours else None,
+                max_entries=settings.get("max_entries"),
+            )
+            _caches[path] = cache
+            logger.info("启用 LLM 响应缓存: %s (ttl_hours=%s, max_entries=%s)", path, ttl_hours, cache.max_entries)
+        return cache
@@ -1,4 +1,5 @@
 import copy
+import time
 
 from src.core.article_summary_runner import ArticleSummaryRunner
 
@@ -119,3 +120,21 @@ def test_run_persists_error_when_retry_exhausted():
     assert articles[0]["llm_summary_status"] == "失败"
     assert "超时" in str(articles[0]["llm_summary_error"])
     assert len(storage.saved_batches) == 2
+
+
+def test_concurrent_run_saves_in_input_order():
+    articles = [_base_article(title=f"a{i}") for i in range(8)]
+
+    def slow_summary(article):
+        # 越靠前的文章越慢，完成顺序与输入顺序相反
+        time.sleep(0.02 * (8 - int(article["title"][1:])))
+        return {"llm_summary": f"S-{article['title']}", "llm_summary_status": "成功", "llm_summary_error": None}
+
+    storage = StubStorage(articles)
+    agent = StubSummaryAgent([slow_summary] * 8)
+    runner = ArticleSummaryRunner(storage, agent, concurrency=4)
+
+    runner.run("dummy.xlsx")
+
+    assert [batch[0]["title"] for batch in storage.saved_batches] == [f"a{i}" for i in range(8)]
+    assert all(a["llm_summary"] == f"S-{a['title']}" for a in articles)
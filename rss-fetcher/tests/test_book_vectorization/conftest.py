@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""图书向量化测试共用的桩对象与夹具。"""
+
+import threading
+
+import pytest
+import yaml
+
+import src.core.book_vectorization.retriever as retriever_module
+import src.core.book_vectorization.vectorizer as vectorizer_module
+from src.core.book_vectorization.retriever import BookRetriever
+from src.core.book_vectorization.vectorizer import BookVectorizer
+
+
+BOOKS = {
+    i: {
+        'id': i,
+        'douban_title': f'书{i}',
+        'douban_author': f'作者{i}',
+        'douban_rating': 8.0,
+        'douban_summary': '',
+        'call_no': f'I{i}',
+        'embedding_date': '',
+    }
+    for i in range(1, 11)
+}
+
+
+class FakeEmbeddingClient:
+    """记录调用次数的 Embedding 客户端，向量由文本确定性生成"""
+
+    def __init__(self, config=None):
+        self.fail_batch = False
+        self.bad_texts = set()
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    @staticmethod
+    def _embed(text):
+        return [float(sum(ord(c) for c in text) % 10)]
+
+    def get_embedding(self, text):
+        self.single_calls += 1
+        if text in self.bad_texts:
+            raise RuntimeError("item error")
+        return self._embed(text)
+
+    def get_embeddings_batch(self, texts):
+        self.batch_calls += 1
+        if self.fail_batch:
+            raise RuntimeError("batch error")
+        return [self._embed(t) for t in texts]
+
+
+class FakeVectorStore:
+    """记录写入批次与检索线程的向量库"""
+
+    def __init__(self, config=None):
+        self.batches = []
+        self.threads = set()
+
+    def add_batch(self, embeddings, metadatas, documents):
+        self.batches.append(len(embeddings))
+        return [f"book_{m['id']}" for m in metadatas]
+
+    def search(self, query_embedding, top_k, filter_metadata=None):
+        self.threads.add(threading.get_ident())
+        seed = int(query_embedding[0])
+        ids = [(seed + offset) % 10 + 1 for offset in range(top_k)]
+        return [
+            {
+                'embedding_id': f'book_{book_id}',
+                'metadata': {'id': book_id},
+                'distance': 0.05 * rank,
+                'document': '',
+            }
+            for rank, book_id in enumerate(ids)
+        ]
+
+
+class FakeDbReader:
+    """基于 BOOKS 的数据库读取器，记录批量状态更新"""
+
+    def __init__(self, config=None):
+        self.batch_updates = []
+
+    def update_embedding_status_batch(self, updates):
+        self.batch_updates.append(list(updates))
+
+    def get_book_by_id(self, book_id):
+        return dict(BOOKS[book_id])
+
+    def search_books_by_terms(self, terms, limit, match_fields):
+        return [dict(BOOKS[1], id=99, call_no='I99', exact_match_score=1.0, match_source='douban_title')]
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    """将向量化器、检索器依赖的 Embedding、向量库与数据库客户端替换为桩对象。"""
+    for module in (vectorizer_module, retriever_module):
+        monkeypatch.setattr(module, 'EmbeddingClient', FakeEmbeddingClient)
+        monkeypatch.setattr(module, 'VectorStore', FakeVectorStore)
+        monkeypatch.setattr(module, 'DatabaseReader', FakeDbReader)
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """将配置字典写成 YAML 文件并返回路径。"""
+    counter = iter(range(1000))
+
+    def _write(config):
+        path = tmp_path / f"config_{next(counter)}.yaml"
+        path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding='utf-8')
+        return str(path)
+
+    return _write
+
+
+@pytest.fixture
+def vectorizer(fake_backends, write_config):
+    """使用桩对象的 BookVectorizer（每批 3 条，2 个并发）。"""
+    config = {
+        'database': {},
+        'vector_db': {},
+        'embedding': {'batch_size': 3, 'concurrency': 2},
+        'logging': {'progress_interval': 1},
+        'metadata': {'fields': ['id']},
+        'text_construction': {
+            'template': '{douban_title}|{douban_author}|{douban_summary}|{douban_catalog}',
+            'max_catalog_length': 100,
+            'summary_weight': 1,
+            'empty_placeholder': '[无]',
+        },
+    }
+    return BookVectorizer(write_config(config))
+
+
+@pytest.fixture
+def make_retriever(fake_backends, write_config):
+    """创建使用桩对象的 BookRetriever，可开启精确匹配分支。"""
+
+    def _make(exact_enabled=False):
+        config = {
+            'database': {},
+            'vector_db': {},
+            'embedding': {},
+            'multi_query': {'top_k_per_query': 3, 'concurrency': 4},
+            'exact_match': {'enabled': exact_enabled, 'top_k': 5},
+        }
+        return BookRetriever(write_config(config))
+
+    return _make
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""BlockingRequestExecutor 与压测统计单元测试。"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from scripts.api.load_test import percentile
+from scripts.api.services import BlockingRequestExecutor, RequestTimeoutError
+
+
+def test_identical_in_flight_requests_are_coalesced():
+    """相同参数的并发请求只执行一次。"""
+    calls = []
+
+    def slow_search(query):
+        calls.append(query)
+        time.sleep(0.1)
+        return {"query": query}
+
+    async def scenario():
+        executor = BlockingRequestExecutor(max_workers=4, request_timeout=5)
+        results = await asyncio.gather(
+            *(executor.run("text_search", slow_search, {"query": "AI"}) for _ in range(5)),
+            executor.run("text_search", slow_search, {"query": "其他"}),
+        )
+        executor.shutdown()
+        return results, executor.coalesced_count
+
+    results, coalesced = asyncio.run(scenario())
+
+    assert sorted(calls) == ["AI", "其他"]
+    assert coalesced == 4
+    assert results[0] == {"query": "AI"}
+    assert results[-1] == {"query": "其他"}
+
+
+def test_blocking_calls_do_not_block_event_loop():
+    """检索在线程池中执行，事件循环保持响应。"""
+    threads = set()
+
+    def blocking(value):
+        threads.add(threading.get_ident())
+        time.sleep(0.2)
+        return value
+
+    async def scenario():
+        executor = BlockingRequestExecutor(max_workers=4, request_timeout=5, coalesce=False)
+        start = time.perf_counter()
+        await asyncio.gather(*(executor.run("text_search", blocking, {"value": i}) for i in range(4)))
+        executor.shutdown()
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(scenario())
+
+    assert elapsed < 0.6
+    assert threading.get_ident() not in threads
+
+
+def test_request_timeout():
+    """超时抛出 RequestTimeoutError。"""
+
+    def too_slow():
+        time.sleep(0.3)
+
+    async def scenario():
+        executor = BlockingRequestExecutor(max_workers=1, request_timeout=0.05)
+        try:
+            await executor.run("text_search", too_slow, {})
+        finally:
+            executor.shutdown()
+
+    with pytest.raises(RequestTimeoutError):
+        asyncio.run(scenario())
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
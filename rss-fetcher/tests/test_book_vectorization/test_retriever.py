@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""BookRetriever 多子查询检索单元测试。"""
+
+from src.core.book_vectorization.query_assets import QueryPackage
+
+
+def _sequential_results(retriever, package):
+    """按旧实现逐条执行子查询，作为对照。"""
+    from src.core.book_vectorization.fusion import fuse_query_results
+
+    query_results = []
+    for bucket in ['primary', 'tags', 'insight', 'books']:
+        for text in package.as_dict().get(bucket, []):
+            results = retriever.search_by_text(query_text=text, top_k=3)
+            for item in results:
+                item['source_query_type'] = bucket
+            query_results.append((bucket, results))
+    return fuse_query_results(query_results, retriever.fusion_config)
+
+
+def test_multi_query_matches_sequential_output(make_retriever):
+    package = QueryPackage(
+        primary=['孤独', '城市漫游'],
+        tags=['成长', '孤独'],
+        insight=['人与城市的关系'],
+        books=['看不见的城市'],
+    )
+    retriever = make_retriever()
+
+    results = retriever.search_multi_query(package)
+    expected = _sequential_results(make_retriever(), package)
+
+    assert [r['book_id'] for r in results] == [r['book_id'] for r in expected]
+    assert [r['fused_score'] for r in results] == [r['fused_score'] for r in expected]
+    assert retriever.embedding_client.batch_calls == 1
+    assert retriever.embedding_client.single_calls == 0
+
+
+def test_multi_query_runs_exact_match_branch(make_retriever):
+    package = QueryPackage(primary=['书1'], tags=['成长'])
+    retriever = make_retriever(exact_enabled=True)
+
+    results = retriever.search_multi_query(package)
+
+    assert 99 in [r['book_id'] for r in results]
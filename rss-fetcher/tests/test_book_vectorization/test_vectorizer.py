@@ -157,5 +157,39 @@ class TestBookVectorizer:
         assert 'extra_field' not in metadata
 
 
+class TestVectorizeBatch:
+    """批量向量化流程测试"""
+
+    def test_one_embedding_call_and_one_status_update_per_batch(self, vectorizer):
+        """每批只调用一次批量 Embedding、写一次状态"""
+        client = vectorizer.embedding_client
+        books = [{'id': i, 'douban_title': f'书{i}'} for i in range(7)]
+
+        results = vectorizer._vectorize_batch(books)
+
+        assert [r['book_id'] for r in results] == list(range(7))
+        assert all(r['status'] == 'completed' for r in results)
+        assert client.batch_calls == 3
+        assert client.single_calls == 0
+        assert sorted(vectorizer.vector_store.batches) == [1, 3, 3]
+        assert len(vectorizer.db_reader.batch_updates) == 3
+
+    def test_batch_failure_falls_back_to_single_items(self, vectorizer):
+        """批量请求失败时逐条重试，单条失败按重试次数标记"""
+        client = vectorizer.embedding_client
+        client.fail_batch = True
+        client.bad_texts = {'书1|[无]||'}
+        books = [{'id': i, 'douban_title': f'书{i}', 'retry_count': 2 if i == 1 else 0} for i in range(3)]
+
+        results = vectorizer._vectorize_batch(books)
+
+        assert [r['status'] for r in results] == ['completed', 'failed', 'completed']
+        assert client.single_calls == 3
+        updates = {u['book_id']: u for u in vectorizer.db_reader.batch_updates[0]}
+        assert updates[1]['status'] == 'failed_final'
+        assert updates[1]['retry_count'] == 3
+        assert updates[0]['clear_error'] is True
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
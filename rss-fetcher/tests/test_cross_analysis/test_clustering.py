@@ -62,3 +62,90 @@ def test_clusterer_fallback(sample_articles):
     groups = clusterer.cluster(sample_articles)
     assert len(groups) == 3
     assert all(len(group) <= 2 for group in groups)
+
+
+class FakeEmbedder:
+    """按标题前缀返回两个相互正交方向附近的向量。"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        import numpy as np
+
+        self.calls += 1
+        rows = []
+        for i, text in enumerate(texts):
+            base = [1.0, 0.0, 0.0] if text.startswith("科技") else [0.0, 1.0, 0.0]
+            rows.append([base[0], base[1], 0.01 * i])
+        matrix = np.asarray(rows, dtype=np.float32)
+        return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def _topic_articles(count):
+    return [
+        {"title": ("科技" if i % 2 == 0 else "历史") + f"文章{i}", "summary_long": "摘要"}
+        for i in range(count)
+    ]
+
+
+def test_clusterer_embedding_mode_groups_by_vector():
+    """embedding 模式按向量相似度分组。"""
+    embedder = FakeEmbedder()
+    clusterer = Clusterer(method="embedding", embedding_distance_threshold=0.1, embedder=embedder)
+
+    groups = clusterer.cluster(_topic_articles(40))
+
+    assert embedder.calls == 1
+    assert len(groups) == 2
+    for group in groups:
+        assert len({article["title"][:2] for article in group}) == 1
+
+
+def test_clusterer_auto_mode_switches_by_size():
+    """auto 模式下文章数少时不调用向量化。"""
+    embedder = FakeEmbedder()
+    clusterer = Clusterer(method="auto", auto_embedding_min_articles=10, embedder=embedder)
+
+    clusterer.cluster(_topic_articles(4))
+    assert embedder.calls == 0
+
+    clusterer.cluster(_topic_articles(12))
+    assert embedder.calls == 1
+
+
+def test_clusterer_embedding_failure_falls_back_to_tfidf():
+    """向量化失败时退化为 TF-IDF 层次聚类。"""
+
+    class BrokenEmbedder:
+        def embed(self, texts):
+            raise RuntimeError("embedding api down")
+
+    clusterer = Clusterer(method="embedding", embedder=BrokenEmbedder())
+
+    groups = clusterer.cluster(_topic_articles(6))
+
+    assert sum(len(group) for group in groups) == 6
+
+
+def test_article_embedder_reuses_cached_vectors(tmp_path):
+    """相同文本第二次只读缓存，不再调用 Embedding API。"""
+    from src.core.cross_analysis.embeddings import ArticleEmbedder
+
+    calls = []
+
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    cache_path = str(tmp_path / "emb.db")
+    first = ArticleEmbedder(embed_fn=embed_fn, model_name="m", cache_path=cache_path, batch_size=2)
+    vectors = first.embed(["a", "bb", "ccc", "a"])
+
+    second = ArticleEmbedder(embed_fn=embed_fn, model_name="m", cache_path=cache_path, batch_size=2)
+    again = second.embed(["ccc", "a"])
+
+    assert [len(batch) for batch in calls] == [2, 1]
+    assert vectors.shape == (4, 2)
+    assert abs(float((again[0] ** 2).sum()) - 1.0) < 1e-6
+    assert (again[1] == vectors[0]).all()
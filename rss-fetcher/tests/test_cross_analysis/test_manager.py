@@ -61,3 +61,36 @@ def test_manager_no_articles():
     manager = CrossAnalysisManager(config={"cross_analysis": {"min_score": 95}})
     result = asyncio.run(manager.run([]))
     assert result == []
+
+
+def test_manager_analyzes_groups_concurrently(tmp_path):
+    """分组并发分析，报告仍按分组顺序生成。"""
+    active = {"now": 0, "peak": 0}
+
+    async def analyze_group(group):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01 * (5 - group[0]["idx"]))
+        active["now"] -= 1
+        return {"success": True, "main_theme": {}, "candidate_themes": [], "insights": []}
+
+    groups = [[{"idx": i}] for i in range(5)]
+    clusterer = MagicMock()
+    clusterer.cluster.return_value = groups
+    analyzer = MagicMock()
+    analyzer.analyze_group = analyze_group
+    reporter = MagicMock()
+    reporter.generate.side_effect = lambda group, result, report_dir, group_index: f"report-{group_index}"
+
+    manager = CrossAnalysisManager(
+        config={"cross_analysis": {"min_score": 90, "analysis_concurrency": 3}},
+        clusterer=clusterer,
+        analyzer=analyzer,
+        reporter=reporter,
+    )
+    articles = [{"id": i, "llm_score": 95, "llm_thematic_essence": "x"} for i in range(5)]
+
+    result = asyncio.run(manager.run(articles, output_dir=str(tmp_path)))
+
+    assert result == [f"report-{i}" for i in range(1, 6)]
+    assert active["peak"] == 3
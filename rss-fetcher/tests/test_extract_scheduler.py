@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ExtractionScheduler 并行提取单元测试。"""
+
+import threading
+import time
+
+import pytest
+
+from src.core.content_extractors import ExtractionScheduler, ExtractorFactory
+from src.core.content_extractors.base import BaseContentExtractor
+
+
+class FakeExtractor(BaseContentExtractor):
+    def __init__(self, source, uses_browser=False, delay=0.1):
+        self.source = source
+        self.uses_browser = uses_browser
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.opened = []
+        self.closed = []
+
+    def can_handle(self, source_name):
+        return source_name == self.source
+
+    def open_worker(self):
+        self.opened.append(threading.get_ident())
+
+    def close_worker(self):
+        self.closed.append(threading.get_ident())
+
+    def extract(self, article):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if article.get("boom"):
+            raise RuntimeError("boom")
+        return {"full_text": article["title"], "extract_status": "success", "extract_error": ""}
+
+
+@pytest.fixture
+def extractors(monkeypatch):
+    http = FakeExtractor("http")
+    browser = FakeExtractor("browser", uses_browser=True)
+    monkeypatch.setattr(ExtractorFactory, "_extractors", [http, browser])
+    return http, browser
+
+
+def _articles(source, count, domain="example.com"):
+    return [
+        {"source": source, "title": f"{source}-{i}", "link": f"https://{domain}/{i}"}
+        for i in range(count)
+    ]
+
+
+def test_groups_respect_concurrency_limits(extractors):
+    http, browser = extractors
+    scheduler = ExtractionScheduler(max_workers=8, http_concurrency=4, browser_concurrency=2)
+    articles = _articles("http", 8) + _articles("browser", 6)
+
+    started = time.perf_counter()
+    outcomes = list(scheduler.run(articles))
+    elapsed = time.perf_counter() - started
+
+    assert len(outcomes) == len(articles)
+    assert all(result["full_text"] == article["title"] for article, _, result, _ in outcomes)
+    assert http.peak == 4
+    assert browser.peak == 2
+    # 每个工作线程各初始化、清理一次
+    assert sorted(browser.opened) == sorted(browser.closed)
+    assert len(browser.opened) == 2
+    assert elapsed < 0.1 * 14 / 2
+
+
+def test_per_domain_override_and_global_cap(extractors):
+    http, _ = extractors
+    scheduler = ExtractionScheduler(max_workers=3, http_concurrency=4, per_domain_concurrency={"slow.com": 1})
+    articles = _articles("http", 4, domain="slow.com") + _articles("http", 8, domain="fast.com")
+
+    list(scheduler.run(articles))
+
+    assert http.peak <= 3
+
+
+def test_missing_extractor_and_errors_are_reported(extractors):
+    scheduler = ExtractionScheduler()
+    articles = [
+        {"source": "unknown", "title": "x", "link": "https://a.com/1"},
+        {"source": "http", "title": "y", "link": "https://a.com/2", "boom": True},
+    ]
+
+    outcomes = {article["title"]: (extractor, result, error) for article, extractor, result, error in scheduler.run(articles)}
+
+    assert outcomes["x"] == (None, None, None)
+    assert outcomes["y"][1] is None
+    assert isinstance(outcomes["y"][2], RuntimeError)
+    assert "full_text" not in articles[1]
+
+
+def test_global_cap_bounds_open_workers(extractors, monkeypatch):
+    http, browser = extractors
+    lock = threading.Lock()
+    live = {"now": 0, "peak": 0}
+
+    def track(extractor):
+        open_worker, close_worker = extractor.open_worker, extractor.close_worker
+
+        def opened():
+            with lock:
+                live["now"] += 1
+                live["peak"] = max(live["peak"], live["now"])
+            open_worker()
+
+        def closed():
+            close_worker()
+            with lock:
+                live["now"] -= 1
+
+        monkeypatch.setattr(extractor, "open_worker", opened)
+        monkeypatch.setattr(extractor, "close_worker", closed)
+
+    track(http)
+    track(browser)
+    scheduler = ExtractionScheduler(max_workers=2, http_concurrency=4, browser_concurrency=2)
+    articles = _articles("http", 8) + _articles("browser", 4, domain="a.com") + _articles("browser", 4, domain="b.com")
+
+    outcomes = list(scheduler.run(articles))
+
+    assert len(outcomes) == len(articles)
+    # 浏览器等线程级资源在占到全局名额后才启动
+    assert live["peak"] <= 2
+    assert live["now"] == 0
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""LLM 并发执行与限流单元测试。"""
+
+import threading
+import time
+
+from src.utils.llm.executor import map_ordered
+from src.utils.llm.rate_limiter import RateLimiter, TokenBucket, get_rate_limiter
+
+
+def test_map_ordered_yields_in_input_order_and_captures_errors():
+    def work(value):
+        time.sleep(0.01 * (5 - value))
+        if value == 2:
+            raise ValueError("bad")
+        return value * 10
+
+    outcomes = list(map_ordered(work, range(5), concurrency=3))
+
+    assert [item for item, _, _ in outcomes] == [0, 1, 2, 3, 4]
+    assert [result for _, result, _ in outcomes] == [0, 10, None, 30, 40]
+    assert isinstance(outcomes[2][2], ValueError)
+
+
+def test_map_ordered_runs_concurrently():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(value):
+        with lock:
+            active.append(value)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(value)
+        return value
+
+    started = time.perf_counter()
+    list(map_ordered(work, range(8), concurrency=4))
+
+    assert max(peak) == 4
+    assert time.perf_counter() - started < 0.05 * 8 / 2
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0
+    # 额度用尽后，下一个请求需要等待约 1 秒（60/min = 1/s）
+    assert 0.9 < bucket.reserve(1) <= 1.0
+
+
+def test_rate_limiter_uses_stricter_of_rpm_and_tpm():
+    limiter = RateLimiter(rpm=6000, tpm=600)
+    limiter.token_bucket.reserve(600)
+
+    started = time.perf_counter()
+    waited = limiter.acquire(tokens=5)
+
+    assert 0.4 < waited <= 0.5
+    assert time.perf_counter() - started >= 0.4
+
+
+def test_get_rate_limiter_is_shared_by_key():
+    first = get_rate_limiter("provider:test-shared", {"rpm": 10})
+
+    assert get_rate_limiter("provider:test-shared", {"rpm": 10}) is first
+    assert get_rate_limiter("provider:test-none", {}) is None
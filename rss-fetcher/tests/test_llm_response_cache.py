@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""LLM 响应缓存单元测试。"""
+
+import threading
+import time
+
+import yaml
+
+from src.utils.llm.client import UnifiedLLMClient
+from src.utils.llm.response_cache import ResponseCache
+
+
+def test_cache_respects_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.db"), ttl_seconds=0.05)
+    cache.set("k", "task", "v")
+
+    assert cache.get("k") == "v"
+    time.sleep(0.06)
+    assert cache.get("k") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.db"), max_entries=3)
+    for key in ["a", "b", "c"]:
+        cache.set(key, "task", key)
+    cache.get("a")  # a 变为最近访问
+    cache.set("d", "task", "d")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ["a", "c", "d"]] == ["a", "c", "d"]
+
+
+def test_get_or_compute_coalesces_in_flight_requests(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.db"))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result", "result"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", "task", compute)[0]))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+    stats = cache.stats()["task"]
+    assert stats["misses"] == 1 and stats["coalesced"] == 4 and stats["stores"] == 1
+
+
+def _make_client(tmp_path, monkeypatch, cache_enabled=True):
+    config = {
+        "api_providers": {"text": {"primary": {"name": "p", "model": "m", "api_key": "x", "base_url": "http://x"}}},
+        "tasks": {
+            "demo": {"provider_type": "text", "prompt": {"type": "inline", "content": "系统提示"}},
+            "nocache": {"provider_type": "text", "cache": False},
+        },
+        "response_cache": {"enabled": cache_enabled, "path": str(tmp_path / "llm.db")},
+        "langfuse": {},
+    }
+    config_path = tmp_path / "llm.yaml"
+    config_path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+    client = UnifiedLLMClient(config_path=str(config_path), env_file=None)
+
+    calls = []
+
+    def fake_execute(provider, task_config, messages):
+        calls.append(messages[-1]["content"])
+        return f"answer:{messages[-1]['content']}"
+
+    monkeypatch.setattr(client, "_build_messages", lambda task_config, prompt: [{"role": "user", "content": prompt}])
+    monkeypatch.setattr(client, "_execute_request", fake_execute)
+    return client, calls
+
+
+def test_client_serves_repeated_prompt_from_cache(tmp_path, monkeypatch):
+    client, calls = _make_client(tmp_path, monkeypatch)
+
+    first = client.call("demo", "hello")
+    second = client.call("demo", "hello", response_handler=str.upper)
+    other = client.call("demo", "world")
+
+    assert first == "answer:hello"
+    assert second == "ANSWER:HELLO"
+    assert other == "answer:world"
+    assert calls == ["hello", "world"]
+    assert client.cache_stats()["demo"]["hits"] == 1
+
+
+def test_task_level_cache_switch(tmp_path, monkeypatch):
+    client, calls = _make_client(tmp_path, monkeypatch)
+
+    client.call("nocache", "hello")
+    client.call("nocache", "hello")
+
+    assert calls == ["hello", "hello"]
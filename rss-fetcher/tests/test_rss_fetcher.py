@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""RSSFetcher 并发抓取与条件请求单元测试（本地 HTTP 服务）。"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.core.rss_fetcher import RSSFetcher
+
+DELAY = 0.3
+PUBLISHED = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        FeedHandler.hits.append(self.path)
+        feed_id = self.path.strip("/")
+        etag = f'"{feed_id}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        time.sleep(DELAY)
+        body = f"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{feed_id}</title>
+<item><title>{feed_id} 文章</title><link>http://example.com/{feed_id}</link>
+<pubDate>{PUBLISHED}</pubDate><description>摘要</description></item>
+</channel></rss>""".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    FeedHandler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _feeds(base_url, count=6):
+    return [
+        {"name": f"feed{i}", "url": f"{base_url}/feed{i}", "retry_config": {"max_retries": 0}}
+        for i in range(count)
+    ]
+
+
+def test_concurrent_fetch_keeps_feed_order(feed_server):
+    fetcher = RSSFetcher(concurrency=6, per_host_concurrency=6)
+
+    started = time.perf_counter()
+    articles = fetcher.fetch_recent_articles(_feeds(feed_server), hours_lookback=24)
+    elapsed = time.perf_counter() - started
+
+    assert [a["source"] for a in articles] == [f"feed{i}" for i in range(6)]
+    assert elapsed < DELAY * 3
+    assert [s["status"] for s in fetcher.feed_stats] == ["ok"] * 6
+    assert all(s["elapsed"] >= DELAY for s in fetcher.feed_stats)
+
+
+def test_per_host_limit_serializes_requests(feed_server):
+    fetcher = RSSFetcher(concurrency=6, per_host_concurrency=1)
+
+    started = time.perf_counter()
+    fetcher.fetch_recent_articles(_feeds(feed_server, count=3), hours_lookback=24)
+
+    assert time.perf_counter() - started >= DELAY * 3
+
+
+def test_conditional_get_skips_unchanged_feeds(feed_server, tmp_path):
+    cache_file = tmp_path / "feed_http_cache.json"
+    feeds = _feeds(feed_server, count=3)
+
+    first = RSSFetcher(concurrency=3, http_cache_file=str(cache_file))
+    assert len(first.fetch_recent_articles(feeds, hours_lookback=24)) == 3
+    assert not cache_file.exists()
+    first.save_http_cache()
+    assert cache_file.exists()
+
+    second = RSSFetcher(concurrency=3, http_cache_file=str(cache_file))
+    assert second.fetch_recent_articles(feeds, hours_lookback=24) == []
+    assert [s["status"] for s in second.feed_stats] == ["not_modified"] * 3
+
+
+def test_time_range_fetch_ignores_conditional_cache(feed_server, tmp_path):
+    cache_file = tmp_path / "feed_http_cache.json"
+    feeds = _feeds(feed_server, count=3)
+
+    first = RSSFetcher(concurrency=3, http_cache_file=str(cache_file))
+    first.fetch_recent_articles(feeds, hours_lookback=24)
+    first.save_http_cache()
+
+    start = datetime.now() - timedelta(days=2)
+    second = RSSFetcher(concurrency=3, http_cache_file=str(cache_file))
+    articles = second.fetch_recent_articles(feeds, start_time=start, end_time=datetime.now() + timedelta(days=1))
+    assert len(articles) == 3
+    assert [s["status"] for s in second.feed_stats] == ["ok"] * 3
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""SQLite 阶段存储后端单元测试。"""
+
+import os
+
+import pandas as pd
+
+from src.core.stage_store import SQLiteStageStore
+from src.core.storage import StorageManager
+
+
+def _fetch_articles(start, count):
+    return [
+        {
+            "id": f"a{i}",
+            "source": "测试源",
+            "title": f"文章{i}",
+            "link": f"https://example.com/{i}",
+            "published_date": "2025-12-0%d 10:00:00" % (i % 9 + 1),
+            "fetch_date": "2025-12-10",
+            "summary": "摘要",
+            "content": "",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def _run_stages(storage):
+    fetch_file = storage.save_fetch_results(_fetch_articles(0, 5))
+    storage.save_fetch_results(_fetch_articles(3, 4))  # 3、4 重复
+    articles = storage.load_stage_data("fetch", fetch_file)
+    for article in articles[:2]:
+        article["full_text"] = "正文"
+        article["extract_status"] = "success"
+        article["extract_error"] = ""
+    storage.save_extract_results(articles[:2])
+    return storage.load_stage_data("extract", fetch_file), fetch_file
+
+
+def _normalize(records):
+    df = pd.DataFrame(records).astype(str)
+    return df.sort_index(axis=1).to_dict("records")
+
+
+def test_sqlite_backend_matches_excel_backend(tmp_path):
+    excel_records, excel_file = _run_stages(StorageManager(str(tmp_path / "excel")))
+    sqlite_records, sqlite_file = _run_stages(StorageManager(str(tmp_path / "sqlite"), backend="sqlite"))
+
+    assert excel_file.endswith(".xlsx")
+    assert sqlite_file.endswith(".db")
+    assert len(sqlite_records) == 7
+    assert _normalize(sqlite_records) == _normalize(excel_records)
+
+
+def test_sqlite_save_only_writes_changed_rows(tmp_path):
+    store = SQLiteStageStore()
+    path = str(tmp_path / "2025-12.db")
+    df = pd.DataFrame([{"id": str(i), "title": f"t{i}", "score": None} for i in range(4)])
+
+    assert store.save(path, df) == {"inserted": 4, "updated": 0, "deleted": 0}
+
+    columns, records = store.load(path)
+    assert columns == ["id", "title", "score"]
+    records[1]["score"] = 90
+    records.append({"id": "9", "title": "new", "score": 1})
+    stats = store.save(path, pd.DataFrame(records[1:]))
+
+    assert stats == {"inserted": 1, "updated": 1, "deleted": 1}
+    _, records = store.load(path)
+    assert [r["id"] for r in records] == ["1", "2", "3", "9"]
+    assert records[0]["score"] == 90
+    assert pd.isna(records[1]["score"])
+
+
+def test_sqlite_backend_imports_existing_excel_and_exports(tmp_path):
+    excel_storage = StorageManager(str(tmp_path))
+    excel_file = excel_storage.save_fetch_results(_fetch_articles(0, 3))
+
+    sqlite_storage = StorageManager(str(tmp_path), backend="sqlite")
+    articles = sqlite_storage.load_stage_data("fetch", excel_file)
+    assert len(articles) == 3
+    assert os.path.exists(excel_file[:-len(".xlsx")] + ".db")
+    assert sqlite_storage.find_latest_stage_file("fetch").endswith(".db")
+
+    os.remove(excel_file)
+    exported = sqlite_storage.export_excel(excel_file)
+    assert exported == excel_file
+    assert len(pd.read_excel(exported)) == 3
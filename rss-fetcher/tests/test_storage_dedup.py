@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""StorageManager 去重索引单元测试。"""
+
+import random
+
+from src.core.storage import ArticleDedupIndex, StorageManager
+
+
+def _linear_is_duplicate(new_article, existing_articles):
+    """逐条扫描的参考实现（索引改造前的判定逻辑）。"""
+    def norm(value):
+        return str(value or "").strip()
+
+    new_id = norm(new_article.get("id", ""))
+    if new_id and any(norm(e.get("id", "")) == new_id for e in existing_articles):
+        return True
+    new_link = norm(new_article.get("link", ""))
+    if new_link:
+        return any(norm(e.get("link", "")) == new_link for e in existing_articles)
+    new_key = f"{norm(new_article.get('title', ''))}_{str(new_article.get('published_date', '') or '')}"
+    return any(
+        f"{norm(e.get('title', ''))}_{str(e.get('published_date', '') or '')}" == new_key
+        for e in existing_articles
+    )
+
+
+def _random_article(rng):
+    return {
+        "id": rng.choice(["", None, float("nan"), "a1", " a1 ", "a2", 3, "3"]),
+        "link": rng.choice(["", None, "http://x/1", " http://x/1", "http://x/2"]),
+        "title": rng.choice(["", None, "标题", " 标题 ", "另一篇"]),
+        "published_date": rng.choice(["", None, "2025-01-01", " 2025-01-01"]),
+    }
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        existing = [_random_article(rng) for _ in range(rng.randint(0, 6))]
+        new_article = _random_article(rng)
+        index = ArticleDedupIndex(existing)
+        assert index.contains(new_article) == _linear_is_duplicate(new_article, existing)
+
+
+def test_filter_new_articles_dedups_within_batch(tmp_path):
+    storage = StorageManager(str(tmp_path))
+    existing = [{"id": "1", "link": "http://x/1", "title": "旧文", "published_date": "2025-01-01"}]
+    incoming = [
+        {"id": "1", "link": "http://x/9", "title": "同ID", "published_date": ""},
+        {"id": "", "link": "http://x/2", "title": "新文", "published_date": ""},
+        {"id": "", "link": "http://x/2", "title": "新文重复", "published_date": ""},
+        {"id": "", "link": "", "title": "无链接", "published_date": "2025-01-02"},
+        {"id": "", "link": "", "title": "无链接", "published_date": "2025-01-02"},
+    ]
+
+    filtered = storage._filter_new_articles(incoming, existing)
+
+    assert [a["title"] for a in filtered] == ["新文", "无链接"]
+    assert storage._is_duplicate(incoming[0], existing)